@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+EG-Dash 센서 수집 데몬
+- 하드웨어(I2C 버스, SPS30 UART)를 단독으로 점유하여 주기적으로 센서 읽기
+- 최신 스냅샷을 공유 파일에 기록하고 웹 워커(wsgi.py)는 이 파일만 읽음
+- 웹 트래픽 급증이 샘플링을 지연시키지 않고, 센서 지연이 HTTP 응답을 막지 않음
+
+실행:
+    python3 acquisition_daemon.py [--interval 1.0] [--path /dev/shm/egdash_snapshot.json]
+    python3 acquisition_daemon.py --transport shm   # 공유 메모리 세그먼트 + 링 버퍼
+"""
+
+import os
+import argparse
+import signal
+import threading
+from sensor_manager import SensorManager
+from sensor_acquisition import SensorAcquisitionThread
+from shared_snapshot import SharedSnapshotWriter, default_shared_snapshot_path
+from shm_snapshot import SharedMemorySnapshotWriter, SHM_NAME, DEFAULT_RING_CAPACITY, shm_channels
+from alert_engine import create_alert_engine
+from anomaly_detector import create_anomaly_detector
+from derived_channels import create_derived_channel_engine
+from iaq_estimator import create_iaq_estimator
+from rolling_stats import create_rolling_stats
+from noise_filters import create_filter_stage
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EG-Dash 센서 수집 데몬')
+    parser.add_argument('--interval', type=float, default=1.0, help='수집 간격 (초)')
+    parser.add_argument('--path', default=os.environ.get('EGDASH_SHARED_SNAPSHOT') or default_shared_snapshot_path(),
+                        help='공유 스냅샷 파일 경로 (환경 변수 EGDASH_SHARED_SNAPSHOT)')
+    parser.add_argument('--transport', choices=['file', 'shm'],
+                        default=os.environ.get('EGDASH_SNAPSHOT_TRANSPORT', 'file'),
+                        help='스냅샷 공유 방식 (환경 변수 EGDASH_SNAPSHOT_TRANSPORT)')
+    parser.add_argument('--shm-name', default=os.environ.get('EGDASH_SHM_NAME', SHM_NAME),
+                        help='공유 메모리 이름 (환경 변수 EGDASH_SHM_NAME)')
+    parser.add_argument('--ring-capacity', type=int, default=DEFAULT_RING_CAPACITY,
+                        help='공유 메모리 채널별 링 버퍼 샘플 수')
+    parser.add_argument('--emulate', action='store_true',
+                        default=os.environ.get('EGDASH_EMULATOR', '') in ('1', 'true', 'yes'),
+                        help='하드웨어 대신 센서 에뮬레이터 사용 (환경 변수 EGDASH_EMULATOR)')
+    parser.add_argument('--record', default=os.environ.get('EGDASH_RECORD_TRACE'),
+                        help='버스 트래픽 녹화 파일 경로 (환경 변수 EGDASH_RECORD_TRACE)')
+    parser.add_argument('--replay', default=os.environ.get('EGDASH_REPLAY_TRACE'),
+                        help='녹화된 버스 트래픽 재생 파일 경로 (환경 변수 EGDASH_REPLAY_TRACE)')
+    parser.add_argument('--replay-speed', type=float, default=float(os.environ.get('EGDASH_REPLAY_SPEED', '1.0')),
+                        help='재생 배속 (0 = 지연 없음)')
+    args = parser.parse_args()
+    
+    stop_event = threading.Event()
+    
+    def handle_signal(signum, frame):
+        stop_event.set()
+    
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    
+    print("🚀 EG-Dash 센서 수집 데몬 시작")
+    if args.replay:
+        from bus_trace import create_replay_sensor_manager
+        sensor_manager, _ = create_replay_sensor_manager(args.replay, speed=args.replay_speed)
+    elif args.emulate:
+        from sensor_emulator import create_emulated_sensor_manager
+        print("🧪 센서 에뮬레이터 모드")
+        sensor_manager = create_emulated_sensor_manager()
+    else:
+        sensor_manager = SensorManager()
+    if args.record:
+        from bus_trace import attach_recorder
+        attach_recorder(sensor_manager, args.record)
+    if not sensor_manager.initialize_sensors():
+        print("⚠️ 센서 연결 실패 - 데이터 없는 상태로 수집 계속")
+    
+    # 스냅샷 처리기는 수집 데몬에서만 실행 (웹 워커마다 중복 계산/전송 방지, 결과는 스냅샷에 기록)
+    processors = []
+    filter_stage = create_filter_stage()
+    if filter_stage:
+        processors.append(filter_stage)
+    derived_engine = create_derived_channel_engine()
+    if derived_engine:
+        processors.append(derived_engine)
+    iaq_estimator = create_iaq_estimator()
+    if iaq_estimator:
+        processors.append(iaq_estimator)
+    anomaly_detector = create_anomaly_detector()
+    if anomaly_detector:
+        processors.append(anomaly_detector)
+    rolling_stats = create_rolling_stats()
+    if rolling_stats:
+        processors.append(rolling_stats)
+    alert_engine = create_alert_engine()
+    if alert_engine:
+        processors.append(alert_engine)
+        alert_engine.start()
+    
+    if args.transport == 'shm':
+        # 필터 원본(*_raw)과 파생 채널은 설정에 따라 달라지므로 링 버퍼 채널 목록에 추가
+        extra_channels = []
+        if filter_stage:
+            extra_channels.extend(filter_stage.raw_channels)
+        if derived_engine:
+            extra_channels.extend(channel.name for channel in derived_engine.public_channels)
+        writer = SharedMemorySnapshotWriter(args.shm_name, args.ring_capacity, shm_channels(extra_channels))
+        eager_shapes = {}
+        print(f"📁 공유 메모리 세그먼트: /dev/shm/{writer.name} ({writer.get_status()['size']} bytes, "
+              f"{len(writer.layout.channels)}채널)")
+    else:
+        writer = SharedSnapshotWriter(args.path)
+        eager_shapes = {'shared': None}
+        print(f"📁 공유 스냅샷 파일: {writer.path}")
+    
+    acquisition_thread = SensorAcquisitionThread(sensor_manager, writer,
+                                                 interval=args.interval,
+                                                 eager_shapes=eager_shapes,
+                                                 processors=processors)
+    acquisition_thread.start()
+    
+    try:
+        stop_event.wait()
+    finally:
+        print("\n수집 데몬 종료 중...")
+        acquisition_thread.stop()
+        if alert_engine:
+            alert_engine.stop()
+        if iaq_estimator:
+            iaq_estimator.save_baseline()
+        sensor_manager.close_sensors()
+        if args.transport == 'shm':
+            writer.close()
+        else:
+            writer.remove()
+        print("수집 데몬이 정상적으로 종료되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+스트리밍 임계값 알림 엔진 (PRD 10.2)
+- 수집 스레드가 스냅샷을 게시할 때마다 규칙을 평가 (규칙당 O(1), DB 조회 없음)
+- 조건: above / below / outside(허용 범위 이탈) / rate_above(변화율, 단위/분)
+- rate_above 변화율: 최근 rate_window초 샘플의 최소제곱 기울기 (부호 유지, 비교할 때만 절댓값)
+- 히스테리시스(해제 기준 여유)와 디바운스(for_seconds 지속 후 발생, clear_seconds 지속 후 해제)
+- 발생/해제 이벤트는 제한된 큐에 넣고 별도 스레드가 알림 싱크(로그, 웹훅, SSE)로 전달
+- 멀티 프로세스 배포: 최근 이벤트를 스냅샷(alert_events)에 실어 보내고 웹 워커의 AlertEventRelay가 SSE로 중계
+
+규칙 파일: 환경 변수 EGDASH_ALERT_RULES (JSON 배열, 미설정 시 DEFAULT_ALERT_RULES)
+웹훅: 환경 변수 EGDASH_ALERT_WEBHOOK (예: http://127.0.0.1:9099/alerts)
+
+웹훅 수신 테스트: python3 alert_engine.py receiver --port 9099
+변화율 규칙 점검: python3 alert_engine.py check
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+import urllib.request
+from collections import deque
+from typing import Dict, List, Optional
+from json_codec import dumps_bytes
+from metrics import ALERT_EVENTS
+
+ALERT_QUEUE_SIZE = 256
+RECENT_EVENT_COUNT = 100
+SNAPSHOT_EVENT_COUNT = 10  # 스냅샷에 싣는 최근 이벤트 수 (웹 워커가 놓친 스냅샷의 이벤트도 중계)
+WEBHOOK_TIMEOUT = 2.0
+
+DEFAULT_ALERT_RULES = [
+    {
+        'name': 'pm25_high',
+        'channel': 'pm25',
+        'condition': 'above',
+        'threshold': 35.0,
+        'hysteresis': 5.0,
+        'for_seconds': 300,
+        'clear_seconds': 60,
+        'severity': 'warning',
+        'description': 'PM2.5 35 μg/m³ 초과 5분 지속'
+    },
+    {
+        'name': 'differential_pressure_band',
+        'channel': 'differential_pressure',
+        'condition': 'outside',
+        'low': -100.0,
+        'high': 100.0,
+        'hysteresis': 5.0,
+        'for_seconds': 10,
+        'severity': 'warning',
+        'description': '차압 ±100 Pa 범위 이탈'
+    },
+    {
+        'name': 'humidity_rate',
+        'channel': 'humidity',
+        'condition': 'rate_above',
+        'threshold': 5.0,
+        'hysteresis': 1.0,
+        'for_seconds': 30,
+        'severity': 'info',
+        'description': '습도 변화율 5 %/분 초과'
+    }
+]
+
+
+class AlertRule:
+    """채널 1개에 대한 알림 규칙 (상태: ok → pending → firing → clearing → ok)"""
+    
+    CONDITIONS = ('above', 'below', 'outside', 'rate_above')
+    
+    def __init__(self, name: str, channel: str, condition: str, threshold: Optional[float] = None,
+                 low: Optional[float] = None, high: Optional[float] = None, hysteresis: float = 0.0,
+                 for_seconds: float = 0.0, clear_seconds: float = 0.0, rate_window: float = 60.0,
+                 severity: str = 'warning', description: str = ''):
+        """
+        Args:
+            name: 규칙 이름 (고유)
+            channel: 스냅샷 채널 이름 (예: 'pm25', 'differential_pressure')
+            condition: 'above', 'below', 'outside', 'rate_above'
+            threshold: above/below/rate_above 기준값 (rate_above는 단위/분)
+            low, high: outside 허용 범위
+            hysteresis: 해제 시 기준값에서 더 벗어나야 하는 여유 (경계 부근 반복 발생 방지)
+            for_seconds: 조건이 이 시간 동안 계속 참이어야 발생
+            clear_seconds: 해제 조건이 이 시간 동안 계속 참이어야 해제
+            rate_window: rate_above 기울기 계산 시간 창 (초, 길수록 잡음에 둔감하고 반응이 느림)
+            severity: 'info', 'warning', 'critical'
+        """
+        if condition not in self.CONDITIONS:
+            raise ValueError(f"지원하지 않는 조건: {condition}")
+        if condition == 'outside':
+            if low is None or high is None or low >= high:
+                raise ValueError(f"outside 규칙은 low < high 필요: {name}")
+        elif threshold is None:
+            raise ValueError(f"{condition} 규칙은 threshold 필요: {name}")
+        if hysteresis < 0 or for_seconds < 0 or clear_seconds < 0:
+            raise ValueError(f"hysteresis/for_seconds/clear_seconds는 0 이상: {name}")
+        if rate_window <= 0:
+            raise ValueError(f"rate_window는 0보다 커야 함: {name}")
+        
+        self.name = name
+        self.channel = channel
+        self.condition = condition
+        self.threshold = threshold
+        self.low = low
+        self.high = high
+        self.hysteresis = hysteresis
+        self.for_seconds = for_seconds
+        self.clear_seconds = clear_seconds
+        self.rate_window = rate_window
+        self.severity = severity
+        self.description = description
+        
+        self.state = 'ok'
+        self.value = None        # 마지막 평가 값 (rate_above는 부호 있는 변화율)
+        self.fired_at = None
+        self._since = None       # pending/clearing 시작 시각
+        
+        # rate_above용: 창 안의 (시각, 값)과 기준점 대비 누적합 [n, Σt, Σv, Σt², Σtv]
+        self._samples = deque()
+        self._origin = None
+        self._sums = [0, 0.0, 0.0, 0.0, 0.0]
+        self._expired_since_rebuild = 0
+    
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'AlertRule':
+        return cls(**config)
+    
+    def to_dict(self) -> Dict:
+        config = {'name': self.name, 'channel': self.channel, 'condition': self.condition,
+                  'hysteresis': self.hysteresis, 'for_seconds': self.for_seconds,
+                  'clear_seconds': self.clear_seconds, 'severity': self.severity,
+                  'description': self.description}
+        if self.condition == 'outside':
+            config.update(low=self.low, high=self.high)
+        else:
+            config['threshold'] = self.threshold
+        if self.condition == 'rate_above':
+            config['rate_window'] = self.rate_window
+        return config
+    
+    def _accumulate(self, now: float, value: float, sign: int):
+        t = now - self._origin[0]
+        v = value - self._origin[1]
+        sums = self._sums
+        sums[0] += sign
+        sums[1] += sign * t
+        sums[2] += sign * v
+        sums[3] += sign * t * t
+        sums[4] += sign * t * v
+    
+    def _rebuild(self):
+        """누적 오차 방지: 기준점을 창의 첫 샘플로 옮기고 누적합 재계산"""
+        self._expired_since_rebuild = 0
+        self._origin = self._samples[0] if self._samples else None
+        self._sums = [0, 0.0, 0.0, 0.0, 0.0]
+        for now, value in self._samples:
+            self._accumulate(now, value, 1)
+    
+    def _metric(self, value: float, now: float) -> Optional[float]:
+        """
+        평가 대상 값
+        
+        rate_above는 최근 rate_window초 샘플의 최소제곱 기울기(단위/분, 부호 유지).
+        샘플 간 차분은 잡음을 시간 간격으로 나눠 키우므로 쓰지 않음
+        (1Hz, σ=0.1 잡음이면 차분 평균 |Δ|만으로 약 7 단위/분).
+        창이 절반 이상 채워지기 전에는 None.
+        """
+        if self.condition != 'rate_above':
+            return value
+        
+        samples = self._samples
+        if samples and now <= samples[-1][0]:
+            return None
+        if self._origin is None:
+            self._origin = (now, value)
+        samples.append((now, value))
+        self._accumulate(now, value, 1)
+        
+        cutoff = now - self.rate_window
+        while samples[0][0] < cutoff:
+            expired_at, expired_value = samples.popleft()
+            self._accumulate(expired_at, expired_value, -1)
+            self._expired_since_rebuild += 1
+        if self._expired_since_rebuild >= len(samples):
+            self._rebuild()
+        
+        count, sum_t, sum_v, sum_tt, sum_tv = self._sums
+        if count < 3 or now - samples[0][0] < self.rate_window / 2:
+            return None
+        denominator = count * sum_tt - sum_t * sum_t
+        if denominator <= 0:
+            return None
+        return (count * sum_tv - sum_t * sum_v) / denominator * 60.0
+    
+    def _is_active(self, metric: float) -> bool:
+        if self.condition == 'below':
+            return metric < self.threshold
+        if self.condition == 'outside':
+            return metric < self.low or metric > self.high
+        if self.condition == 'rate_above':
+            return abs(metric) > self.threshold
+        return metric > self.threshold
+    
+    def _is_clear(self, metric: float) -> bool:
+        if self.condition == 'below':
+            return metric > self.threshold + self.hysteresis
+        if self.condition == 'outside':
+            return self.low + self.hysteresis <= metric <= self.high - self.hysteresis
+        if self.condition == 'rate_above':
+            return abs(metric) < self.threshold - self.hysteresis
+        return metric < self.threshold - self.hysteresis
+    
+    def evaluate(self, value, now: float) -> Optional[str]:
+        """
+        샘플 1개 평가
+        
+        Returns:
+            'fired', 'cleared' 또는 None (값이 없으면 상태 유지)
+        """
+        if value is None:
+            return None
+        metric = self._metric(float(value), now)
+        if metric is None:
+            return None
+        self.value = metric
+        
+        if self.state in ('ok', 'pending'):
+            if not self._is_active(metric):
+                self.state = 'ok'
+                return None
+            if self.state == 'ok':
+                self.state = 'pending'
+                self._since = now
+            if now - self._since >= self.for_seconds:
+                self.state = 'firing'
+                self.fired_at = now
+                return 'fired'
+            return None
+        
+        # firing / clearing: 히스테리시스 구간 안이면 firing 유지
+        if not self._is_clear(metric):
+            self.state = 'firing'
+            return None
+        if self.state == 'firing':
+            self.state = 'clearing'
+            self._since = now
+        if now - self._since >= self.clear_seconds:
+            self.state = 'ok'
+            self.fired_at = None
+            return 'cleared'
+        return None
+    
+    @property
+    def active(self) -> bool:
+        return self.state in ('firing', 'clearing')
+
+
+class LogSink:
+    """알림 이벤트 로그 출력"""
+    
+    name = 'log'
+    
+    def send(self, event: Dict):
+        if event['event'] == 'fired':
+            print(f"🚨 알림 발생 [{event['severity']}] {event['rule']}: {event['message']}")
+        else:
+            print(f"✅ 알림 해제 {event['rule']}: {event['message']}")
+
+
+class WebhookSink:
+    """알림 이벤트 JSON POST 전송"""
+    
+    name = 'webhook'
+    
+    def __init__(self, url: str, timeout: float = WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+    
+    def send(self, event: Dict):
+        request = urllib.request.Request(self.url, data=dumps_bytes(event), method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class BroadcastSink:
+    """알림 이벤트를 SnapshotBroadcaster로 발행 (SSE /api/alerts/stream)"""
+    
+    name = 'sse'
+    
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+    
+    def send(self, event: Dict):
+        self.broadcaster.publish(event)
+
+
+class AlertEngine:
+    """스냅샷 처리기 + 알림 전달 백그라운드 스레드"""
+    
+    label = "알림 전달 스레드"
+    
+    def __init__(self, rules: List[AlertRule], sinks=None, queue_size: int = ALERT_QUEUE_SIZE):
+        """
+        알림 엔진 초기화
+        
+        Args:
+            rules: 알림 규칙 목록
+            sinks: 알림 싱크 목록 (send(event) 메서드)
+            queue_size: 전달 대기 이벤트 최대 수 (가득 차면 가장 오래된 이벤트 폐기)
+        """
+        names = [rule.name for rule in rules]
+        if len(names) != len(set(names)):
+            raise ValueError("알림 규칙 이름이 중복됩니다")
+        
+        self.rules = list(rules)
+        self.sinks = list(sinks or [])
+        self.running = False
+        self.thread = None
+        
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._recent_events = deque(maxlen=RECENT_EVENT_COUNT)
+        self._event_id = 0
+        
+        self.fired_count = 0
+        self.cleared_count = 0
+        self.dropped_count = 0
+        self.sink_error_count = 0
+    
+    def process(self, snapshot: Dict):
+        """스냅샷 처리기: 규칙 평가 후 활성 알림 목록을 스냅샷에 기록"""
+        now = snapshot.get('acquired_at') or time.time()
+        for rule in self.rules:
+            event_type = rule.evaluate(snapshot.get(rule.channel), now)
+            if event_type:
+                self._emit(rule, event_type, snapshot, now)
+        
+        snapshot['alerts'] = [{'rule': rule.name, 'severity': rule.severity, 'since': rule.fired_at}
+                              for rule in self.rules if rule.active]
+        snapshot['alert_events'] = self.get_recent_events(SNAPSHOT_EVENT_COUNT)
+    
+    def _emit(self, rule: AlertRule, event_type: str, snapshot: Dict, now: float):
+        with self._lock:
+            self._event_id += 1
+            event_id = self._event_id
+        
+        if event_type == 'fired':
+            self.fired_count += 1
+            message = f"{rule.description or rule.channel} (현재 {rule.value:.2f})"
+        else:
+            self.cleared_count += 1
+            message = f"{rule.channel} 정상 복귀 (현재 {rule.value:.2f})"
+        
+        event = {
+            'id': event_id,
+            'event': event_type,
+            'rule': rule.name,
+            'channel': rule.channel,
+            'severity': rule.severity,
+            'value': round(rule.value, 3),
+            'sample_value': snapshot.get(rule.channel),
+            'seq': snapshot.get('seq'),
+            'timestamp': now,
+            'message': message
+        }
+        ALERT_EVENTS.inc(rule=rule.name, event=event_type)
+        self._recent_events.append(event)
+        
+        # 큐가 가득 차면 가장 오래된 이벤트 폐기 (수집 스레드는 절대 대기하지 않음)
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped_count += 1
+                except queue.Empty:
+                    pass
+    
+    def _background_worker(self):
+        """백그라운드 스레드 워커 함수"""
+        print(f"🚀 {self.label} 시작 (규칙 {len(self.rules)}개, 싱크: "
+              f"{', '.join(sink.name for sink in self.sinks) or '없음'})")
+        
+        while self.running:
+            try:
+                event = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            for sink in self.sinks:
+                try:
+                    sink.send(event)
+                except Exception as e:
+                    self.sink_error_count += 1
+                    print(f"⚠️ 알림 싱크 오류 ({sink.name}): {e}")
+        
+        print(f"🛑 {self.label} 종료")
+    
+    def start(self):
+        """알림 전달 스레드 시작"""
+        if self.running:
+            return
+        
+        self.running = True
+        self.thread = threading.Thread(target=self._background_worker, daemon=True, name="AlertDispatcher")
+        self.thread.start()
+    
+    def stop(self):
+        """알림 전달 스레드 중지"""
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+    
+    def get_recent_events(self, limit: Optional[int] = None) -> List[Dict]:
+        """최근 이벤트 목록 (오래된 순, 최신 limit개)"""
+        events = list(self._recent_events)
+        return events[-limit:] if limit else events
+    
+    def get_rules(self) -> List[Dict]:
+        """규칙 설정과 현재 상태"""
+        return [dict(rule.to_dict(), state=rule.state, value=rule.value, fired_at=rule.fired_at)
+                for rule in self.rules]
+    
+    def get_status(self) -> Dict:
+        """알림 엔진 상태 정보 반환"""
+        return {
+            'running': self.running,
+            'rule_count': len(self.rules),
+            'active_count': sum(1 for rule in self.rules if rule.active),
+            'sinks': [sink.name for sink in self.sinks],
+            'queued_count': self._queue.qsize(),
+            'fired_count': self.fired_count,
+            'cleared_count': self.cleared_count,
+            'dropped_count': self.dropped_count,
+            'sink_error_count': self.sink_error_count
+        }
+
+
+class AlertEventRelay:
+    """웹 워커용 스냅샷 처리기: 수집 데몬이 스냅샷에 실은 알림 이벤트를 SSE로 중계"""
+    
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self.relayed_count = 0
+        self._last_id = None  # 첫 스냅샷의 이벤트는 이미 지난 것이므로 중계하지 않음
+    
+    def process(self, snapshot: Dict):
+        events = snapshot.get('alert_events')
+        if events is None:
+            return
+        last_id = events[-1]['id'] if events else 0
+        if self._last_id is None:
+            self._last_id = last_id
+            return
+        if last_id < self._last_id:
+            self._last_id = 0  # 데몬 재시작: 이벤트 번호가 1부터 다시 시작
+        for event in events:
+            if event['id'] > self._last_id:
+                self.broadcaster.publish(event)
+                self.relayed_count += 1
+        self._last_id = max(self._last_id, last_id)
+
+
+def load_alert_rules(path: Optional[str] = None) -> List[AlertRule]:
+    """규칙 파일(JSON 배열) 로드 (경로가 없으면 기본 규칙)"""
+    if path:
+        with open(path) as f:
+            configs = json.load(f)
+    else:
+        configs = DEFAULT_ALERT_RULES
+    return [AlertRule.from_dict(config) for config in configs]
+
+
+def create_alert_engine(broadcaster=None) -> Optional[AlertEngine]:
+    """
+    환경 변수 설정으로 알림 엔진 생성 (EGDASH_ALERTS=0이면 None)
+    
+    Args:
+        broadcaster: 알림 SSE 발행용 SnapshotBroadcaster (None이면 SSE 싱크 생략)
+    """
+    if os.environ.get('EGDASH_ALERTS', '1') not in ('1', 'true', 'yes'):
+        return None
+    
+    try:
+        rules = load_alert_rules(os.environ.get('EGDASH_ALERT_RULES'))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ 알림 규칙 로드 실패 - 알림 비활성화: {e}")
+        return None
+    
+    sinks = [LogSink()]
+    webhook_url = os.environ.get('EGDASH_ALERT_WEBHOOK')
+    if webhook_url:
+        sinks.append(WebhookSink(webhook_url))
+    if broadcaster is not None:
+        sinks.append(BroadcastSink(broadcaster))
+    
+    return AlertEngine(rules, sinks)
+
+
+def run_webhook_receiver(port: int):
+    """웹훅 수신 테스트 서버 (받은 알림 이벤트 출력)"""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                event = json.loads(body)
+                print(f"📨 {event.get('event')} {event.get('rule')}: {event.get('message')}")
+            except ValueError:
+                print(f"📨 (JSON 아님) {body[:200]!r}")
+            self.send_response(204)
+            self.end_headers()
+        
+        def log_message(self, format, *args):
+            pass
+    
+    print(f"📡 웹훅 수신 대기: http://127.0.0.1:{port}/")
+    HTTPServer(('127.0.0.1', port), Handler).serve_forever()
+
+
+def check_rate_rules(duration: float = 1800.0, noise_levels=(0.1, 0.2, 0.5), ramp: float = 10.0,
+                     seed: int = 0) -> bool:
+    """
+    기본 rate_above 규칙 점검 (1Hz 시뮬레이션)
+    - 일정한 값 + 가우시안 잡음(σ=noise_levels)은 발생하면 안 됨
+    - 임계값을 넘는 기울기(ramp 단위/분)는 발생해야 함
+    """
+    import random
+    
+    configs = [config for config in DEFAULT_ALERT_RULES if config['condition'] == 'rate_above']
+    rng = random.Random(seed)
+    passed = True
+    for config in configs:
+        cases = [(f"잡음 σ={sigma}", sigma, 0.0, False) for sigma in noise_levels]
+        cases.append((f"기울기 {ramp} 단위/분", noise_levels[0], ramp, True))
+        for label, sigma, slope, expected in cases:
+            rule = AlertRule.from_dict(config)
+            fired = 0
+            peak = 0.0
+            for second in range(int(duration)):
+                value = 50.0 + slope * second / 60.0 + rng.gauss(0.0, sigma)
+                if rule.evaluate(value, float(second)) == 'fired':
+                    fired += 1
+                if rule.value is not None:
+                    peak = max(peak, abs(rule.value))
+            ok = (fired > 0) == expected
+            passed = passed and ok
+            print(f"{'✅' if ok else '❌'} {config['name']} {label}: 발생 {fired}회, 최대 |변화율| {peak:.2f}")
+    return passed
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='EG-Dash 알림 엔진 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    receiver_parser = subparsers.add_parser('receiver', help='웹훅 수신 테스트 서버')
+    receiver_parser.add_argument('--port', type=int, default=9099)
+    
+    rules_parser = subparsers.add_parser('rules', help='규칙 파일 검증 및 출력')
+    rules_parser.add_argument('path', nargs='?', default=None)
+    
+    subparsers.add_parser('check', help='rate_above 기본 규칙 잡음/기울기 점검')
+    
+    args = parser.parse_args()
+    if args.command == 'receiver':
+        run_webhook_receiver(args.port)
+    elif args.command == 'check':
+        raise SystemExit(0 if check_rate_rules() else 1)
+    else:
+        for rule in load_alert_rules(args.path):
+            print(json.dumps(rule.to_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
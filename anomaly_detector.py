@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+채널별 온라인 이상 탐지 (스냅샷 처리기)
+- EWMA 평균/분산 z-점수: 느리게 따라가는 기준선 대비 편차
+- 중앙값/MAD 로버스트 점수: 최근 작은 창(기본 15샘플) 기준, 스파이크에 강함
+- 채널당 메모리 고정 (EWMA 상태 + 고정 길이 deque), 샘플당 상수 시간
+- 원본 측정 시각(snapshot['source_times'])이 직전과 같은 채널은 갱신하지 않음
+  (SPS30 백그라운드 캐시, BME688 최소 간격 캐시가 같은 값을 반복해도 새 샘플로 세지 않음)
+
+플래그 구분:
+- 센서 고장(fault): saturated(원본 센서 드라이버의 범위 제한값에 고정), stuck(값이 오래 변하지 않음),
+  jump(직전 값에서 갑자기 튄 짧은 편차)
+- 실제 이벤트(event): excursion(편차가 event_samples 이상 지속)
+"""
+
+import os
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from metrics import ANOMALY_FLAGS
+
+ROBUST_WINDOW = 15
+MAD_SCALE = 1.4826  # 정규분포에서 MAD → 표준편차 환산
+
+# 드라이버가 범위를 벗어난 값을 잘라내는 한계값 {원본 센서: {채널: (하한, 상한)}} (이 값이 그대로 나오면 포화로 판단)
+# 채널의 원본 센서는 snapshot['source_sensors']로 판단 (온도/습도는 보통 SHT40, 없을 때만 BME688)
+SATURATION_LIMITS = {
+    # bme688_sensor._compensate_temperature/_compensate_pressure/_compensate_humidity
+    'bme688': {
+        'temperature': (-40.0, 85.0),
+        'humidity': (0.0, 100.0),
+        'pressure': (300.0, 1100.0)
+    },
+    'sht40': {'humidity': (0.0, 100.0)},  # sht40_sensor.read_data (온도는 제한하지 않음)
+    'sdp810': {'differential_pressure': (-500.0, 500.0)}  # sdp810_sensor.read_data
+}
+
+# 채널별 최소 편차 (측정 잡음 수준, 값이 거의 일정할 때 점수 폭주 방지)
+NOISE_FLOOR = {
+    'temperature': 0.05,
+    'humidity': 0.2,
+    'pressure': 0.05,
+    'differential_pressure': 0.5,
+    'light': 1.0,
+    'gas_resistance': 500.0,
+    'pm1': 0.5,
+    'pm25': 0.5,
+    'pm4': 0.5,
+    'pm10': 0.5
+}
+
+# 값이 이 시간(초) 동안 완전히 같으면 stuck (None이면 검사 안 함 - 어두운 곳의 조도 0 등)
+STUCK_SECONDS = {
+    'temperature': 600,
+    'humidity': 600,
+    'pressure': 600,
+    'differential_pressure': 300,
+    'light': None,
+    'gas_resistance': 600,
+    'pm1': None,
+    'pm25': 600,
+    'pm4': None,
+    'pm10': None
+}
+
+ANOMALY_CHANNELS = tuple(NOISE_FLOOR)
+FAULT_FLAGS = ('saturated', 'stuck', 'jump')
+
+
+class ChannelDetector:
+    """채널 1개의 이상 탐지 상태 (메모리 고정)"""
+    
+    def __init__(self, channel: str, alpha: float = 0.05, z_threshold: float = 4.0,
+                 robust_threshold: float = 6.0, event_samples: int = 5, warmup_samples: int = 30,
+                 window: int = ROBUST_WINDOW):
+        """
+        Args:
+            channel: 스냅샷 채널 이름
+            alpha: EWMA 계수 (작을수록 기준선이 천천히 따라감)
+            z_threshold: EWMA z-점수 편차 기준
+            robust_threshold: 중앙값/MAD 점수 편차 기준
+            event_samples: 편차가 이 샘플 수 이상 지속되면 실제 이벤트(excursion)
+            warmup_samples: 점수 산출 전 최소 샘플 수
+            window: 중앙값/MAD 창 크기
+        """
+        self.channel = channel
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.robust_threshold = robust_threshold
+        self.event_samples = event_samples
+        self.warmup_samples = warmup_samples
+        self.noise_floor = NOISE_FLOOR.get(channel, 1e-6)
+        self.stuck_seconds = STUCK_SECONDS.get(channel)
+        self.limits = None  # 원본 센서의 범위 제한값 (AnomalyDetector가 샘플마다 설정)
+        
+        self.mean = None
+        self.variance = 0.0
+        self.count = 0
+        self._window = deque(maxlen=window)
+        self._previous = None
+        self._unchanged_since = None
+        self._deviation_run = 0
+        self._abrupt_onset = False
+        
+        self.z = None
+        self.robust_z = None
+        self.flags = []
+    
+    def _robust_score(self, value: float) -> Optional[float]:
+        """최근 창의 중앙값/MAD 대비 점수 (창 크기 고정이므로 정렬 비용도 상수)"""
+        if len(self._window) < self._window.maxlen // 2 + 1:
+            return None
+        ordered = sorted(self._window)
+        middle = len(ordered) // 2
+        median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+        deviations = sorted(abs(sample - median) for sample in ordered)
+        mad = deviations[middle] if len(deviations) % 2 else (deviations[middle - 1] + deviations[middle]) / 2
+        return (value - median) / max(MAD_SCALE * mad, self.noise_floor)
+    
+    def update(self, value: float, now: float) -> List[str]:
+        """샘플 1개 반영 후 현재 플래그 반환"""
+        flags = []
+        
+        # 포화: 드라이버 한계값 그대로 (EWMA 기준선은 오염시키지 않음)
+        saturated = self.limits is not None and (value <= self.limits[0] or value >= self.limits[1])
+        if saturated:
+            flags.append('saturated')
+        
+        # 고착: 값이 stuck_seconds 이상 전혀 변하지 않음
+        if value != self._previous:
+            self._unchanged_since = now
+        elif self.stuck_seconds is not None and now - self._unchanged_since >= self.stuck_seconds:
+            flags.append('stuck')
+        
+        # 점수는 현재 샘플을 반영하기 전 상태 기준으로 계산
+        self.robust_z = self._robust_score(value)
+        if self.count >= self.warmup_samples:
+            self.z = (value - self.mean) / max(math.sqrt(self.variance), self.noise_floor)
+        else:
+            self.z = None
+        
+        deviating = ((self.z is not None and abs(self.z) > self.z_threshold) or
+                     (self.robust_z is not None and abs(self.robust_z) > self.robust_threshold))
+        if deviating and not saturated:
+            self._deviation_run += 1
+            if self._deviation_run == 1:
+                step = abs(value - self._previous) if self._previous is not None else 0.0
+                self._abrupt_onset = step > self.robust_threshold * self.noise_floor
+            if self._deviation_run >= self.event_samples:
+                flags.append('excursion')
+            elif self._abrupt_onset:
+                flags.append('jump')
+        else:
+            self._deviation_run = 0
+        
+        if not saturated:
+            if self.mean is None:
+                self.mean = value
+            else:
+                delta = value - self.mean
+                self.mean += self.alpha * delta
+                self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+            self.count += 1
+            self._window.append(value)
+        
+        self._previous = value
+        self.flags = flags
+        return flags
+    
+    @property
+    def status(self) -> str:
+        if any(flag in FAULT_FLAGS for flag in self.flags):
+            return 'fault'
+        if self.flags:
+            return 'event'
+        return 'ok'
+    
+    def to_dict(self) -> Dict:
+        return {
+            'z': None if self.z is None else round(self.z, 2),
+            'robust_z': None if self.robust_z is None else round(self.robust_z, 2),
+            'flags': list(self.flags),
+            'status': self.status
+        }
+
+
+class AnomalyDetector:
+    """스냅샷 처리기: 채널별 이상 점수/플래그를 snapshot['anomaly']에 기록"""
+    
+    def __init__(self, channels=ANOMALY_CHANNELS, **options):
+        """
+        Args:
+            channels: 탐지 대상 채널 목록
+            options: ChannelDetector 설정 (alpha, z_threshold, robust_threshold 등)
+        """
+        self.detectors = {channel: ChannelDetector(channel, **options) for channel in channels}
+        self.flag_counts = {}
+        self._source_times = {}  # 채널별 마지막으로 반영한 원본 측정 시각
+        self.repeated_count = 0
+    
+    def process(self, snapshot: Dict):
+        """
+        스냅샷 처리기: 새 원본 샘플이 있는 채널만 갱신
+        
+        값이 없는 채널은 결과에서 제외, 같은 원본 샘플이 반복된 채널은 직전 결과 유지
+        """
+        now = snapshot.get('acquired_at') or time.time()
+        source_times = snapshot.get('source_times') or {}
+        source_sensors = snapshot.get('source_sensors') or {}
+        result = {}
+        for channel, detector in self.detectors.items():
+            # 필터 단계가 있으면 원본 값으로 판단 (중앙값 필터가 스파이크/포화를 가리지 않도록)
+            value = snapshot.get(f"{channel}_raw", snapshot.get(channel))
+            if value is None:
+                continue
+            
+            source_time = source_times.get(channel)
+            if source_time is not None:
+                if source_time == self._source_times.get(channel):
+                    self.repeated_count += 1
+                    result[channel] = detector.to_dict()
+                    continue
+                self._source_times[channel] = source_time
+            
+            detector.limits = SATURATION_LIMITS.get(source_sensors.get(channel), {}).get(channel)
+            previous_flags = detector.flags
+            for flag in detector.update(float(value), now):
+                # 플래그가 새로 켜질 때만 카운트 (지속 중인 플래그는 1회)
+                if flag not in previous_flags:
+                    key = (channel, flag)
+                    self.flag_counts[key] = self.flag_counts.get(key, 0) + 1
+                    ANOMALY_FLAGS.inc(channel=channel, flag=flag)
+            result[channel] = detector.to_dict()
+        
+        snapshot['anomaly'] = result
+    
+    def get_status(self) -> Dict:
+        """이상 탐지 상태 정보 반환"""
+        return {
+            'channels': {channel: dict(detector.to_dict(), samples=detector.count,
+                                       mean=None if detector.mean is None else round(detector.mean, 3))
+                         for channel, detector in self.detectors.items()},
+            'repeated_count': self.repeated_count,
+            'flag_counts': [{'channel': channel, 'flag': flag, 'count': count}
+                            for (channel, flag), count in sorted(self.flag_counts.items())]
+        }
+
+
+def create_anomaly_detector() -> Optional[AnomalyDetector]:
+    """환경 변수 설정으로 이상 탐지기 생성 (EGDASH_ANOMALY=0이면 None)"""
+    if os.environ.get('EGDASH_ANOMALY', '1') not in ('1', 'true', 'yes'):
+        return None
+    return AnomalyDetector()
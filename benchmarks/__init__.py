@@ -0,0 +1,5 @@
+"""
+EG-Dash 성능 벤치마크 (센서 에뮬레이터 기반, 하드웨어 불필요)
+
+실행: python3 -m benchmarks [--quick] [--only acquisition,storage,api] [--compare 이전결과.json]
+"""
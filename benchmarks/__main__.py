@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+벤치마크 실행기
+
+사용 예:
+    python3 -m benchmarks                            # 전체 실행, benchmarks/results/<시각>.json 저장
+    python3 -m benchmarks --quick --only acquisition # 짧게 일부만
+    python3 -m benchmarks.importtime sensor_api_simple  # import 시간 상세
+    python3 -m benchmarks --compare benchmarks/results/v1.json   # 이전 결과 대비 회귀 표시
+"""
+
+import sys
+import json
+import time
+import argparse
+from benchmarks import acquisition, storage, api, importtime
+from benchmarks.common import environment_info, save_results, compare_results, REGRESSION_THRESHOLD
+
+SUITES = ('startup', 'acquisition', 'storage', 'api')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EG-Dash 성능 벤치마크 (센서 에뮬레이터)')
+    parser.add_argument('--quick', action='store_true', help='반복 횟수/부하 시간 축소')
+    parser.add_argument('--only', default=','.join(SUITES), help=f'실행할 항목 (쉼표 구분: {", ".join(SUITES)})')
+    parser.add_argument('--bus-latency', type=float, default=0.0,
+                        help='에뮬레이터 I2C 트랜잭션당 지연 (초, 실제 버스 속도 근사용)')
+    parser.add_argument('--output', default=None, help='결과 JSON 경로')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='회귀 판정 변화율')
+    args = parser.parse_args()
+    
+    selected = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(selected) - set(SUITES)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+    
+    results = {'created_at': time.time(), 'quick': args.quick, 'environment': environment_info(), 'benchmarks': {}}
+    for name in selected:
+        print(f"🚀 {name} 벤치마크")
+        start = time.perf_counter()
+        if name == 'startup':
+            results['benchmarks'][name] = importtime.run(args.quick)
+        elif name == 'acquisition':
+            results['benchmarks'][name] = acquisition.run(args.quick, args.bus_latency)
+        elif name == 'storage':
+            results['benchmarks'][name] = storage.run(args.quick)
+        else:
+            results['benchmarks'][name] = api.run(args.quick)
+        print(f"✅ {name} 완료 ({time.perf_counter() - start:.1f}초)")
+    
+    path = save_results(results, args.output)
+    print(f"📁 결과 저장: {path}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print(f"⚠️ 회귀 {len(regressions)}건 (기준: {args.compare})")
+            for item in regressions:
+                print(f"   {item['metric']}: {item['baseline']:.3f} → {item['current']:.3f} "
+                      f"({item['change'] * 100:+.1f}%)")
+            sys.exit(1)
+        print("✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
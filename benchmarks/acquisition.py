@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+센서 수집 주기 벤치마크
+- read_all_sensors / read_all_sensors_multi 1회 소요 시간
+- 버스 수(1, 2)와 버스당 장치 수(센서 종류별 1개 또는 2개) 조합
+- SensorAcquisitionThread 스냅샷 생성 + 미리 직렬화 비용
+"""
+
+from typing import Dict
+from sensor_emulator import (FakeSMBus, SHT40Emulator, BME688Emulator, BH1750Emulator, SDP810Emulator,
+                             create_emulated_sensor_manager)
+from benchmarks.common import summarize, time_calls, quiet
+
+# 센서 종류별 SensorManager 검색 주소 (BME688은 0x77만 검색)
+DEVICE_ADDRESSES = (
+    (SHT40Emulator, (0x44, 0x45)),
+    (BME688Emulator, (0x77,)),
+    (BH1750Emulator, (0x23, 0x5C)),
+    (SDP810Emulator, (0x25, 0x26)),
+)
+
+
+def build_buses(bus_count: int, per_type: int, latency: float, seed: int) -> Dict[int, FakeSMBus]:
+    """bus_count개 버스에 센서 종류별 per_type개씩 장치 연결"""
+    buses = {}
+    for bus_number in range(bus_count):
+        bus = FakeSMBus(bus_number)
+        for index, (emulator_class, addresses) in enumerate(DEVICE_ADDRESSES):
+            for address in addresses[:per_type]:
+                bus.attach(address, emulator_class(latency=latency, seed=seed + bus_number * 100 + index * 10 + address))
+        buses[bus_number] = bus
+    return buses
+
+
+def bench_cycle(bus_count: int, per_type: int, latency: float, repeat: int) -> Dict:
+    buses = build_buses(bus_count, per_type, latency, seed=bus_count * 1000 + per_type)
+    with quiet():
+        manager = create_emulated_sensor_manager(seed=1, buses=buses)
+        manager.initialize_sensors()
+    
+    try:
+        with quiet():
+            single = time_calls(manager.read_all_sensors, repeat)
+            multi = time_calls(manager.read_all_sensors_multi, repeat)
+        device_count = sum(len(bus.devices) for bus in buses.values())
+        return {
+            'bus_count': bus_count,
+            'devices_per_bus': device_count // bus_count,
+            'read_all_sensors': summarize(single),
+            'read_all_sensors_multi': summarize(multi)
+        }
+    finally:
+        with quiet():
+            manager.close_sensors()
+
+
+def bench_snapshot(repeat: int) -> Dict:
+    """수집 스레드 1주기 (센서 읽기 제외한 스냅샷 생성/직렬화) 비용"""
+    from sensor_acquisition import SensorAcquisitionThread, SensorSnapshot
+    
+    with quiet():
+        manager = create_emulated_sensor_manager(seed=2)
+        manager.initialize_sensors()
+        data = manager.read_all_sensors()
+    
+    thread = SensorAcquisitionThread(manager, eager_shapes={'stream': None})
+    
+    def store():
+        snapshot = SensorSnapshot(data)
+        thread._store_snapshot(snapshot)
+    
+    try:
+        return summarize(time_calls(store, repeat * 10))
+    finally:
+        with quiet():
+            manager.close_sensors()
+
+
+def run(quick: bool = False, latency: float = 0.0) -> Dict:
+    repeat = 5 if quick else 30
+    cycles = []
+    for bus_count in (1, 2):
+        for per_type in (1, 2):
+            print(f"  ⏱️ 수집 주기: 버스 {bus_count}개 × 종류별 {per_type}개")
+            cycles.append(bench_cycle(bus_count, per_type, latency, repeat))
+    
+    return {
+        'bus_latency_s': latency,
+        'cycles': cycles,
+        'snapshot_store': bench_snapshot(repeat)
+    }
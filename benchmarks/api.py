@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+HTTP API 벤치마크 (에뮬레이터 모드 서버를 별도 프로세스로 실행)
+- 시작 시간: 프로세스 실행 → 첫 응답 바이트 / 첫 200 응답 (/api/current)
+- /api/current 지연 시간 p50/p99: 동시 클라이언트 1, 10, 50개 (로컬 부하 생성기)
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+import subprocess
+import http.client
+from typing import Dict, List, Tuple
+from benchmarks.common import REPO_ROOT, summarize
+
+CONCURRENCY_LEVELS = (1, 10, 50)
+STARTUP_TIMEOUT = 60.0
+
+SERVER_SCRIPT = '''
+import sys
+import sensor_api_simple as api
+api.initialize_sensors()
+api.app.run(host="127.0.0.1", port=int(sys.argv[1]), threaded=True)
+'''
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def request(port: int, path: str, timeout: float = 10.0) -> Tuple[int, float, int]:
+    """GET 요청 1회 (상태 코드, 소요 시간(초), 응답 크기)"""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, time.perf_counter() - start, len(body)
+    finally:
+        connection.close()
+
+
+def start_server(work_dir: str) -> Tuple[subprocess.Popen, int, Dict]:
+    """서버 실행 후 시작 시간 측정 (DB 파일은 work_dir에 생성)"""
+    port = free_port()
+    env = dict(os.environ, EGDASH_EMULATOR='1', PYTHONPATH=REPO_ROOT, PYTHONUNBUFFERED='1')
+    env.pop('EGDASH_RECORD_TRACE', None)
+    env.pop('EGDASH_REPLAY_TRACE', None)
+    
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', SERVER_SCRIPT, str(port)], cwd=work_dir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    first_byte = None
+    first_data = None
+    while time.perf_counter() - start < STARTUP_TIMEOUT:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 프로세스 종료 (코드 {process.returncode})")
+        try:
+            status, _, _ = request(port, '/api/current', timeout=2.0)
+        except OSError:
+            time.sleep(0.01)
+            continue
+        now = time.perf_counter() - start
+        if first_byte is None:
+            first_byte = now
+        if status == 200:
+            first_data = now
+            break
+        time.sleep(0.01)
+    
+    if first_data is None:
+        process.terminate()
+        raise RuntimeError("서버 시작 시간 초과")
+    
+    return process, port, {'first_byte_s': round(first_byte, 4), 'first_200_s': round(first_data, 4)}
+
+
+def load(port: int, path: str, clients: int, duration: float) -> Dict:
+    """clients개 스레드가 duration초 동안 연속 요청"""
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    deadline = time.perf_counter() + duration
+    
+    def client(index):
+        while time.perf_counter() < deadline:
+            try:
+                status, elapsed, _ = request(port, path)
+            except OSError:
+                errors[index] += 1
+                continue
+            if status == 200:
+                latencies[index].append(elapsed)
+            else:
+                errors[index] += 1
+    
+    threads = [threading.Thread(target=client, args=(index,), daemon=True) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    samples = [latency for client_latencies in latencies for latency in client_latencies]
+    result = summarize(samples)
+    result.update({
+        'clients': clients,
+        'errors': sum(errors),
+        'requests_per_s': round(len(samples) / elapsed, 1)
+    })
+    return result
+
+
+def run(quick: bool = False) -> Dict:
+    duration = 2.0 if quick else 10.0
+    with tempfile.TemporaryDirectory() as work_dir:
+        print("  ⏱️ 서버 시작 시간")
+        process, port, startup = start_server(work_dir)
+        try:
+            current = {}
+            for clients in CONCURRENCY_LEVELS:
+                print(f"  ⏱️ /api/current 동시 클라이언트 {clients}개")
+                current[str(clients)] = load(port, '/api/current', clients, duration)
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    return {'startup': startup, 'api_current': current}
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+벤치마크 공통 유틸리티
+- 지연 시간 요약 (p50/p95/p99), 드라이버 출력 억제, 결과 JSON 저장/비교
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from contextlib import contextmanager, redirect_stdout
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+
+# 회귀로 판단할 변화율 (10% 이상 느려지면 표시)
+REGRESSION_THRESHOLD = 0.10
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """정렬된 샘플의 백분위수 (nearest-rank)"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """초 단위 샘플 목록 → 밀리초 단위 요약"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'count': count,
+        'mean_ms': round(sum(ordered) * 1000.0 / count, 4) if count else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000.0, 4),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000.0, 4),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000.0, 4),
+        'max_ms': round(ordered[-1] * 1000.0, 4) if count else 0.0
+    }
+
+
+def time_calls(function, repeat: int, warmup: int = 1) -> List[float]:
+    """함수를 repeat번 호출하며 호출별 소요 시간(초) 수집"""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+@contextmanager
+def quiet():
+    """드라이버/스레드의 print 출력 억제 (측정 중 터미널 출력 비용 제외)"""
+    with redirect_stdout(io.StringIO()):
+        yield
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment_info() -> Dict:
+    """결과 비교용 실행 환경 정보"""
+    try:
+        import orjson  # noqa: F401
+        json_backend = 'orjson'
+    except ImportError:
+        json_backend = 'json'
+    
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'json_backend': json_backend,
+        'git_revision': git_revision()
+    }
+
+
+def save_results(results: Dict, path: Optional[str] = None) -> str:
+    """결과 JSON 저장 (경로 미지정 시 benchmarks/results/<시각>.json)"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def _flatten(value, prefix='') -> Dict[str, float]:
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f'{prefix}.{key}' if prefix else str(key)))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: float(value)}
+    return {}
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[Dict]:
+    """
+    두 결과의 지연 시간(_ms, _s)과 처리량(_per_s) 비교
+    
+    Returns:
+        List[Dict]: threshold 이상 나빠진 항목 (metric, baseline, current, change)
+    """
+    before = _flatten(baseline.get('benchmarks', {}))
+    after = _flatten(current.get('benchmarks', {}))
+    
+    regressions = []
+    for metric, old in before.items():
+        new = after.get(metric)
+        if new is None or old <= 0 or metric.endswith('.count') or 'max_ms' in metric:
+            continue
+        if metric.endswith('_per_s'):
+            change = (old - new) / old
+        elif metric.endswith(('_ms', '_s')):
+            change = (new - old) / old
+        else:
+            continue
+        if change >= threshold:
+            regressions.append({'metric': metric, 'baseline': old, 'current': new, 'change': round(change, 3)})
+    return sorted(regressions, key=lambda item: -item['change'])
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+모듈 import 시간 벤치마크 (python -X importtime 기반)
+- 새 인터프리터에서 모듈을 import하며 모듈별 self/누적 시간 수집 (여러 번 실행 후 중앙값)
+- 무거운 선택적 모듈(드라이버, smbus2, SHDLC, flask_cors, shared_memory)이 로딩되는지 함께 기록
+
+실행: python3 -m benchmarks.importtime [--runs 5] [--top 15] [모듈 ...]
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+from benchmarks.common import REPO_ROOT
+
+DEFAULT_MODULES = ('sensor_api_simple', 'database', 'sensor_manager')
+
+# 시작 시점에 로딩되지 않아야 하는 모듈 (센서 검색/해당 모드에서만 필요)
+LAZY_MODULES = ('smbus2', 'sht40_sensor', 'bme688_sensor', 'bh1750_sensor', 'sdp810_sensor',
+                'sps30_background_thread', 'shdlc_sps30', 'sensirion_shdlc_driver', 'flask_cors',
+                'multiprocessing.shared_memory')
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict]:
+    """-X importtime 출력 → {모듈: {'self_us', 'cumulative_us'}}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules[name.strip()] = {'self_us': int(self_us), 'cumulative_us': int(cumulative_us)}
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_once(module: str, env: Dict = None) -> Dict[str, Dict]:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패: {result.stderr.strip().splitlines()[-1:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure(module: str, runs: int = 5, top: int = 15, env: Dict = None) -> Dict:
+    """
+    모듈 import 시간 측정
+    
+    Returns:
+        Dict: total_ms(중앙값), first_run_ms(디스크 캐시 영향 포함), 누적 시간 상위 top개 직접 import 모듈,
+              로딩된 LAZY_MODULES 목록
+    """
+    samples = [measure_once(module, env) for _ in range(max(1, runs))]
+    totals = [sample.get(module, {}).get('cumulative_us', 0) for sample in samples]
+    last = samples[-1]
+    
+    heaviest = sorted(last.items(), key=lambda item: -item[1]['self_us'])[:top]
+    return {
+        'module': module,
+        'runs': len(samples),
+        'total_ms': round(statistics.median(totals) / 1000.0, 3),
+        'first_run_ms': round(totals[0] / 1000.0, 3),
+        'module_count': len(last),
+        'heaviest_self': [{'module': name, 'self_ms': round(times['self_us'] / 1000.0, 3),
+                           'cumulative_ms': round(times['cumulative_us'] / 1000.0, 3)}
+                          for name, times in heaviest],
+        'loaded_lazy_modules': [name for name in LAZY_MODULES if name in last]
+    }
+
+
+def run(quick: bool = False, modules: List[str] = DEFAULT_MODULES) -> Dict:
+    runs = 3 if quick else 7
+    results = {}
+    for module in modules:
+        print(f"  ⏱️ import {module}")
+        results[module] = measure(module, runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모듈 import 시간 측정 (-X importtime)')
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES))
+    parser.add_argument('--runs', type=int, default=5, help='측정 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--top', type=int, default=15, help='self 시간 상위 모듈 수')
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args()
+    
+    results = {module: measure(module, args.runs, args.top) for module in args.modules}
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    
+    for module, result in results.items():
+        print(f"\n📦 {module}: {result['total_ms']:.1f}ms (첫 실행 {result['first_run_ms']:.1f}ms, "
+              f"모듈 {result['module_count']}개)")
+        for item in result['heaviest_self']:
+            print(f"   {item['self_ms']:8.2f}ms  (누적 {item['cumulative_ms']:8.2f}ms)  {item['module']}")
+        lazy = ', '.join(result['loaded_lazy_modules']) or '없음'
+        print(f"   지연 로딩 대상 중 로딩됨: {lazy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+저장/조회 벤치마크
+- 수집 데이터 적재: 공유 메모리 링 게시(스냅샷/초), 스캔 이력 DB 일괄 저장(행/초, 배치 크기별)
+- 이력 조회: 공유 메모리 링 최근 N초 (1분/15분/1시간), DB 최근 스캔 이력 (limit별)
+"""
+
+import os
+import sys
+import time
+import uuid
+import tempfile
+from typing import Dict
+from database import SensorDatabase
+from shm_snapshot import SharedMemorySnapshotWriter, SharedMemorySnapshotReader, DEFAULT_RING_CAPACITY
+from sensor_emulator import create_emulated_sensor_manager
+from benchmarks.common import summarize, time_calls, quiet
+
+INGEST_BATCH_SIZES = (1, 10, 100, 1000)
+HISTORY_RANGES = {'1m': 60, '15m': 900, '1h': 3600}
+SCAN_HISTORY_LIMITS = (50, 500, 5000)
+
+
+def sample_snapshot() -> Dict:
+    with quiet():
+        manager = create_emulated_sensor_manager(seed=3)
+        manager.initialize_sensors()
+        data = manager.read_all_sensors()
+        manager.close_sensors()
+    data['acquired_at'] = time.time()
+    data['seq'] = 1
+    return data
+
+
+def bench_shm(snapshot: Dict, quick: bool) -> Dict:
+    writer = SharedMemorySnapshotWriter(f'egdash_bench_{uuid.uuid4().hex[:8]}', DEFAULT_RING_CAPACITY)
+    try:
+        publish_count = DEFAULT_RING_CAPACITY
+        start = time.perf_counter()
+        for seq in range(1, publish_count + 1):
+            snapshot['seq'] = seq
+            writer.publish(snapshot)
+        elapsed = time.perf_counter() - start
+        
+        reader = SharedMemorySnapshotReader(writer.name)
+        if sys.version_info < (3, 13):
+            # 같은 프로세스의 읽기 연결이 기록기 세그먼트까지 추적 해제하므로 다시 등록 (삭제 시 경고 방지)
+            from multiprocessing import resource_tracker
+            resource_tracker.register(writer._shm._name, 'shared_memory')
+        try:
+            repeat = 20 if quick else 200
+            history = {}
+            for label, seconds in HISTORY_RANGES.items():
+                history[label] = summarize(time_calls(lambda: reader.read_history('temperature', seconds), repeat))
+            current = summarize(time_calls(reader.read_current, repeat * 5))
+        finally:
+            reader.close()
+        
+        return {
+            'ingest': {'snapshots': publish_count, 'snapshots_per_s': round(publish_count / elapsed, 1)},
+            'read_current': current,
+            'history': history
+        }
+    finally:
+        writer.close()
+
+
+def bench_database(quick: bool) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        with quiet():
+            db = SensorDatabase(os.path.join(directory, 'bench.db'))
+        try:
+            ingest = {}
+            total_rows = 20000 if quick else 100000
+            for batch_size in INGEST_BATCH_SIZES:
+                # 버스당 최대 100개 주소로 batch_size 행 구성
+                buses = {}
+                for row in range(batch_size):
+                    buses.setdefault(row // 100, []).append(0x08 + row % 100)
+                batches = max(1, total_rows // batch_size // (10 if batch_size == 1 else 1))
+                
+                start = time.perf_counter()
+                for _ in range(batches):
+                    db.add_scan_results(buses)
+                elapsed = time.perf_counter() - start
+                ingest[str(batch_size)] = {
+                    'rows': batches * batch_size,
+                    'rows_per_s': round(batches * batch_size / elapsed, 1),
+                    'batch_ms': round(elapsed * 1000.0 / batches, 4)
+                }
+            
+            repeat = 5 if quick else 30
+            history = {}
+            for limit in SCAN_HISTORY_LIMITS:
+                history[str(limit)] = summarize(time_calls(lambda: db.get_recent_scan_results(limit), repeat))
+            
+            return {'ingest': ingest, 'recent_scan_results': history}
+        finally:
+            db.close()
+
+
+def run(quick: bool = False) -> Dict:
+    print("  ⏱️ 공유 메모리 링 적재/조회")
+    shm = bench_shm(sample_snapshot(), quick)
+    print("  ⏱️ SQLite 스캔 이력 적재/조회")
+    return {'shared_memory': shm, 'database': bench_database(quick)}
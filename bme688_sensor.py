@@ -8,6 +8,7 @@ constants.py의 상수들을 활용
 import time
 import smbus2
 import constants as const
+from tracer import TRACER
 
 
 class BME688Sensor:
@@ -24,7 +25,9 @@ class BME688Sensor:
         self.min_interval = 3.0  # 3초 최소 간격
         self.cached_data = None
         self.cache_valid_time = 2.0  # 캐시 유효 시간
+        self.measured_at = None  # cached_data를 실제로 측정한 시각
         self.error_count = 0
+        self.retry_count = 0  # 누적 재시도 횟수
         self.max_errors = 3
         self.backoff_time = 30.0  # 30초 대기
         
@@ -109,6 +112,9 @@ class BME688Sensor:
             self.calibration_data['res_heat_val'] = heat_value
             self.calibration_data['range_sw_err'] = (sw_error & const.RSERROR_MSK) // 16
             
+            # 가스 ADC 변형 (BME688 = VARIANT_HIGH: 가스 값 위치와 저항 공식이 BME680과 다름)
+            self.calibration_data['variant_id'] = self.bus.read_byte_data(self.address, const.CHIP_VARIANT_ADDR)
+            
             # t_fine 초기화
             self.calibration_data['t_fine'] = 0.0
             
@@ -124,7 +130,7 @@ class BME688Sensor:
                 'par_h1': 515, 'par_h2': 694, 'par_h3': 0, 'par_h4': 45, 'par_h5': 20, 'par_h6': 120, 'par_h7': -100,
                 'par_gh1': -1, 'par_gh2': -15, 'par_gh3': 18,
                 'res_heat_range': 1, 'res_heat_val': 0, 'range_sw_err': 0,
-                't_fine': 0.0
+                'variant_id': const.VARIANT_HIGH, 't_fine': 0.0
             }
             print(f"⚠️ 기본 캘리브레이션 데이터 사용 중")
     
@@ -178,6 +184,7 @@ class BME688Sensor:
                     self.error_count = 0
                     self.last_read_time = time.time()
                     self.cached_data = data
+                    self.measured_at = self.last_read_time
                     return data
                 else:
                     print(f"⚠️ BME688 데이터 읽기 실패 (retry {retry + 1}/{max_retries})")
@@ -187,8 +194,11 @@ class BME688Sensor:
                 
             # 재시도 전 대기 (지수적 백오프)
             if retry < max_retries - 1:
+                self.retry_count += 1
+                TRACER.instant('bme688.retry', 'sensor', retry=retry + 1)
                 wait_time = 0.5 * (2 ** retry)  # 0.5, 1.0, 2.0초
-                time.sleep(wait_time)
+                with TRACER.span('bme688.retry_backoff', 'sleep', seconds=wait_time):
+                    time.sleep(wait_time)
                 self._reinitialize_sensor()
         
         # 모든 재시도 실패
@@ -210,7 +220,8 @@ class BME688Sensor:
         # 적응형 대기 시간 (최대 1초)
         max_wait_cycles = 10
         for i in range(max_wait_cycles):
-            time.sleep(0.1)  # 100ms씩 대기
+            with TRACER.span('bme688.conversion_wait', 'sleep', cycle=i):
+                time.sleep(0.1)  # 100ms씩 대기
             
             try:
                 status = self.bus.read_byte_data(self.address, const.FIELD0_ADDR)
@@ -234,15 +245,17 @@ class BME688Sensor:
             press_raw = (field_data[2] << 12) | (field_data[3] << 4) | (field_data[4] >> 4)
             # 습도 데이터 (0x25-0x26)
             hum_raw = (field_data[8] << 8) | field_data[9]
-            # 가스 데이터 (0x2A-0x2B)
-            gas_raw = (field_data[13] << 2) | (field_data[14] >> 6)
-            gas_range = field_data[14] & const.GAS_RANGE_MSK
+            # 가스 데이터 (BME680: 0x2A-0x2B, BME688: 0x2C-0x2D)
+            gas_offset = 15 if self.calibration_data.get('variant_id') == const.VARIANT_HIGH else 13
+            gas_raw = (field_data[gas_offset] << 2) | (field_data[gas_offset + 1] >> 6)
+            gas_range = field_data[gas_offset + 1] & const.GAS_RANGE_MSK
             
             # 실제 값으로 변환
-            temperature = self._compensate_temperature(temp_raw)
-            pressure = self._compensate_pressure(press_raw, temperature)
-            humidity = self._compensate_humidity(hum_raw, temperature)
-            gas_resistance = self._compensate_gas(gas_raw, gas_range)
+            with TRACER.span('bme688.compensate', 'math'):
+                temperature = self._compensate_temperature(temp_raw)
+                pressure = self._compensate_pressure(press_raw, temperature)
+                humidity = self._compensate_humidity(hum_raw, temperature)
+                gas_resistance = self._compensate_gas(gas_raw, gas_range)
             
             return {
                 'temperature': temperature,
@@ -355,21 +368,25 @@ class BME688Sensor:
         return max(0.0, min(100.0, humidity))  # 습도 범위 제한
     
     def _compensate_gas(self, gas_raw, gas_range):
-        """가스 저항 보정 (BME688 공식 알고리즘)"""
-        if not gas_raw:
-            return 0.0
-        
-        # BME688 공식 가스 저항 보정 알고리즘
-        var1 = 1340.0 + 5.0 * self.calibration_data['range_sw_err']
-        var2 = var1 * (1.0 + self.calibration_data['par_gh1'] / 32768.0)
-        var3 = 1.0 + self.calibration_data['par_gh2'] / 32768.0
-        
-        gas_resistance = var2 * gas_raw / (var3 * const.lookupTable1[gas_range])
-        
-        return max(0.0, min(200000.0, gas_resistance))
+        """
+        가스 저항 보정 (Bosch BME68x API 정수 알고리즘, 단위 Ω)
+        
+        ADC 값이 클수록 저항은 작음 (gas_range가 1 늘 때마다 측정 범위가 절반)
+        """
+        if self.calibration_data.get('variant_id') == const.VARIANT_HIGH:
+            # BME688: 범위별 조회표 없이 ADC 기준값 512 대비 선형
+            var1 = 262144 >> gas_range
+            var2 = 4096 + 3 * (gas_raw - 512)
+            return 1000000.0 * var1 / var2
+        
+        # BME680: 범위별 조회표와 스위칭 오차 보정
+        var1 = ((1340 + 5 * self.calibration_data['range_sw_err']) * const.lookupTable1[gas_range]) >> 16
+        var2 = (gas_raw << 15) - 16777216 + var1
+        var3 = (const.lookupTable2[gas_range] * var1) >> 9
+        return (var3 + (var2 >> 1)) / var2
     
     def _calculate_air_quality(self, gas_resistance):
-        """공기질 지수 계산 (0-100)"""
+        """단순 공기질 점수 (0-100, 고정 임계값 - 수집 스레드의 IAQ 추정기가 기준선 기반 값으로 대체)"""
         if gas_resistance <= 0:
             return 0
         
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+I2C / SPS30 트래픽 녹화 및 재생
+- 녹화: 실제(또는 에뮬레이터) 버스를 감싸 모든 트랜잭션을 압축 바이너리 트레이스로 기록
+  (시각, 소요 시간, 버스, 주소, 보낸 바이트, 받은 바이트, errno)
+- 재생: 트레이스를 가짜 버스/SPS30 장치로 되돌려 드라이버와 SensorManager를 그대로 실행
+  (기록된 소요 시간대로, speed 배 가속, 또는 지연 없이)
+- 현장에서 발생한 BME688 타임아웃, SHT40 Remote I/O 폭주 등을 오프라인에서 재현하고
+  수정 전후 지연 시간/처리량 비교
+
+파일 형식 (리틀 엔디언):
+    헤더: magic 'EGBT', 버전(u16), 예약(u16), 녹화 시작 시각(f64, epoch)
+    레코드: 시각(f64, 시작 기준 초), 소요 시간(f32), 채널(u8), 동작(u8), 주소(u16),
+            errno(u16), 보낸 길이(u16), 받은 길이(u16) + 보낸 바이트 + 받은 바이트
+
+SPS30은 시리얼 포트를 sensirion SHDLC 라이브러리가 소유하므로 장치 명령 단위로 기록
+(보낸 바이트 = 메서드 이름, 받은 바이트 = JSON 결과)
+
+사용 예:
+    EGDASH_RECORD_TRACE=/var/log/egdash/bus.trace python3 sensor_api_simple.py
+    python3 bus_trace.py dump bus.trace
+    python3 bus_trace.py replay bus.trace --speed 10
+"""
+
+import os
+import json
+import time
+import errno
+import ctypes
+import atexit
+import struct
+import argparse
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from smbus2.smbus2 import I2C_M_RD
+
+TRACE_MAGIC = b'EGBT'
+TRACE_VERSION = 1
+FILE_HEADER = struct.Struct('<4sHHd')
+RECORD_HEADER = struct.Struct('<dfBBHHHH')
+
+# 동작 종류
+OP_OPEN = 0         # 버스 열기 (errno만 의미 있음)
+OP_WRITE = 1        # 쓰기 (i2c_rdwr 쓰기 메시지, write_byte, write_byte_data 등)
+OP_READ = 2         # 읽기 (i2c_rdwr 읽기 메시지, read_byte)
+OP_WRITE_READ = 3   # 레지스터 쓰기 후 읽기 (read_byte_data, read_i2c_block_data 등)
+OP_CALL = 4         # SPS30 장치 명령
+
+OP_NAMES = {OP_OPEN: 'open', OP_WRITE: 'write', OP_READ: 'read', OP_WRITE_READ: 'write_read', OP_CALL: 'call'}
+
+SPS30_CHANNEL = 255
+CALL_ERROR = 0xFFFF  # SPS30 명령 예외 (errno 필드)
+
+FLUSH_INTERVAL = 1.0  # 녹화 파일 flush 간격 (초)
+
+
+class TraceRecord(NamedTuple):
+    """트레이스 레코드 1개"""
+    timestamp: float
+    duration: float
+    channel: int
+    op: int
+    address: int
+    error: int
+    out_data: bytes
+    in_data: bytes
+
+
+class TraceRecorder:
+    """바이너리 트레이스 기록기 (Thread-safe)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._start = time.perf_counter()
+        self._last_flush = time.monotonic()
+        self._file.write(FILE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, time.time()))
+        self.record_count = 0
+        self.byte_count = FILE_HEADER.size
+        atexit.register(self.close)
+    
+    def now(self) -> float:
+        """녹화 시작 기준 경과 시간 (초)"""
+        return time.perf_counter() - self._start
+    
+    def record(self, channel: int, op: int, address: int, start: float, out_data=b'', in_data=b'', error: int = 0):
+        """트랜잭션 기록 (start: now()로 얻은 시작 시각)"""
+        out_data = bytes(out_data)
+        in_data = bytes(in_data)
+        header = RECORD_HEADER.pack(start, self.now() - start, channel, op, address,
+                                    error & 0xFFFF, len(out_data), len(in_data))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(header + out_data + in_data)
+            self.record_count += 1
+            self.byte_count += len(header) + len(out_data) + len(in_data)
+            
+            if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+    
+    def close(self):
+        """기록 종료"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def get_status(self) -> Dict:
+        return {'path': self.path, 'record_count': self.record_count, 'byte_count': self.byte_count}
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """트레이스 파일 레코드 순회 (마지막 레코드가 잘렸으면 거기서 종료)"""
+    with open(path, 'rb') as f:
+        magic, version, _, _ = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError(f"지원하지 않는 트레이스 파일: {path}")
+        
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            timestamp, duration, channel, op, address, error, out_len, in_len = RECORD_HEADER.unpack(header)
+            payload = f.read(out_len + in_len)
+            if len(payload) < out_len + in_len:
+                return
+            yield TraceRecord(timestamp, duration, channel, op, address, error,
+                              payload[:out_len], payload[out_len:])
+
+
+def _error_number(error: Exception) -> int:
+    return getattr(error, 'errno', None) or errno.EIO
+
+
+class RecordingSMBus:
+    """SMBus를 감싸 모든 트랜잭션을 기록하는 버스"""
+    
+    def __init__(self, bus, bus_number: int, recorder: TraceRecorder):
+        self._bus = bus
+        self.bus_number = bus_number
+        self.recorder = recorder
+    
+    def _call(self, op, address, out_data, function, *args):
+        start = self.recorder.now()
+        try:
+            result = function(*args)
+        except OSError as e:
+            self.recorder.record(self.bus_number, op, address, start, out_data, error=_error_number(e))
+            raise
+        return start, result
+    
+    def i2c_rdwr(self, *i2c_msgs):
+        start = self.recorder.now()
+        try:
+            self._bus.i2c_rdwr(*i2c_msgs)
+        except OSError as e:
+            first = i2c_msgs[0]
+            op = OP_READ if first.flags & I2C_M_RD else OP_WRITE
+            out_data = b'' if op == OP_READ else bytes(first)
+            self.recorder.record(self.bus_number, op, first.addr, start, out_data, error=_error_number(e))
+            raise
+        
+        for msg in i2c_msgs:
+            if msg.flags & I2C_M_RD:
+                self.recorder.record(self.bus_number, OP_READ, msg.addr, start, in_data=bytes(list(msg)))
+            else:
+                self.recorder.record(self.bus_number, OP_WRITE, msg.addr, start, out_data=bytes(msg))
+    
+    def write_quick(self, i2c_addr, force=None):
+        start, _ = self._call(OP_WRITE, i2c_addr, b'', self._bus.write_quick, i2c_addr, force)
+        self.recorder.record(self.bus_number, OP_WRITE, i2c_addr, start)
+    
+    def read_byte(self, i2c_addr, force=None):
+        start, value = self._call(OP_READ, i2c_addr, b'', self._bus.read_byte, i2c_addr, force)
+        self.recorder.record(self.bus_number, OP_READ, i2c_addr, start, in_data=[value])
+        return value
+    
+    def write_byte(self, i2c_addr, value, force=None):
+        start, _ = self._call(OP_WRITE, i2c_addr, [value], self._bus.write_byte, i2c_addr, value, force)
+        self.recorder.record(self.bus_number, OP_WRITE, i2c_addr, start, out_data=[value])
+    
+    def read_byte_data(self, i2c_addr, register, force=None):
+        start, value = self._call(OP_WRITE_READ, i2c_addr, [register], self._bus.read_byte_data,
+                                  i2c_addr, register, force)
+        self.recorder.record(self.bus_number, OP_WRITE_READ, i2c_addr, start, [register], [value])
+        return value
+    
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        start, _ = self._call(OP_WRITE, i2c_addr, [register, value], self._bus.write_byte_data,
+                              i2c_addr, register, value, force)
+        self.recorder.record(self.bus_number, OP_WRITE, i2c_addr, start, out_data=[register, value])
+    
+    def read_word_data(self, i2c_addr, register, force=None):
+        start, value = self._call(OP_WRITE_READ, i2c_addr, [register], self._bus.read_word_data,
+                                  i2c_addr, register, force)
+        self.recorder.record(self.bus_number, OP_WRITE_READ, i2c_addr, start, [register],
+                             [value & 0xFF, (value >> 8) & 0xFF])
+        return value
+    
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        start, data = self._call(OP_WRITE_READ, i2c_addr, [register], self._bus.read_i2c_block_data,
+                                 i2c_addr, register, length, force)
+        self.recorder.record(self.bus_number, OP_WRITE_READ, i2c_addr, start, [register], data)
+        return data
+    
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        out_data = [register] + list(data)
+        start, _ = self._call(OP_WRITE, i2c_addr, out_data, self._bus.write_i2c_block_data,
+                              i2c_addr, register, data, force)
+        self.recorder.record(self.bus_number, OP_WRITE, i2c_addr, start, out_data=out_data)
+    
+    def close(self):
+        self._bus.close()
+    
+    def __getattr__(self, name):
+        return getattr(self._bus, name)
+
+
+class RecordingSps30Device:
+    """SPS30 장치 명령을 기록하는 래퍼"""
+    
+    METHODS = ('device_information_serial_number', 'device_reset', 'start_measurement',
+               'stop_measurement', 'read_measured_value')
+    
+    def __init__(self, device, recorder: TraceRecorder):
+        self._device = device
+        self.recorder = recorder
+    
+    def __getattr__(self, name):
+        attribute = getattr(self._device, name)
+        if name not in self.METHODS:
+            return attribute
+        
+        def recorded_call(*args, **kwargs):
+            start = self.recorder.now()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as e:
+                self.recorder.record(SPS30_CHANNEL, OP_CALL, 0, start, name.encode(),
+                                     f"{type(e).__name__}: {e}".encode(), error=CALL_ERROR)
+                raise
+            self.recorder.record(SPS30_CHANNEL, OP_CALL, 0, start, name.encode(),
+                                 json.dumps(result, default=str).encode())
+            return result
+        
+        return recorded_call
+
+
+def recording_bus_factory(base_factory, recorder: TraceRecorder):
+    """버스 생성 함수를 감싸 버스 열기 결과와 이후 트랜잭션 기록"""
+    def factory(bus_number):
+        start = recorder.now()
+        try:
+            bus = base_factory(bus_number)
+        except OSError as e:
+            recorder.record(bus_number, OP_OPEN, 0, start, error=_error_number(e))
+            raise
+        recorder.record(bus_number, OP_OPEN, 0, start)
+        return RecordingSMBus(bus, bus_number, recorder)
+    return factory
+
+
+def recording_sps30_factory(base_factory, recorder: TraceRecorder):
+    """SPS30 백그라운드 스레드 생성 함수를 감싸 장치 명령 기록"""
+    def factory():
+        thread = base_factory()
+        
+        # 생성자에서 이미 끝난 연결 확인 결과를 재생용으로 기록
+        start = recorder.now()
+        if thread.sensor_connected:
+            recorder.record(SPS30_CHANNEL, OP_CALL, 0, start, b'device_information_serial_number',
+                            json.dumps(thread.serial_number, default=str).encode())
+        else:
+            recorder.record(SPS30_CHANNEL, OP_CALL, 0, start, b'device_information_serial_number',
+                            b'OSError: not connected', error=CALL_ERROR)
+        
+        base_opener = thread.device_opener
+        
+        @contextmanager
+        def open_device(port_path):
+            with base_opener(port_path) as device:
+                yield RecordingSps30Device(device, recorder)
+        
+        thread.device_opener = open_device
+        return thread
+    return factory
+
+
+def attach_recorder(sensor_manager, path: str) -> TraceRecorder:
+    """SensorManager의 버스/SPS30 생성 함수에 녹화기 연결 (initialize_sensors() 전에 호출)"""
+    recorder = TraceRecorder(path)
+    sensor_manager.bus_factory = recording_bus_factory(sensor_manager.bus_factory, recorder)
+    sensor_manager.sps30_factory = recording_sps30_factory(sensor_manager.sps30_factory, recorder)
+    print(f"⏺️ 버스 트래픽 녹화: {path}")
+    return recorder
+
+
+class ReplayError(OSError):
+    """재생 트레이스와 드라이버 요청 불일치 또는 트레이스 소진"""
+
+
+class TraceReplay:
+    """트레이스 재생기 (채널별 커서, 요청과 레코드 대조)"""
+    
+    def __init__(self, path: str, speed: float = 0.0, strict: bool = False, resync_window: int = 64):
+        """
+        Args:
+            path: 트레이스 파일 경로
+            speed: 기록된 소요 시간 재현 배속 (1.0 = 기록 속도, 10.0 = 10배 가속, 0 = 지연 없음)
+            strict: True면 첫 불일치에서 ReplayError, False면 앞쪽 레코드에서 재동기화 시도
+            resync_window: 재동기화 시 탐색할 최대 레코드 수
+        """
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.resync_window = resync_window
+        
+        self._records = defaultdict(list)
+        for record in read_trace(path):
+            self._records[record.channel].append(record)
+        self._cursors = defaultdict(int)
+        self._lock = threading.Lock()
+        
+        self.served_count = 0
+        self.mismatch_count = 0
+        self.skipped_count = 0
+    
+    @property
+    def channels(self) -> List[int]:
+        return sorted(self._records)
+    
+    def remaining(self, channel: int) -> int:
+        return len(self._records[channel]) - self._cursors[channel]
+    
+    @property
+    def i2c_exhausted(self) -> bool:
+        """I2C 채널 레코드를 모두 재생했는지 여부"""
+        return all(self.remaining(channel) == 0 for channel in self._records if channel != SPS30_CHANNEL)
+    
+    def next_record(self, channel: int, op: int, address: int, out_data=b'') -> TraceRecord:
+        """요청과 일치하는 다음 레코드 반환 (기록된 오류는 그대로 다시 발생)"""
+        out_data = bytes(out_data)
+        with self._lock:
+            records = self._records[channel]
+            cursor = self._cursors[channel]
+            if cursor >= len(records):
+                raise ReplayError(errno.ENODATA, f"트레이스 소진 (채널 {channel})")
+            
+            index = None
+            window = 1 if self.strict else self.resync_window
+            for candidate in range(cursor, min(cursor + window, len(records))):
+                record = records[candidate]
+                if record.op == op and record.address == address and record.out_data == out_data:
+                    index = candidate
+                    break
+            
+            if index is None:
+                self.mismatch_count += 1
+                raise ReplayError(errno.EPROTO,
+                                  f"재생 불일치 (채널 {channel}, {OP_NAMES.get(op, op)} 0x{address:02X} "
+                                  f"{out_data.hex()}; 기대: {OP_NAMES.get(records[cursor].op)} "
+                                  f"0x{records[cursor].address:02X} {records[cursor].out_data.hex()})")
+            
+            self.skipped_count += index - cursor
+            self._cursors[channel] = index + 1
+            self.served_count += 1
+        
+        if self.speed > 0 and record.duration > 0:
+            time.sleep(record.duration / self.speed)
+        if record.error and op != OP_CALL:
+            raise OSError(record.error, os.strerror(record.error))
+        return record
+    
+    def bus_factory(self, bus_number: int):
+        """SensorManager(bus_factory=...)용 버스 생성 함수"""
+        record = self.next_record(bus_number, OP_OPEN, 0) if self._records.get(bus_number) else None
+        if record is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), f'/dev/i2c-{bus_number}')
+        return ReplaySMBus(self, bus_number)
+    
+    def get_status(self) -> Dict:
+        return {
+            'path': self.path,
+            'speed': self.speed,
+            'served_count': self.served_count,
+            'mismatch_count': self.mismatch_count,
+            'skipped_count': self.skipped_count,
+            'remaining': {channel: self.remaining(channel) for channel in self.channels}
+        }
+
+
+class ReplaySMBus:
+    """트레이스 재생 버스 (smbus2.SMBus 호환)"""
+    
+    def __init__(self, replay: TraceReplay, bus_number: int):
+        self.replay = replay
+        self.bus_number = bus_number
+    
+    def _next(self, op, address, out_data=b''):
+        return self.replay.next_record(self.bus_number, op, address, out_data)
+    
+    def i2c_rdwr(self, *i2c_msgs):
+        for msg in i2c_msgs:
+            if msg.flags & I2C_M_RD:
+                data = self._next(OP_READ, msg.addr).in_data[:msg.len].ljust(msg.len, b'\xff')
+                ctypes.memmove(msg.buf, data, msg.len)
+            else:
+                self._next(OP_WRITE, msg.addr, bytes(msg))
+    
+    def write_quick(self, i2c_addr, force=None):
+        self._next(OP_WRITE, i2c_addr)
+    
+    def read_byte(self, i2c_addr, force=None):
+        return self._next(OP_READ, i2c_addr).in_data[0]
+    
+    def write_byte(self, i2c_addr, value, force=None):
+        self._next(OP_WRITE, i2c_addr, [value])
+    
+    def read_byte_data(self, i2c_addr, register, force=None):
+        return self._next(OP_WRITE_READ, i2c_addr, [register]).in_data[0]
+    
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        self._next(OP_WRITE, i2c_addr, [register, value])
+    
+    def read_word_data(self, i2c_addr, register, force=None):
+        data = self._next(OP_WRITE_READ, i2c_addr, [register]).in_data
+        return data[0] | (data[1] << 8)
+    
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        return list(self._next(OP_WRITE_READ, i2c_addr, [register]).in_data[:length])
+    
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        self._next(OP_WRITE, i2c_addr, [register] + list(data))
+    
+    def close(self):
+        pass
+
+
+class ReplaySps30Device:
+    """트레이스 재생 SPS30 장치 (기록된 명령 결과/예외 반환)"""
+    
+    def __init__(self, replay: TraceReplay):
+        self.replay = replay
+    
+    def _call(self, name: str):
+        record = self.replay.next_record(SPS30_CHANNEL, OP_CALL, 0, name.encode())
+        if record.error:
+            raise IOError(record.in_data.decode(errors='replace'))
+        result = json.loads(record.in_data.decode()) if record.in_data else None
+        return tuple(result) if isinstance(result, list) else result
+    
+    def device_information_serial_number(self):
+        return self._call('device_information_serial_number')
+    
+    def device_reset(self):
+        return self._call('device_reset')
+    
+    def start_measurement(self):
+        return self._call('start_measurement')
+    
+    def stop_measurement(self):
+        return self._call('stop_measurement')
+    
+    def read_measured_value(self):
+        return self._call('read_measured_value')
+    
+    def opener(self):
+        """SPS30BackgroundThread(device_opener=...)용 장치 열기 함수"""
+        @contextmanager
+        def open_device(port_path):
+            yield self
+        return open_device
+
+
+def create_replay_sensor_manager(path: str, speed: float = 0.0, strict: bool = False, sps30_interval: int = 1):
+    """
+    트레이스를 재생하는 SensorManager 생성 (initialize_sensors()는 호출하는 쪽에서)
+    
+    Returns:
+        (SensorManager, TraceReplay)
+    """
+    from sensor_manager import SensorManager
+    from sps30_background_thread import SPS30BackgroundThread
+    
+    replay = TraceReplay(path, speed=speed, strict=strict)
+    sps30_device = ReplaySps30Device(replay)
+    
+    def sps30_factory():
+        thread = SPS30BackgroundThread(port_path='replay', update_interval=sps30_interval,
+                                       device_opener=sps30_device.opener())
+        thread.reset_settle_time = 0
+        thread.measurement_settle_time = 0
+        return thread
+    
+    print(f"⏯️ 버스 트래픽 재생: {path} (속도: {speed or '지연 없음'})")
+    return SensorManager(bus_factory=replay.bus_factory, sps30_factory=sps30_factory), replay
+
+
+def dump_trace(path: str, limit: int = 50):
+    """트레이스 요약 및 앞부분 레코드 출력"""
+    counts = Counter()
+    errors = Counter()
+    total = 0
+    last_timestamp = 0.0
+    
+    for record in read_trace(path):
+        key = (record.channel, record.address, OP_NAMES.get(record.op, record.op))
+        counts[key] += 1
+        if record.error:
+            errors[key] += 1
+        last_timestamp = record.timestamp
+        
+        if total < limit:
+            error = f" errno={record.error}" if record.error else ''
+            print(f"{record.timestamp:10.4f}s +{record.duration * 1000:7.2f}ms ch={record.channel:3d} "
+                  f"0x{record.address:02X} {OP_NAMES.get(record.op, record.op):10s} "
+                  f"out={record.out_data.hex()} in={record.in_data.hex()}{error}")
+        total += 1
+    
+    print(f"\n📊 {total}개 레코드, {last_timestamp:.1f}초, {os.path.getsize(path)} bytes")
+    for (channel, address, op), count in sorted(counts.items()):
+        print(f"  채널 {channel:3d} 0x{address:02X} {op:10s} {count:7d}회 (오류 {errors[(channel, address, op)]})")
+
+
+def replay_benchmark(path: str, speed: float, strict: bool, max_cycles: Optional[int]):
+    """트레이스 재생으로 read_all_sensors() 지연 시간/처리량 측정"""
+    sensor_manager, replay = create_replay_sensor_manager(path, speed=speed, strict=strict)
+    sensor_manager.initialize_sensors()
+    
+    durations = []
+    start = time.perf_counter()
+    try:
+        while not replay.i2c_exhausted and (max_cycles is None or len(durations) < max_cycles):
+            cycle_start = time.perf_counter()
+            sensor_manager.read_all_sensors()
+            durations.append(time.perf_counter() - cycle_start)
+    finally:
+        sensor_manager.close_sensors()
+    elapsed = time.perf_counter() - start
+    
+    if durations:
+        durations.sort()
+        p50 = durations[len(durations) // 2]
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        print(f"\n📊 재생 {len(durations)}주기, {elapsed:.2f}초 ({len(durations) / elapsed:.1f} 주기/초)")
+        print(f"   read_all_sensors p50={p50 * 1000:.2f}ms p95={p95 * 1000:.2f}ms max={durations[-1] * 1000:.2f}ms")
+    print(f"   {replay.get_status()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EG-Dash 버스 트래픽 트레이스 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    dump_parser = subparsers.add_parser('dump', help='트레이스 요약 출력')
+    dump_parser.add_argument('path')
+    dump_parser.add_argument('--limit', type=int, default=50, help='출력할 레코드 수')
+    
+    replay_parser = subparsers.add_parser('replay', help='트레이스 재생 벤치마크')
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--speed', type=float, default=0.0,
+                               help='기록된 소요 시간 재현 배속 (0 = 지연 없음)')
+    replay_parser.add_argument('--strict', action='store_true', help='불일치 시 재동기화하지 않음')
+    replay_parser.add_argument('--cycles', type=int, default=None, help='최대 수집 주기 수')
+    
+    args = parser.parse_args()
+    if args.command == 'dump':
+        dump_trace(args.path, args.limit)
+    else:
+        replay_benchmark(args.path, args.speed, args.strict, args.cycles)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,29 +6,223 @@ SQLite 기반 센서 정보 및 스캔 히스토리 관리
 
 import sqlite3
 import os
+import queue
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
+from tracer import TRACER
+
+# 스키마 초기화가 끝난 DB 경로 (프로세스 내 캐시)
+_initialized_db_paths = set()
+_schema_lock = threading.Lock()
+
+# 연결별 prepared statement 캐시 크기 (sqlite3 기본값 128)
+STATEMENT_CACHE_SIZE = 256
+
+# 연결 풀 크기 (동시에 열어 둘 수 있는 최대 연결 수, WAL 모드라 읽기는 병렬 처리)
+POOL_SIZE = 4
 
 class SensorDatabase:
     """센서 데이터베이스 관리 클래스"""
     
-    def __init__(self, db_path: str = "sensors.db"):
+    def __init__(self, db_path: str = "sensors.db", pool_size: int = POOL_SIZE):
         """
         데이터베이스 초기화
         
         Args:
             db_path: 데이터베이스 파일 경로
+            pool_size: 연결 풀 크기
         """
         self.db_path = db_path
-        self.init_database()
-        self.insert_default_sensors()
+        
+        # 고정 크기 연결 풀 (요청마다 새 스레드를 쓰는 Flask threaded 모드에서도 연결 재사용)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._connections = []  # 풀이 연 모든 연결 (종료 시 해제)
+        self._connections_lock = threading.Lock()
+        self._closed = False
+        
+        # 센서 레지스트리 캐시 (쓰기 시 무효화, 버전은 단조 증가)
+        self._registry = None
+        self._registry_version = 0
+        self._registry_data_version = None  # 레지스트리 로드 시점의 PRAGMA data_version
+        self._registry_lock = threading.Lock()
+        self._version_conn = None  # data_version 비교 전용 연결 (같은 연결에서 비교해야 의미가 있음)
+        
+        with _schema_lock:
+            # 같은 프로세스에서 이미 초기화한 DB 파일이면 DDL/기본 센서 삽입 생략
+            if (os.path.abspath(db_path) not in _initialized_db_paths
+                    or not os.path.exists(db_path)):
+                self.init_database()
+                self.insert_default_sensors()
+                _initialized_db_paths.add(os.path.abspath(db_path))
     
-    def get_connection(self) -> sqlite3.Connection:
-        """데이터베이스 연결 반환"""
-        conn = sqlite3.connect(self.db_path)
+    def _open_connection(self) -> sqlite3.Connection:
+        """새 연결 생성 (WAL/동기화 설정은 연결당 한 번만 실행)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with self._connections_lock:
+            if self._closed:
+                conn.close()
+                raise sqlite3.ProgrammingError("닫힌 SensorDatabase입니다")
+            self._connections.append(conn)
         return conn
     
+    @contextmanager
+    def get_connection(self):
+        """
+        풀에서 연결을 빌려 트랜잭션으로 사용 (블록이 끝나면 커밋/롤백 후 풀에 반환)
+        
+        모든 연결이 사용 중이면 반환될 때까지 대기
+        
+        Raises:
+            sqlite3.ProgrammingError: close() 이후 호출
+        """
+        self._slots.acquire()
+        try:
+            if self._closed:
+                raise sqlite3.ProgrammingError("닫힌 SensorDatabase입니다")
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open_connection()
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        try:
+            with conn:
+                yield conn
+        finally:
+            # 사용 중에 close()가 호출됐으면 풀에 돌려놓지 않고 여기서 닫음
+            with self._connections_lock:
+                closed = self._closed
+                if not closed:
+                    self._idle.put(conn)
+            if closed:
+                conn.close()
+            self._slots.release()
+    
+    @property
+    def connection_count(self) -> int:
+        """현재 열려 있는 연결 수"""
+        with self._connections_lock:
+            return len(self._connections)
+    
+    def close(self):
+        """
+        모든 데이터베이스 연결 해제 (서버 종료 시 호출, 이후 get_connection()은 ProgrammingError)
+        
+        유휴 연결은 바로 닫고, 사용 중인 연결은 반환될 때 닫음
+        """
+        with self._connections_lock:
+            self._closed = True
+            self._connections = []
+            idle = []
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+        with self._registry_lock:
+            if self._version_conn is not None:
+                idle.append(self._version_conn)
+                self._version_conn = None
+            self._registry_data_version = None
+        
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+    
+    @property
+    def registry_version(self) -> int:
+        """센서 레지스트리 변경 버전 (센서 추가/수정/삭제 시 증가)"""
+        return self._registry_version
+    
+    def invalidate_registry(self):
+        """센서 레지스트리 캐시 무효화 (sensors 테이블 변경 후 호출)"""
+        with self._registry_lock:
+            self._registry = None
+            self._registry_version += 1
+    
+    def _read_data_version(self) -> int:
+        """전용 연결의 PRAGMA data_version (_registry_lock 보유 상태에서 호출)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("닫힌 SensorDatabase입니다")
+        if self._version_conn is None:
+            self._version_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def _check_external_changes(self) -> int:
+        """
+        레지스트리 로드 이후 다른 연결(다른 웹 워커 프로세스 포함)이 DB를 변경했으면 캐시 무효화
+        
+        Returns:
+            int: 현재 data_version (다음 로드 시 기준값으로 저장)
+        """
+        with self._registry_lock:
+            data_version = self._read_data_version()
+            if self._registry is not None and data_version != self._registry_data_version:
+                self._registry = None
+                self._registry_version += 1
+            return data_version
+    
+    def validate_registry(self) -> int:
+        """외부 변경을 반영한 현재 레지스트리 버전 반환 (ETag 계산용)"""
+        self._check_external_changes()
+        return self._registry_version
+    
+    def registry_fingerprint(self) -> str:
+        """레지스트리 내용 지문 (같은 DB를 보는 모든 프로세스가 같은 값, ETag 계산용)"""
+        return self._get_registry()['fingerprint']
+    
+    def _get_registry(self) -> Dict:
+        """센서 레지스트리 캐시 반환 (없으면 DB에서 로드)"""
+        data_version = self._check_external_changes()
+        registry = self._registry
+        if registry is not None:
+            return registry
+        
+        version = self._registry_version
+        with TRACER.span('db.load_registry', 'db'), self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT * FROM sensors
+                ORDER BY address
+            ''')
+            sensors = [dict(row) for row in cursor.fetchall()]
+        
+        by_address = {}
+        by_name = {}
+        for sensor in sorted(sensors, key=lambda s: s['id']):
+            if sensor['address'] is not None:
+                by_address[(sensor['address'], sensor['communication_type'])] = sensor
+            by_name.setdefault(sensor['name'], sensor)
+        
+        registry = {
+            'sensors': sensors,
+            'by_id': {sensor['id']: sensor for sensor in sensors},
+            'by_address': by_address,
+            'by_name': by_name,
+            'addresses': {sensor['address'] for sensor in sensors if sensor['address'] is not None},
+            'fingerprint': f"{zlib.crc32(repr(sensors).encode('utf-8')):08x}-{len(sensors)}"
+        }
+        
+        with self._registry_lock:
+            # 로드 도중 무효화된 경우 캐시에 저장하지 않음
+            if self._registry_version == version:
+                self._registry = registry
+                # 로드 전에 읽은 값을 기준으로 저장 (로드 중 다른 연결의 변경은 다음 조회에서 감지)
+                self._registry_data_version = data_version
+        
+        return registry
+    
     def init_database(self):
         """데이터베이스 초기화 - 테이블 생성"""
         with self.get_connection() as conn:
@@ -148,35 +342,27 @@ class SensorDatabase:
             ''', ("SDP810", "차압센서", "차압정보를 제공해 주는 센서", "3.3V"))
             
             conn.commit()
+        
+        self.invalidate_registry()
     
     def get_all_sensors(self) -> List[Dict]:
         """모든 센서 정보 조회"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM sensors 
-                ORDER BY address
-            ''')
-            
-            return [dict(row) for row in cursor.fetchall()]
+        return [dict(sensor) for sensor in self._get_registry()['sensors']]
+    
+    def get_sensor_by_id(self, sensor_id: int) -> Optional[Dict]:
+        """ID로 센서 정보 조회"""
+        sensor = self._get_registry()['by_id'].get(sensor_id)
+        return dict(sensor) if sensor else None
     
     def get_sensor_by_address(self, address: int, comm_type: str = "I2C") -> Optional[Dict]:
         """주소로 센서 정보 조회"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM sensors WHERE address = ? AND communication_type = ?', (address, comm_type))
-            
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        sensor = self._get_registry()['by_address'].get((address, comm_type))
+        return dict(sensor) if sensor else None
     
     def get_sensor_by_name(self, name: str) -> Optional[Dict]:
         """이름으로 센서 정보 조회 (시리얼 센서용)"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM sensors WHERE name = ?', (name,))
-            
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        sensor = self._get_registry()['by_name'].get(name)
+        return dict(sensor) if sensor else None
     
     def add_sensor(self, address: Optional[int], name: str, sensor_type: str, 
                    description: str = "", voltage: str = "3.3V", 
@@ -192,7 +378,9 @@ class SensorDatabase:
                 ''', (address, name, sensor_type, description, voltage, comm_type, port_info))
                 
                 conn.commit()
-                return True
+            
+            self.invalidate_registry()
+            return True
                 
         except sqlite3.IntegrityError:
             # 이미 존재하는 센서
@@ -212,7 +400,11 @@ class SensorDatabase:
                 ''', (name, sensor_type, description, voltage, sensor_id))
                 
                 conn.commit()
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+            
+            if updated:
+                self.invalidate_registry()
+            return updated
                 
         except sqlite3.Error:
             return False
@@ -228,27 +420,55 @@ class SensorDatabase:
                 ''', (sensor_id,))
                 
                 conn.commit()
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+            
+            if deleted:
+                self.invalidate_registry()
+            return deleted
                 
         except sqlite3.Error:
             return False
     
     def add_scan_result(self, bus_number: int, addresses: List[int]):
-        """스캔 결과 저장"""
-        with self.get_connection() as conn:
+        """스캔 결과 저장 (단일 버스)"""
+        self.add_scan_results({bus_number: addresses})
+    
+    def add_scan_results(self, buses: Dict[int, List[int]]) -> int:
+        """
+        멀티 버스 스캔 결과 일괄 저장 (단일 트랜잭션)
+        
+        Args:
+            buses: {버스 번호: [주소, ...]} 형태의 스캔 결과 (comprehensive_scan의 'buses')
+            
+        Returns:
+            int: 저장된 행 수
+        """
+        all_addresses = sorted({address for addresses in buses.values() for address in addresses})
+        if not all_addresses:
+            return 0
+        
+        with TRACER.span('db.add_scan_results', 'db', addresses=len(all_addresses)), self.get_connection() as conn:
             cursor = conn.cursor()
             
-            for address in addresses:
-                # 해당 주소의 센서 ID 찾기
-                sensor = self.get_sensor_by_address(address)
-                sensor_id = sensor['id'] if sensor else None
-                
-                cursor.execute('''
-                    INSERT INTO scan_history (bus_number, address, sensor_id)
-                    VALUES (?, ?, ?)
-                ''', (bus_number, address, sensor_id))
+            # 주소 → 센서 ID 매핑을 한 번의 쿼리로 조회
+            placeholders = ','.join('?' * len(all_addresses))
+            cursor.execute(f'''
+                SELECT address, id FROM sensors 
+                WHERE communication_type = 'I2C' AND address IN ({placeholders})
+            ''', all_addresses)
+            sensor_ids = {row['address']: row['id'] for row in cursor.fetchall()}
             
-            conn.commit()
+            rows = [
+                (int(bus_number), address, sensor_ids.get(address))
+                for bus_number, addresses in buses.items()
+                for address in addresses
+            ]
+            cursor.executemany('''
+                INSERT INTO scan_history (bus_number, address, sensor_id)
+                VALUES (?, ?, ?)
+            ''', rows)
+        
+        return len(rows)
     
     def get_recent_scan_results(self, limit: int = 50) -> List[Dict]:
         """최근 스캔 결과 조회"""
@@ -276,21 +496,8 @@ class SensorDatabase:
         if not scanned_addresses:
             return []
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # IN 절을 위한 플레이스홀더 생성
-            placeholders = ','.join('?' * len(scanned_addresses))
-            
-            cursor.execute(f'''
-                SELECT address FROM sensors 
-                WHERE address IN ({placeholders})
-            ''', scanned_addresses)
-            
-            known_addresses = {row[0] for row in cursor.fetchall()}
-            unknown_addresses = [addr for addr in scanned_addresses if addr not in known_addresses]
-            
-            return unknown_addresses
+        known_addresses = self._get_registry()['addresses']
+        return [addr for addr in scanned_addresses if addr not in known_addresses]
     
     def get_connection_status(self, scan_result: Dict) -> Dict:
         """센서 연결 상태 분석"""
@@ -341,8 +548,9 @@ def test_database():
     test_db_path = "test_sensors.db"
     
     # 기존 테스트 DB 삭제
-    if os.path.exists(test_db_path):
-        os.remove(test_db_path)
+    for path in (test_db_path, test_db_path + "-wal", test_db_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
     
     # 데이터베이스 초기화
     db = SensorDatabase(test_db_path)
@@ -389,7 +597,10 @@ def test_database():
     print(f"  미등록 센서: {status['unknown_count']}")
     
     # 테스트 DB 정리
-    os.remove(test_db_path)
+    db.close()
+    for path in (test_db_path, test_db_path + "-wal", test_db_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
     print("\n✅ 데이터베이스 테스트 완료")
 
 if __name__ == "__main__":
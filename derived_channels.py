@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+파생 채널 엔진 (이슬점, 절대습도, 체감온도)
+- 파생 채널은 원본 채널에 대한 수식 + 단위로 선언 (JSON 설정 가능)
+- 수식은 시작 시 한 번만 검증/컴파일하고, 스냅샷마다 새 샘플로 증분 평가 (스냅샷 처리기)
+- 같은 수식을 NumPy 배열에 벡터화 평가하여 과거 구간 백필 (공유 메모리 링 버퍼)
+- 결과는 스냅샷 최상위 채널로 기록되어 물리 채널과 같이 저장/스트리밍
+
+설정 파일: 환경 변수 EGDASH_DERIVED_CHANNELS (JSON 배열, 미설정 시 DEFAULT_DERIVED_CHANNELS)
+수식에서 쓸 수 있는 함수: exp, log, sqrt, abs, where(조건, 참 값, 거짓 값)
+"""
+
+import os
+import ast
+import json
+import math
+from importlib.util import find_spec
+from typing import Dict, List, Optional
+
+# NumPy는 백필 요청 시에만 로딩 (시작 시간 단축, 미설치 시 백필만 비활성)
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+
+# 파생 채널이 참조할 수 있는 물리 채널
+SOURCE_CHANNELS = (
+    'temperature', 'humidity', 'pressure', 'differential_pressure', 'light',
+    'gas_resistance', 'pm1', 'pm25', 'pm4', 'pm10'
+)
+
+# internal 채널은 다른 수식의 중간값으로만 쓰고 스냅샷에는 기록하지 않음
+DEFAULT_DERIVED_CHANNELS = [
+    {
+        'name': 'magnus_gamma',
+        'expression': 'log(humidity / 100) + 17.62 * temperature / (243.12 + temperature)',
+        'internal': True
+    },
+    {
+        'name': 'dew_point',
+        'expression': '243.12 * magnus_gamma / (17.62 - magnus_gamma)',
+        'unit': '°C',
+        'description': '이슬점 (Magnus 식, Sensirion 계수)'
+    },
+    {
+        'name': 'absolute_humidity',
+        'expression': '216.7 * humidity / 100 * 6.112 * exp(17.62 * temperature / (243.12 + temperature))'
+                      ' / (273.15 + temperature)',
+        'unit': 'g/m³',
+        'description': '절대습도 (수증기 밀도)'
+    },
+    {
+        'name': 'temperature_f',
+        'expression': 'temperature * 1.8 + 32',
+        'internal': True
+    },
+    {
+        'name': 'heat_index',
+        'expression': '(where(temperature_f < 80,'
+                      ' 0.5 * (temperature_f + 61 + (temperature_f - 68) * 1.2 + humidity * 0.094),'
+                      ' -42.379 + 2.04901523 * temperature_f + 10.14333127 * humidity'
+                      ' - 0.22475541 * temperature_f * humidity - 0.00683783 * temperature_f ** 2'
+                      ' - 0.05481717 * humidity ** 2 + 0.00122874 * temperature_f ** 2 * humidity'
+                      ' + 0.00085282 * temperature_f * humidity ** 2'
+                      ' - 0.00000199 * temperature_f ** 2 * humidity ** 2) - 32) / 1.8',
+        'unit': '°C',
+        'description': '체감온도 (NOAA Rothfusz 회귀식, 26.7 °C 미만은 단순식)'
+    }
+]
+
+# 수식에 허용하는 AST 노드 (속성 접근, 첨자, 람다 등은 거부)
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE
+)
+
+SCALAR_FUNCTIONS = {
+    'exp': math.exp,
+    'log': math.log,
+    'sqrt': math.sqrt,
+    'abs': abs,
+    'where': lambda condition, true_value, false_value: true_value if condition else false_value
+}
+
+
+def _numpy_functions(np) -> Dict:
+    return {'exp': np.exp, 'log': np.log, 'sqrt': np.sqrt, 'abs': np.abs, 'where': np.where}
+
+
+class DerivedChannel:
+    """수식으로 정의된 파생 채널 1개 (생성 시 컴파일)"""
+    
+    def __init__(self, name: str, expression: str, unit: str = '', description: str = '',
+                 precision: int = 2, internal: bool = False, known_channels=SOURCE_CHANNELS):
+        """
+        Args:
+            name: 채널 이름 (스냅샷 키)
+            expression: 원본/앞선 파생 채널 이름과 허용 함수로 된 수식
+            unit: 표시 단위
+            precision: 스냅샷에 기록할 소수 자릿수
+            internal: True면 중간 계산용 (스냅샷/API에 노출 안 함)
+            known_channels: 수식에서 참조 가능한 채널 이름 (앞서 선언된 파생 채널 포함)
+        """
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"파생 채널 수식 오류 ({name}): {e.msg}")
+        
+        sources = []
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"파생 채널 수식에 허용되지 않는 구문 ({name}): {type(node).__name__}")
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name)
+                                                   and node.func.id in SCALAR_FUNCTIONS):
+                raise ValueError(f"파생 채널 수식에 허용되지 않는 함수 ({name})")
+            if isinstance(node, ast.Name) and node.id not in SCALAR_FUNCTIONS:
+                if node.id not in known_channels:
+                    raise ValueError(f"파생 채널 수식의 알 수 없는 채널 ({name}): {node.id}")
+                if node.id not in sources:
+                    sources.append(node.id)
+        
+        self.name = name
+        self.expression = expression
+        self.unit = unit
+        self.description = description
+        self.precision = precision
+        self.internal = internal
+        self.sources = tuple(sources)
+        self.physical_sources = self.sources  # from_configs에서 파생 채널 참조를 물리 채널로 풀어 둠
+        self._code = compile(tree, f'<derived:{name}>', 'eval')
+    
+    def evaluate(self, values: Dict) -> Optional[float]:
+        """샘플 1개 평가 (원본 값이 하나라도 없거나 정의역 밖이면 None)"""
+        namespace = {}
+        for source in self.sources:
+            value = values.get(source)
+            if value is None:
+                return None
+            namespace[source] = value
+        
+        try:
+            result = eval(self._code, {'__builtins__': {}, **SCALAR_FUNCTIONS}, namespace)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            return None
+        result = float(result)
+        return result if math.isfinite(result) else None
+    
+    def evaluate_array(self, columns: Dict, functions: Dict):
+        """NumPy 배열 벡터화 평가 (값이 없는 샘플은 NaN으로 전파)"""
+        namespace = {source: columns[source] for source in self.sources}
+        return eval(self._code, {'__builtins__': {}, **functions}, namespace)
+    
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'expression': self.expression, 'unit': self.unit,
+                'description': self.description, 'sources': list(self.physical_sources)}
+
+
+class DerivedChannelEngine:
+    """스냅샷 처리기: 파생 채널을 선언 순서대로 계산해 스냅샷에 기록"""
+    
+    def __init__(self, channels: List[DerivedChannel]):
+        self.channels = list(channels)
+        self.evaluated_count = 0
+        self.missing_count = 0
+    
+    @classmethod
+    def from_configs(cls, configs: List[Dict]) -> 'DerivedChannelEngine':
+        """설정 목록으로 생성 (앞서 선언된 파생 채널만 참조 가능, 이름 중복/물리 채널 이름 사용 금지)"""
+        known = list(SOURCE_CHANNELS)
+        physical = {}
+        channels = []
+        for config in configs:
+            name = config.get('name')
+            if not name or name in known:
+                raise ValueError(f"파생 채널 이름이 없거나 중복됩니다: {name}")
+            channel = DerivedChannel(known_channels=tuple(known), **config)
+            resolved = []
+            for source in channel.sources:
+                for channel_name in physical.get(source, (source,)):
+                    if channel_name not in resolved:
+                        resolved.append(channel_name)
+            channel.physical_sources = physical[name] = tuple(resolved)
+            channels.append(channel)
+            known.append(name)
+        return cls(channels)
+    
+    @property
+    def public_channels(self) -> List[DerivedChannel]:
+        return [channel for channel in self.channels if not channel.internal]
+    
+    def compute(self, values: Dict) -> Dict:
+        """샘플 1개의 파생 값 전체 계산 (internal 채널 포함)"""
+        values = dict(values)
+        results = {}
+        for channel in self.channels:
+            value = channel.evaluate(values)
+            values[channel.name] = value
+            results[channel.name] = value
+        return results
+    
+    def process(self, snapshot: Dict):
+        """
+        스냅샷 처리기: 공개 파생 채널을 최상위 채널로 기록 (원본이 없으면 None)
+        
+        원본 측정 시각이 모두 있으면 가장 최근 값을 파생 채널의 원본 측정 시각으로 기록
+        """
+        results = self.compute(snapshot)
+        source_times = snapshot.get('source_times')
+        for channel in self.public_channels:
+            value = results[channel.name]
+            if value is None:
+                self.missing_count += 1
+            else:
+                self.evaluated_count += 1
+                value = round(value, channel.precision)
+                if source_times is not None:
+                    times = [source_times.get(source) for source in channel.physical_sources]
+                    if times and None not in times:
+                        source_times[channel.name] = max(times)
+            snapshot[channel.name] = value
+    
+    def backfill(self, columns: Dict) -> Dict:
+        """
+        과거 구간 벡터화 계산
+        
+        Args:
+            columns: 원본 채널 이름 → 값 시퀀스 (None/NaN은 값 없음, 길이 동일)
+        
+        Returns:
+            Dict: 공개 파생 채널 이름 → 값 리스트 (계산 불가 샘플은 None)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy가 설치되지 않아 백필을 사용할 수 없습니다 (pip install numpy)")
+        import numpy as np
+        
+        arrays = {source: np.array([np.nan if value is None else value for value in values], dtype=float)
+                  for source, values in columns.items()}
+        functions = _numpy_functions(np)
+        results = {}
+        with np.errstate(all='ignore'):
+            for channel in self.channels:
+                missing = [source for source in channel.sources if source not in arrays]
+                if missing:
+                    raise ValueError(f"백필 원본 채널 누락 ({channel.name}): {', '.join(missing)}")
+                values = np.asarray(channel.evaluate_array(arrays, functions), dtype=float)
+                values = np.broadcast_to(values, next(iter(arrays.values())).shape)
+                arrays[channel.name] = values
+                if not channel.internal:
+                    rounded = np.round(values, channel.precision)
+                    results[channel.name] = [float(value) if np.isfinite(value) else None for value in rounded]
+        return results
+    
+    def backfill_from_reader(self, reader, count: int) -> Dict:
+        """
+        공유 메모리 링 버퍼의 최근 count개 샘플로 백필
+        
+        Returns:
+            Dict: {'timestamps': [...], 채널 이름: [...]}
+        """
+        sources = sorted({source for channel in self.channels for source in channel.physical_sources})
+        # 모든 원본 채널을 한 번의 seqlock 구간에서 행 단위로 읽음 (채널별 읽기 사이 기록으로 어긋나지 않도록)
+        columns = reader.read_columns(sources, count)
+        result = {'timestamps': columns.pop('timestamps')}
+        result.update(self.backfill(columns))
+        return result
+    
+    def get_channels(self) -> List[Dict]:
+        """공개 파생 채널 정의 목록"""
+        return [channel.to_dict() for channel in self.public_channels]
+    
+    def get_status(self) -> Dict:
+        """파생 채널 엔진 상태 정보 반환"""
+        return {
+            'channel_count': len(self.public_channels),
+            'evaluated_count': self.evaluated_count,
+            'missing_count': self.missing_count,
+            'numpy_available': NUMPY_AVAILABLE
+        }
+
+
+def load_derived_channels(path: Optional[str] = None) -> DerivedChannelEngine:
+    """설정 파일(JSON 배열)로 파생 채널 엔진 생성 (경로가 없으면 기본 채널)"""
+    if path:
+        with open(path) as f:
+            configs = json.load(f)
+    else:
+        configs = DEFAULT_DERIVED_CHANNELS
+    return DerivedChannelEngine.from_configs(configs)
+
+
+def create_derived_channel_engine() -> Optional[DerivedChannelEngine]:
+    """환경 변수 설정으로 파생 채널 엔진 생성 (EGDASH_DERIVED=0이면 None)"""
+    if os.environ.get('EGDASH_DERIVED', '1') not in ('1', 'true', 'yes'):
+        return None
+    
+    try:
+        return load_derived_channels(os.environ.get('EGDASH_DERIVED_CHANNELS'))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ 파생 채널 설정 로드 실패 - 파생 채널 비활성화: {e}")
+        return None
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='EG-Dash 파생 채널 도구')
+    parser.add_argument('path', nargs='?', default=None, help='설정 파일 (없으면 기본 채널)')
+    parser.add_argument('--temperature', type=float, help='시험 계산용 온도 (°C)')
+    parser.add_argument('--humidity', type=float, help='시험 계산용 습도 (%%)')
+    args = parser.parse_args()
+    
+    engine = load_derived_channels(args.path)
+    values = engine.compute({'temperature': args.temperature, 'humidity': args.humidity})
+    for channel in engine.public_channels:
+        value = values[channel.name]
+        shown = '-' if value is None else f"{value:.{channel.precision}f} {channel.unit}"
+        print(f"{channel.name:20s} {shown:>14s}  = {channel.expression}")
+
+
+if __name__ == "__main__":
+    main()
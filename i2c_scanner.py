@@ -5,7 +5,6 @@ EG-Dash I2C 스캐너 모듈 (라즈베리파이 전용)
 """
 
 import time
-import smbus2
 import threading
 from typing import Dict, List, Optional, Callable
 from datetime import datetime
@@ -20,6 +19,8 @@ class WebI2CScanner:
     
     def connect_buses(self) -> List[int]:
         """I2C 버스 0과 1에 연결 (실제 하드웨어만)"""
+        import smbus2
+        
         # 기존 연결 정리
         for bus in self.buses.values():
             try:
@@ -46,6 +47,7 @@ class WebI2CScanner:
         """특정 버스 스캔 (실제 하드웨어만)"""
         if bus_number not in self.buses:
             return []
+        import smbus2
         
         devices = []
         bus = self.buses[bus_number]
@@ -238,6 +240,8 @@ class WebI2CScanner:
     
     def _test_sht40(self, bus, addr: int) -> Dict:
         """SHT40 온습도센서 테스트 (저수준 I2C 통신)"""
+        import smbus2
+        
         try:
             # 소프트 리셋 (저수준 I2C 메시지 사용)
             write_msg = smbus2.i2c_msg.write(addr, [0x94])
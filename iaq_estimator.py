@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+BME688 가스 기준선 추적 및 실내 공기질(IAQ) 추정 (스냅샷 처리기)
+- 번인 감지: 최소 시간이 지나고 가스 저항 추세(샘플당 상대 변화의 EWMA)가 평탄해지면 완료 (최대 시간 초과 시 강제 완료)
+- 기준선: 깨끗한 공기의 가스 저항 상단 포락선 (상승은 빠르게, 하강은 느리게 따라가는 비대칭 EWMA)
+- 습도 보정: 기준 습도 대비 ln(가스 저항)의 선형 보정 후 기준선과 비교
+- 기준선은 JSON 파일에 주기적으로 저장하여 재시작 후에도 유지 (짧은 예열만 다시 수행)
+- 샘플당 O(1) (상태는 숫자 몇 개)
+
+출력 채널:
+- air_quality: 0~100 (높을수록 좋음, 가스 75% + 습도 25%), 번인 중에는 None
+- iaq: 0~500 (낮을수록 좋음, BSEC 지수와 같은 방향), 번인 중에는 None
+- iaq_status: 'burn_in' | 'warm_up' | 'ready'
+"""
+
+import os
+import json
+import math
+import time
+from typing import Dict, Optional
+
+# 모듈 디렉터리 기준 (서비스 실행 위치와 관계없이 같은 파일을 읽고 씀)
+IAQ_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'iaq_baseline.json')
+BASELINE_FILE_VERSION = 2  # 2: 가스 저항 공식 수정 (이전 파일의 기준선은 단위가 달라 사용 불가)
+
+HUMIDITY_REFERENCE = 40.0     # 쾌적 습도 기준 (%RH)
+HUMIDITY_WEIGHT = 25.0        # air_quality 중 습도 점수 비중
+HUMIDITY_SLOPE = 0.024        # 습도 1 %RH당 ln(가스 저항) 감소량 (보정 계수)
+
+
+class IAQEstimator:
+    """가스 저항 기준선 추적 + IAQ 계산"""
+    
+    label = "IAQ 추정기"
+    
+    def __init__(self, baseline_path: Optional[str] = IAQ_BASELINE_PATH, burn_in_seconds: float = 300.0,
+                 max_burn_in_seconds: float = 1800.0, warm_up_seconds: float = 120.0,
+                 stability_threshold: float = 0.003, rise_time_constant: float = 300.0,
+                 decay_time_constant: float = 12 * 3600.0, save_interval: float = 300.0,
+                 max_baseline_age: float = 7 * 86400.0):
+        """
+        Args:
+            baseline_path: 기준선 저장 파일 (None이면 저장하지 않음)
+            burn_in_seconds: 최초 번인 최소 시간 (초)
+            max_burn_in_seconds: 안정되지 않아도 번인을 끝내는 시간 (초)
+            warm_up_seconds: 저장된 기준선으로 재시작할 때의 히터 예열 시간 (초)
+            stability_threshold: 번인 완료 기준 (샘플당 상대 변화 EWMA의 절댓값, 잡음은 상쇄되고 지속 상승만 남음)
+            rise_time_constant: 기준선 상승 시상수 (초, 더 깨끗한 공기를 빠르게 반영)
+            decay_time_constant: 기준선 하강 시상수 (초, 센서 노화/드리프트만 천천히 반영)
+            save_interval: 기준선 저장 간격 (초)
+            max_baseline_age: 이보다 오래된 저장 기준선은 무시하고 번인부터 다시 시작 (초)
+        """
+        self.baseline_path = baseline_path
+        self.burn_in_seconds = burn_in_seconds
+        self.max_burn_in_seconds = max_burn_in_seconds
+        self.warm_up_seconds = warm_up_seconds
+        self.stability_threshold = stability_threshold
+        self.rise_time_constant = rise_time_constant
+        self.decay_time_constant = decay_time_constant
+        self.save_interval = save_interval
+        self.max_baseline_age = max_baseline_age
+        
+        self.baseline = None          # 습도 보정된 가스 저항 기준선 (Ω)
+        self.burn_in_complete = False
+        self.status = 'burn_in'
+        self.air_quality = None
+        self.iaq = None
+        self.sample_count = 0
+        self.save_count = 0
+        
+        self._started_at = None
+        self._last_gas = None
+        self._last_time = None
+        self._trend = None            # 샘플당 상대 변화 EWMA (번인 안정성 판단)
+        self._last_save = None
+        
+        self._load_baseline()
+    
+    def _load_baseline(self):
+        """저장된 기준선 복원 (없거나 오래됐거나 손상되면 번인부터 시작)"""
+        if not self.baseline_path or not os.path.exists(self.baseline_path):
+            return
+        try:
+            with open(self.baseline_path) as f:
+                saved = json.load(f)
+            if saved.get('version') != BASELINE_FILE_VERSION:
+                return
+            if time.time() - saved['updated_at'] > self.max_baseline_age:
+                print(f"ℹ️ IAQ 기준선이 오래되어 번인부터 다시 시작: {self.baseline_path}")
+                return
+            baseline = float(saved['gas_baseline'])
+            if not baseline > 0:
+                return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ IAQ 기준선 파일 읽기 실패 - 번인부터 시작: {e}")
+            return
+        
+        self.baseline = baseline
+        self.burn_in_complete = True
+        self.status = 'warm_up'
+        print(f"✅ IAQ 기준선 복원: {baseline:.0f} Ω ({self.baseline_path})")
+    
+    def save_baseline(self, now: Optional[float] = None):
+        """기준선 저장 (임시 파일 기록 후 교체하여 중간에 끊겨도 기존 파일 보존)"""
+        if not self.baseline_path or not self.burn_in_complete or self.baseline is None:
+            return
+        now = now or time.time()
+        data = {'version': BASELINE_FILE_VERSION, 'gas_baseline': self.baseline, 'updated_at': now}
+        temp_path = f"{self.baseline_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.baseline_path)
+            self._last_save = now
+            self.save_count += 1
+        except OSError as e:
+            print(f"⚠️ IAQ 기준선 저장 실패: {e}")
+    
+    @staticmethod
+    def compensate(gas_resistance: float, humidity: Optional[float]) -> float:
+        """기준 습도로 환산한 가스 저항 (습도가 높을수록 저항이 낮아지는 효과 제거)"""
+        if humidity is None:
+            return gas_resistance
+        return gas_resistance * math.exp(HUMIDITY_SLOPE * (humidity - HUMIDITY_REFERENCE))
+    
+    def _update_baseline(self, gas: float, dt: float):
+        if self.baseline is None:
+            self.baseline = gas
+            return
+        time_constant = self.rise_time_constant if gas > self.baseline else self.decay_time_constant
+        alpha = 1.0 - math.exp(-dt / time_constant)
+        self.baseline += alpha * (gas - self.baseline)
+    
+    def _score(self, gas: float, humidity: Optional[float]):
+        """air_quality(0~100, 높을수록 좋음)와 iaq(0~500, 낮을수록 좋음) 계산"""
+        gas_score = min(gas / self.baseline, 1.0) * (100.0 - HUMIDITY_WEIGHT)
+        if humidity is None:
+            # 습도 없으면 가스 점수만 100점 만점으로 환산
+            score = gas_score * 100.0 / (100.0 - HUMIDITY_WEIGHT)
+        else:
+            offset = humidity - HUMIDITY_REFERENCE
+            span = HUMIDITY_REFERENCE if offset < 0 else 100.0 - HUMIDITY_REFERENCE
+            score = gas_score + HUMIDITY_WEIGHT * max(0.0, 1.0 - abs(offset) / span)
+        self.air_quality = round(score, 1)
+        self.iaq = round((100.0 - score) * 5.0, 1)
+    
+    def update(self, gas_resistance, humidity, now: float):
+        """
+        새 가스 저항 샘플 1개 반영 (BME688 캐시로 같은 값이 반복되면 무시)
+        
+        Args:
+            gas_resistance: 가스 저항 (Ω)
+            humidity: 상대습도 (%RH, SHT40 우선)
+            now: 샘플 시각 (초)
+        """
+        if gas_resistance is None or gas_resistance <= 0 or gas_resistance == self._last_gas:
+            return
+        
+        if self._started_at is None:
+            self._started_at = now
+        dt = now - self._last_time if self._last_time is not None else 0.0
+        if self._last_gas is not None:
+            change = (gas_resistance - self._last_gas) / self._last_gas
+            if self._trend is None:
+                self._trend = change
+            else:
+                self._trend += 0.1 * (change - self._trend)
+        self._last_gas = gas_resistance
+        self._last_time = now
+        self.sample_count += 1
+        
+        compensated = self.compensate(gas_resistance, humidity)
+        elapsed = now - self._started_at
+        
+        if not self.burn_in_complete:
+            # 번인 중에는 기준선을 잡지 않음 (히터 가열 직후 저항이 계속 오름)
+            stable = self._trend is not None and abs(self._trend) < self.stability_threshold
+            if (elapsed >= self.burn_in_seconds and stable) or elapsed >= self.max_burn_in_seconds:
+                self.burn_in_complete = True
+                self.status = 'ready'
+                self.baseline = compensated
+                print(f"✅ BME688 번인 완료 ({elapsed:.0f}초, 기준선 {compensated:.0f} Ω)")
+                self.save_baseline(now)
+            else:
+                return
+        elif self.status == 'warm_up':
+            # 저장된 기준선 사용 시 히터 예열 동안은 점수만 보류
+            if elapsed < self.warm_up_seconds:
+                return
+            self.status = 'ready'
+        
+        self._update_baseline(compensated, dt)
+        self._score(compensated, humidity)
+        
+        if self._last_save is None or now - self._last_save >= self.save_interval:
+            self.save_baseline(now)
+    
+    def process(self, snapshot: Dict):
+        """스냅샷 처리기: BME688 가스 저항과 습도로 air_quality/iaq 채널 갱신"""
+        self.update(snapshot.get('gas_resistance'), snapshot.get('humidity'),
+                    snapshot.get('acquired_at') or time.time())
+        ready = self.status == 'ready' and snapshot.get('gas_resistance') is not None
+        snapshot['air_quality'] = self.air_quality if ready else None
+        snapshot['iaq'] = self.iaq if ready else None
+        snapshot['iaq_status'] = self.status
+        source_times = snapshot.get('source_times')
+        if ready and source_times is not None and 'gas_resistance' in source_times:
+            source_times['iaq'] = source_times['air_quality'] = source_times['gas_resistance']
+    
+    def get_status(self) -> Dict:
+        """IAQ 추정기 상태 정보 반환"""
+        return {
+            'status': self.status,
+            'burn_in_complete': self.burn_in_complete,
+            'gas_baseline': None if self.baseline is None else round(self.baseline, 1),
+            'air_quality': self.air_quality,
+            'iaq': self.iaq,
+            'sample_count': self.sample_count,
+            'trend': None if self._trend is None else round(self._trend, 5),
+            'baseline_path': self.baseline_path,
+            'save_count': self.save_count
+        }
+
+
+def create_iaq_estimator() -> Optional[IAQEstimator]:
+    """환경 변수 설정으로 IAQ 추정기 생성 (EGDASH_IAQ=0이면 None)"""
+    if os.environ.get('EGDASH_IAQ', '1') not in ('1', 'true', 'yes'):
+        return None
+    return IAQEstimator(os.environ.get('EGDASH_IAQ_BASELINE', IAQ_BASELINE_PATH))
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+JSON 직렬화 모듈
+- orjson이 설치되어 있으면 사용, 없으면 표준 json 모듈로 대체
+- API 응답에 바로 쓸 수 있는 UTF-8 바이트 반환
+"""
+
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_bytes(obj) -> bytes:
+    """객체를 JSON 바이트로 직렬화"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
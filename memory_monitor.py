@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+프로세스 메모리 계측 모듈
+- RSS/PSS/USS, 열린 파일 디스크립터 수, 스레드 수를 주기적으로 기록 (제한된 히스토리)
+- 서브시스템별 버퍼 크기 (스트림 큐, 트레이서 링, DB 연결 수 등) 함께 기록
+- RSS 증가율(바이트/시간)로 장시간 운영 중 누수를 조기에 확인
+- tracemalloc 스냅샷 간 차이 비교 (디버그 엔드포인트에서 필요할 때만 활성화)
+
+메모리 예산: PRD 7.1 기준 512MB
+"""
+
+import os
+import time
+import threading
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from metrics import read_process_rss_bytes
+
+MEMORY_BUDGET_BYTES = 512 * 1024 * 1024
+DEFAULT_SAMPLE_INTERVAL = 60.0   # 1분
+DEFAULT_HISTORY_SIZE = 1440      # 24시간 (1분 간격)
+
+
+def count_open_fds() -> Optional[int]:
+    """현재 프로세스의 열린 파일 디스크립터 수 (/proc 없으면 None)"""
+    try:
+        return len(os.listdir('/proc/self/fd')) - 1  # listdir 자체가 연 디스크립터 제외
+    except OSError:
+        return None
+
+
+def read_process_memory() -> Dict:
+    """
+    프로세스 메모리 사용량 (바이트)
+    
+    /proc/self/smaps_rollup이 있으면 RSS/PSS/USS(Private_Clean + Private_Dirty),
+    없으면 RSS만 반환 (pss_bytes, uss_bytes는 None)
+    """
+    memory = {'rss_bytes': None, 'pss_bytes': None, 'uss_bytes': None}
+    try:
+        fields = {}
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+        memory['rss_bytes'] = fields.get('Rss')
+        memory['pss_bytes'] = fields.get('Pss')
+        if 'Private_Clean' in fields or 'Private_Dirty' in fields:
+            memory['uss_bytes'] = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    except OSError:
+        pass
+    
+    if memory['rss_bytes'] is None:
+        memory['rss_bytes'] = read_process_rss_bytes()
+    return memory
+
+
+class MemoryMonitor:
+    """메모리 사용량 주기 기록 백그라운드 스레드"""
+    
+    label = "메모리 모니터 스레드"
+    
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, history_size: int = DEFAULT_HISTORY_SIZE,
+                 budget_bytes: int = MEMORY_BUDGET_BYTES):
+        """
+        메모리 모니터 초기화
+        
+        Args:
+            interval: 기록 간격 (초)
+            history_size: 보관할 최대 기록 수
+            budget_bytes: 메모리 예산 (RSS가 넘으면 경고 출력)
+        """
+        self.interval = interval
+        self.budget_bytes = budget_bytes
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+        
+        self._history = deque(maxlen=history_size)
+        self._buffers = {}  # 이름 → 크기 반환 함수
+        self._lock = threading.Lock()
+        self.over_budget = False
+        
+        # tracemalloc 기준 스냅샷 (직전 비교 시점)
+        self._tracemalloc_snapshot = None
+        self._tracemalloc_started_here = False
+    
+    def register_buffer(self, name: str, size_fn: Callable[[], Optional[int]]):
+        """서브시스템 버퍼 크기 함수 등록 (None 반환 시 기록 생략)"""
+        with self._lock:
+            self._buffers[name] = size_fn
+    
+    def read_buffers(self) -> Dict:
+        """등록된 버퍼 크기 읽기"""
+        with self._lock:
+            buffers = list(self._buffers.items())
+        
+        sizes = {}
+        for name, size_fn in buffers:
+            try:
+                size = size_fn()
+            except Exception as e:
+                print(f"⚠️ 버퍼 크기 읽기 실패 ({name}): {e}")
+                continue
+            if size is not None:
+                sizes[name] = size
+        return sizes
+    
+    def sample(self, record_history: bool = True) -> Dict:
+        """현재 메모리 상태 측정 (record_history=True면 히스토리에 기록)"""
+        record = {'timestamp': time.time()}
+        record.update(read_process_memory())
+        record['open_fds'] = count_open_fds()
+        record['threads'] = threading.active_count()
+        record['buffers'] = self.read_buffers()
+        
+        if not record_history:
+            return record
+        
+        with self._lock:
+            self._history.append(record)
+        
+        over_budget = record['rss_bytes'] > self.budget_bytes
+        if over_budget and not self.over_budget:
+            print(f"⚠️ 메모리 예산 초과: RSS {record['rss_bytes'] / 1048576:.1f}MB "
+                  f"> {self.budget_bytes / 1048576:.0f}MB")
+        self.over_budget = over_budget
+        return record
+    
+    def get_history(self, limit: Optional[int] = None) -> List[Dict]:
+        """기록 목록 반환 (최신 limit개)"""
+        with self._lock:
+            history = list(self._history)
+        return history[-limit:] if limit else history
+    
+    def rss_growth_per_hour(self) -> Optional[float]:
+        """기록 구간의 RSS 증가율 (바이트/시간, 기록 구간이 10분 미만이면 None)"""
+        with self._lock:
+            if len(self._history) < 2:
+                return None
+            first, last = self._history[0], self._history[-1]
+        
+        elapsed = last['timestamp'] - first['timestamp']
+        if elapsed < 600:
+            return None
+        return (last['rss_bytes'] - first['rss_bytes']) * 3600.0 / elapsed
+    
+    def _background_worker(self):
+        """백그라운드 스레드 워커 함수"""
+        print(f"🚀 {self.label} 시작 (간격: {self.interval}초)")
+        
+        while self.running:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"❌ {self.label} 오류: {e}")
+            self._stop_event.wait(self.interval)
+        
+        print(f"🛑 {self.label} 종료")
+    
+    def start(self):
+        """모니터 스레드 시작"""
+        if self.running:
+            return
+        
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._background_worker, daemon=True, name="MemoryMonitor")
+        self.thread.start()
+    
+    def stop(self):
+        """모니터 스레드 중지"""
+        self.running = False
+        self._stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+    
+    def start_tracemalloc(self, frames: int = 10) -> Dict:
+        """tracemalloc 추적 시작 후 기준 스냅샷 저장 (추적 중 메모리/CPU 오버헤드 발생)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._tracemalloc_started_here = True
+            print(f"🔍 tracemalloc 추적 시작 (프레임 {frames}개)")
+        self._tracemalloc_snapshot = self._take_tracemalloc_snapshot()
+        return self.get_tracemalloc_status()
+    
+    def stop_tracemalloc(self) -> Dict:
+        """tracemalloc 추적 중지 (이 모듈이 시작한 경우만) 및 기준 스냅샷 해제"""
+        self._tracemalloc_snapshot = None
+        if self._tracemalloc_started_here and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            print("🔍 tracemalloc 추적 중지")
+        self._tracemalloc_started_here = False
+        return self.get_tracemalloc_status()
+    
+    @staticmethod
+    def _take_tracemalloc_snapshot():
+        """tracemalloc 스냅샷 (tracemalloc/importlib 자체 할당 제외)"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+    
+    def diff_tracemalloc(self, limit: int = 20, key_type: str = 'lineno') -> Optional[Dict]:
+        """
+        직전 스냅샷 대비 할당 증가 상위 항목 반환 후 현재 스냅샷을 새 기준으로 저장
+        
+        Returns:
+            Dict: top_stats 목록 (추적 중이 아니면 None)
+        """
+        if not tracemalloc.is_tracing() or self._tracemalloc_snapshot is None:
+            return None
+        
+        snapshot = self._take_tracemalloc_snapshot()
+        stats = snapshot.compare_to(self._tracemalloc_snapshot, key_type)
+        self._tracemalloc_snapshot = snapshot
+        
+        top_stats = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            top_stats.append({
+                'location': f'{frame.filename}:{frame.lineno}',
+                'size_bytes': stat.size,
+                'size_diff_bytes': stat.size_diff,
+                'count': stat.count,
+                'count_diff': stat.count_diff
+            })
+        
+        return {
+            'key_type': key_type,
+            'total_diff_bytes': sum(stat.size_diff for stat in stats),
+            'top_stats': top_stats
+        }
+    
+    def get_tracemalloc_status(self) -> Dict:
+        """tracemalloc 상태 정보"""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            'tracing': tracing,
+            'has_baseline': self._tracemalloc_snapshot is not None,
+            'traced_current_bytes': current,
+            'traced_peak_bytes': peak
+        }
+    
+    def get_status(self) -> Dict:
+        """모니터 상태 정보 반환"""
+        with self._lock:
+            history_size = len(self._history)
+            latest = self._history[-1] if self._history else None
+        
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'budget_bytes': self.budget_bytes,
+            'over_budget': self.over_budget,
+            'history_size': history_size,
+            'rss_growth_bytes_per_hour': self.rss_growth_per_hour(),
+            'latest': latest,
+            'tracemalloc': self.get_tracemalloc_status()
+        }
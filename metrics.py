@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Prometheus 텍스트 형식 메트릭 모듈 (외부 라이브러리 없음)
+- Counter / Gauge / Histogram (레이블 지원, Thread-safe)
+- 스크레이프 시점에 값을 읽는 수집기(collector) 등록 지원
+- /metrics 엔드포인트에서 REGISTRY.render() 결과를 그대로 응답
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# 기본 지연 시간 버킷 (초) - I2C 트랜잭션(ms 단위) ~ BME688 재시도(초 단위)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labels: Dict) -> str:
+    """레이블 딕셔너리를 Prometheus 형식 문자열로 변환"""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_value(value) -> str:
+    """숫자 값을 Prometheus 형식 문자열로 변환"""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class _Metric:
+    """메트릭 공통 기능 (레이블 조합별 값 저장)"""
+    
+    metric_type = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+    
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+    
+    def _labels(self, key: Tuple) -> Dict:
+        return dict(zip(self.labelnames, key))
+    
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f'{self.name}{_format_labels(self._labels(key))} {_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    """누적 카운터 (증가만 가능)"""
+    
+    metric_type = 'counter'
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+    
+    metric_type = 'gauge'
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """분포 히스토그램 (누적 버킷 + 합계 + 개수)"""
+    
+    metric_type = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            bucket_counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    bucket_counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+    
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (bucket_counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f'{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+            lines.append(f'{self.name}_bucket{_format_labels(dict(labels, le="+Inf"))} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리 (등록 순서대로 출력)"""
+    
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+    
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+    
+    def add_collector(self, collector: Callable[[], Iterable[Tuple]]):
+        """
+        스크레이프 시점 수집기 등록
+        
+        collector()는 (이름, 타입, 설명, [(레이블 딕셔너리, 값), ...]) 튜플들을 반환
+        """
+        with self._lock:
+            self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """전체 메트릭을 Prometheus 텍스트 형식으로 출력"""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"⚠️ 메트릭 수집기 오류: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        
+        return '\n'.join(lines) + '\n'
+
+
+def read_process_rss_bytes() -> int:
+    """현재 프로세스 RSS (바이트) - /proc 우선, 없으면 최대 RSS"""
+    try:
+        with open(f'/proc/{os.getpid()}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# 전역 레지스트리 및 공용 메트릭
+REGISTRY = MetricsRegistry()
+
+SENSOR_READ_SECONDS = REGISTRY.histogram(
+    'egdash_sensor_read_seconds', '센서 드라이버 read_data() 소요 시간', ('sensor',))
+SENSOR_READ_FAILURES = REGISTRY.counter(
+    'egdash_sensor_read_failures_total', '센서 읽기 실패 횟수 (값 없음)', ('sensor',))
+I2C_BUS_BUSY_SECONDS = REGISTRY.counter(
+    'egdash_i2c_bus_busy_seconds_total', 'I2C 버스별 센서 통신 누적 시간', ('bus',))
+ACQUISITION_CYCLE_SECONDS = REGISTRY.histogram(
+    'egdash_acquisition_cycle_seconds', '수집 스레드 1주기 소요 시간')
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'egdash_http_request_seconds', 'HTTP 요청 처리 시간', ('route', 'method', 'status'))
+ALERT_EVENTS = REGISTRY.counter(
+    'egdash_alert_events_total', '알림 발생/해제 이벤트 수', ('rule', 'event'))
+ANOMALY_FLAGS = REGISTRY.counter(
+    'egdash_anomaly_flags_total', '이상 탐지 플래그 발생 횟수 (fault: saturated/stuck/jump, event: excursion)',
+    ('channel', 'flag'))
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+채널별 잡음 필터 단계 (스냅샷 처리기, 처리기 중 가장 먼저 실행)
+- median: 최근 N개 중앙값 (스파이크 제거, N 고정이므로 샘플당 상수 시간)
+- ema: 지수 이동 평균
+- kalman: 1차원 칼만 필터 (랜덤 워크 모델, process_noise/measurement_noise)
+- 필터링한 값은 원래 채널에, 원본 값은 '<채널>_raw' 채널에 함께 기록
+- 원본 측정 시각(snapshot['source_times'])이 직전과 같은 채널은 필터 상태를 바꾸지 않고 직전 결과 유지
+  (SPS30/BME688 캐시 값이 반복되어도 한 샘플로만 반영)
+- 같은 필터를 NumPy로 일괄 적용하여 원본 이력에서 필터 결과 백필
+  (결과는 스트리밍과 동일, 단 캐시 값이 반복된 행은 백필에서 별도 샘플로 계산됨)
+
+설정 파일: 환경 변수 EGDASH_FILTER_CONFIG (JSON 객체 {채널: {"type": ..., 옵션}}, 미설정 시 DEFAULT_FILTERS)
+"""
+
+import os
+import json
+import math
+from collections import deque
+from importlib.util import find_spec
+from typing import Dict, List, Optional
+
+# NumPy는 백필 요청 시에만 로딩
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+
+# SDP810 차압과 BH1750 조도는 1초 폴링에서 잡음이 커서 기본 적용
+DEFAULT_FILTERS = {
+    'differential_pressure': {'type': 'median', 'size': 5},
+    'light': {'type': 'kalman', 'process_noise': 4.0, 'measurement_noise': 25.0}
+}
+
+EMA_BLOCK_SIZE = 64  # 벡터화 EMA 블록 길이 (블록 안 가중치 (1-α)^-k의 범위 제한)
+
+
+class MedianFilter:
+    """최근 N개 샘플의 중앙값"""
+    
+    type = 'median'
+    
+    def __init__(self, size: int = 5):
+        if size < 1:
+            raise ValueError("median size는 1 이상")
+        self.size = size
+        self._window = deque(maxlen=size)
+    
+    def update(self, value: float) -> float:
+        self._window.append(value)
+        ordered = sorted(self._window)
+        middle = len(ordered) // 2
+        return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    
+    def batch(self, values, np):
+        """연속 샘플 배열 일괄 필터 (앞쪽 size-1개는 스트리밍과 같이 가용 샘플만 사용)"""
+        n = len(values)
+        head = min(self.size - 1, n)
+        result = np.empty(n)
+        for i in range(head):
+            result[i] = np.median(values[:i + 1])
+        if n > head:
+            windows = np.lib.stride_tricks.sliding_window_view(values, self.size)
+            result[head:] = np.median(windows, axis=1)
+        return result
+    
+    def to_dict(self) -> Dict:
+        return {'type': self.type, 'size': self.size}
+
+
+class EmaFilter:
+    """지수 이동 평균 (첫 샘플로 초기화)"""
+    
+    type = 'ema'
+    
+    def __init__(self, alpha: float = 0.3):
+        if not 0 < alpha <= 1:
+            raise ValueError("ema alpha는 0~1")
+        self.alpha = alpha
+        self._value = None
+    
+    def update(self, value: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+    
+    @staticmethod
+    def ema_blocks(values, alpha: float, initial: float, np):
+        """y[i] = (1-α)·y[i-1] + α·x[i] 벡터화 (블록 단위 누적합, 블록 사이 값 이어받기)"""
+        result = np.empty(len(values))
+        decay = 1.0 - alpha
+        if decay < 1e-12:
+            return np.array(values, dtype=float)
+        # (1-α)^-k가 float 범위(1e300)를 넘지 않도록 블록 길이 제한
+        block_size = max(1, min(EMA_BLOCK_SIZE, int(300 / -math.log10(decay))))
+        carry = initial
+        for start in range(0, len(values), block_size):
+            block = values[start:start + block_size]
+            powers = decay ** np.arange(len(block))
+            weighted = alpha * powers * np.cumsum(block / powers)
+            block_result = decay * powers * carry + weighted
+            result[start:start + len(block)] = block_result
+            carry = block_result[-1]
+        return result
+    
+    def batch(self, values, np):
+        if len(values) == 0:
+            return np.empty(0)
+        result = np.empty(len(values))
+        result[0] = values[0]
+        result[1:] = self.ema_blocks(values[1:], self.alpha, values[0], np)
+        return result
+    
+    def to_dict(self) -> Dict:
+        return {'type': self.type, 'alpha': self.alpha}
+
+
+class KalmanFilter:
+    """1차원 칼만 필터 (상태: 실제 값, 랜덤 워크 + 측정 잡음 모델)"""
+    
+    type = 'kalman'
+    
+    def __init__(self, process_noise: float = 1.0, measurement_noise: float = 10.0):
+        """
+        Args:
+            process_noise: 샘플 사이 실제 값 변화 분산 (클수록 빠르게 따라감)
+            measurement_noise: 측정 잡음 분산 (클수록 더 평활)
+        """
+        if process_noise <= 0 or measurement_noise <= 0:
+            raise ValueError("kalman process_noise/measurement_noise는 0보다 커야 함")
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._value = None
+        self._variance = None
+    
+    def _gains(self, count: int) -> List[float]:
+        """첫 샘플 이후 샘플별 칼만 이득 (측정값과 무관하므로 미리 계산, 수렴 후 상수)"""
+        gains = []
+        variance = self.measurement_noise
+        for _ in range(count):
+            predicted = variance + self.process_noise
+            gain = predicted / (predicted + self.measurement_noise)
+            if gains and abs(gain - gains[-1]) < 1e-12:
+                gains.extend([gain] * (count - len(gains)))
+                break
+            gains.append(gain)
+            variance = (1.0 - gain) * predicted
+        return gains
+    
+    def update(self, value: float) -> float:
+        if self._value is None:
+            self._value = value
+            self._variance = self.measurement_noise
+            return value
+        predicted = self._variance + self.process_noise
+        gain = predicted / (predicted + self.measurement_noise)
+        self._value += gain * (value - self._value)
+        self._variance = (1.0 - gain) * predicted
+        return self._value
+    
+    def batch(self, values, np):
+        n = len(values)
+        if n == 0:
+            return np.empty(0)
+        gains = self._gains(n - 1)
+        result = np.empty(n)
+        result[0] = values[0]
+        
+        # 이득이 수렴하기 전 구간은 샘플별 계산, 이후는 상수 이득 EMA로 벡터화
+        steady = next((i for i in range(1, len(gains)) if gains[i] == gains[-1]), len(gains))
+        current = values[0]
+        for i in range(steady):
+            current += gains[i] * (values[i + 1] - current)
+            result[i + 1] = current
+        if steady < n - 1:
+            result[steady + 1:] = EmaFilter.ema_blocks(values[steady + 1:], gains[-1], current, np)
+        return result
+    
+    def to_dict(self) -> Dict:
+        return {'type': self.type, 'process_noise': self.process_noise,
+                'measurement_noise': self.measurement_noise}
+
+
+FILTER_TYPES = {
+    'median': MedianFilter,
+    'ema': EmaFilter,
+    'kalman': KalmanFilter
+}
+
+
+def build_filter(config: Dict):
+    """설정 {"type": ..., 옵션}으로 필터 생성"""
+    options = dict(config)
+    filter_type = options.pop('type', None)
+    if filter_type not in FILTER_TYPES:
+        raise ValueError(f"지원하지 않는 필터: {filter_type}")
+    return FILTER_TYPES[filter_type](**options)
+
+
+class FilterStage:
+    """스냅샷 처리기: 채널별 필터 적용 (원본은 '<채널>_raw'로 보존)"""
+    
+    def __init__(self, configs: Dict[str, Dict]):
+        """
+        Args:
+            configs: {채널 이름: 필터 설정}
+        """
+        self.configs = {channel: dict(config) for channel, config in configs.items()}
+        self.filters = {channel: build_filter(config) for channel, config in configs.items()}
+        self.filtered_count = 0
+        self.repeated_count = 0
+        self._source_times = {}  # 채널별 마지막으로 반영한 원본 측정 시각
+        self._outputs = {}  # 채널별 마지막 필터 결과 (반복 샘플에 그대로 사용)
+    
+    @property
+    def raw_channels(self) -> List[str]:
+        """원본 값을 보존하는 '<채널>_raw' 채널 목록 (공유 메모리 링 버퍼에 기록할 추가 채널)"""
+        return [f"{channel}_raw" for channel in self.filters]
+    
+    def process(self, snapshot: Dict):
+        """스냅샷 처리기: 값이 없는 샘플과 같은 원본 샘플이 반복된 채널은 필터 상태를 바꾸지 않음"""
+        source_times = snapshot.get('source_times') or {}
+        for channel, channel_filter in self.filters.items():
+            value = snapshot.get(channel)
+            snapshot[f"{channel}_raw"] = value
+            if value is None:
+                continue
+            
+            source_time = source_times.get(channel)
+            if source_time is not None:
+                if source_time == self._source_times.get(channel):
+                    self.repeated_count += 1
+                    snapshot[channel] = self._outputs[channel]
+                    continue
+                self._source_times[channel] = source_time
+            
+            output = channel_filter.update(float(value))
+            self._outputs[channel] = output
+            snapshot[channel] = output
+            self.filtered_count += 1
+    
+    def backfill(self, columns: Dict) -> Dict:
+        """
+        원본 이력에 같은 필터를 새 상태로 일괄 적용 (NumPy)
+        
+        Args:
+            columns: 채널 이름 → 원본 값 시퀀스 (None/NaN은 값 없음 - 건너뛰고 None 유지)
+        
+        Returns:
+            Dict: 채널 이름 → 필터 결과 리스트
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy가 설치되지 않아 백필을 사용할 수 없습니다 (pip install numpy)")
+        import numpy as np
+        
+        results = {}
+        for channel, values in columns.items():
+            if channel not in self.configs:
+                raise ValueError(f"필터가 설정되지 않은 채널: {channel}")
+            array = np.array([np.nan if value is None else value for value in values], dtype=float)
+            valid = ~np.isnan(array)
+            filtered = np.full(len(array), np.nan)
+            filtered[valid] = build_filter(self.configs[channel]).batch(array[valid], np)
+            results[channel] = [None if math.isnan(value) else float(value) for value in filtered]
+        return results
+    
+    def backfill_from_reader(self, reader, count: int) -> Dict:
+        """
+        공유 메모리 링 버퍼의 '<채널>_raw' 이력으로 백필 (모든 채널을 한 번에 읽어 같은 행끼리 정렬)
+        
+        Returns:
+            Dict: {'timestamps': [...], 채널 이름: {'raw': [...], 'filtered': [...]}}
+        
+        Raises:
+            ValueError: 수집 데몬의 세그먼트에 '<채널>_raw'가 없음 (데몬과 워커의 필터 설정이 다름)
+        """
+        columns = reader.read_columns(self.raw_channels, count)
+        raw = {channel: columns[f"{channel}_raw"] for channel in self.filters}
+        filtered = self.backfill(raw)
+        result = {'timestamps': columns['timestamps']}
+        for channel in self.filters:
+            result[channel] = {'raw': raw[channel], 'filtered': filtered[channel]}
+        return result
+    
+    def get_filters(self) -> Dict:
+        """채널별 필터 설정"""
+        return {channel: channel_filter.to_dict() for channel, channel_filter in self.filters.items()}
+    
+    def get_status(self) -> Dict:
+        """필터 단계 상태 정보 반환"""
+        return {
+            'filters': self.get_filters(),
+            'filtered_count': self.filtered_count,
+            'repeated_count': self.repeated_count,
+            'numpy_available': NUMPY_AVAILABLE
+        }
+
+
+def load_filter_stage(path: Optional[str] = None) -> FilterStage:
+    """설정 파일(JSON 객체)로 필터 단계 생성 (경로가 없으면 기본 필터)"""
+    if path:
+        with open(path) as f:
+            configs = json.load(f)
+    else:
+        configs = DEFAULT_FILTERS
+    return FilterStage(configs)
+
+
+def create_filter_stage() -> Optional[FilterStage]:
+    """환경 변수 설정으로 필터 단계 생성 (EGDASH_FILTERS=0이면 None)"""
+    if os.environ.get('EGDASH_FILTERS', '1') not in ('1', 'true', 'yes'):
+        return None
+    
+    try:
+        return load_filter_stage(os.environ.get('EGDASH_FILTER_CONFIG'))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ 필터 설정 로드 실패 - 필터 비활성화: {e}")
+        return None
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+온디맨드 통계 샘플링 프로파일러
+- 요청 시에만 N초 동안 sys._current_frames()로 전체 스레드 스택을 주기적으로 수집
+- 프로파일러가 꺼져 있을 때는 아무 훅도 설치하지 않음 (오버헤드 없음)
+- 결과는 collapsed stack 형식 (flamegraph.pl / speedscope / Perfetto에서 바로 사용)
+
+collapsed 한 줄 형식: 스레드이름;바깥함수 (파일:줄);...;안쪽함수 (파일:줄) 샘플수
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+DEFAULT_SAMPLE_INTERVAL = 0.005  # 5ms (초당 200회)
+MAX_PROFILE_SECONDS = 60
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(frame) -> str:
+    """프레임 표시 이름 (함수 (파일:줄))"""
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})'
+
+
+class SamplingProfiler:
+    """전체 스레드 샘플링 프로파일러 (동시에 한 세션만 실행)"""
+    
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._session_lock = threading.Lock()
+        self.last_profile = None  # 마지막 세션 요약
+    
+    @property
+    def running(self) -> bool:
+        return self._session_lock.locked()
+    
+    def profile(self, seconds: float, interval: Optional[float] = None) -> Optional[Dict]:
+        """
+        호출한 스레드에서 seconds 동안 샘플링 (다른 세션 실행 중이면 None)
+        
+        Returns:
+            Dict: stacks(collapsed 스택 → 샘플 수), sample_count, thread_samples 등
+        """
+        if not self._session_lock.acquire(blocking=False):
+            return None
+        
+        try:
+            return self._run(min(max(seconds, 0.1), MAX_PROFILE_SECONDS), interval or self.interval)
+        finally:
+            self._session_lock.release()
+    
+    def _run(self, seconds: float, interval: float) -> Dict:
+        own_ident = threading.get_ident()
+        stacks = Counter()
+        thread_samples = Counter()
+        sample_count = 0
+        
+        started_at = time.time()
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_sample = start
+        
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(next_sample - now)
+            next_sample += interval
+            
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                
+                labels = []
+                while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.reverse()
+                
+                thread_name = thread_names.get(ident, f'thread-{ident}')
+                stacks[thread_name + ';' + ';'.join(labels)] += 1
+                thread_samples[thread_name] += 1
+            
+            sample_count += 1
+        
+        elapsed = time.perf_counter() - start
+        self.last_profile = {
+            'started_at': started_at,
+            'duration': round(elapsed, 3),
+            'sample_count': sample_count,
+            'stack_count': len(stacks)
+        }
+        
+        return {
+            'duration': elapsed,
+            'interval': interval,
+            'sample_count': sample_count,
+            'thread_samples': dict(thread_samples),
+            'stacks': stacks
+        }
+    
+    @staticmethod
+    def format_collapsed(result: Dict) -> str:
+        """collapsed stack 텍스트 (샘플 수 내림차순)"""
+        lines = [f'{stack} {count}' for stack, count in result['stacks'].most_common()]
+        return '\n'.join(lines) + '\n'
+    
+    @staticmethod
+    def top_frames(result: Dict, limit: int = 20) -> list:
+        """가장 많이 샘플링된 최상단(self) 프레임 목록"""
+        self_counts = Counter()
+        for stack, count in result['stacks'].items():
+            self_counts[stack.rsplit(';', 1)[-1]] += count
+        
+        total = sum(self_counts.values()) or 1
+        return [{'frame': frame, 'samples': count, 'percent': round(count * 100.0 / total, 1)}
+                for frame, count in self_counts.most_common(limit)]
+    
+    def get_status(self) -> Dict:
+        """프로파일러 상태 정보 반환"""
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'last_profile': self.last_profile
+        }
+
+
+PROFILER = SamplingProfiler()
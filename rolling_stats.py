@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+채널별 롤링 윈도우 통계 (스냅샷 처리기)
+- 윈도우: 1분, 15분, 1시간, 24시간 - 최소/최대/평균/표준편차/샘플 수
+- 최소/최대: 단조 deque (윈도우를 벗어난 항목은 앞에서, 지배당한 항목은 뒤에서 제거)
+- 평균/표준편차: 합과 제곱합 누적 (기준값을 빼서 상쇄 오차 완화, 주기적으로 버킷에서 재계산)
+- 긴 윈도우는 시간 버킷(1시간 10초, 24시간 60초)으로 묶어 메모리를 채널당 수천 항목으로 제한
+  (최소/최대는 정확, 평균/표준편차의 윈도우 경계만 버킷 1개 단위)
+- 샘플당 분할 상환 O(1)
+- 원본 측정 시각(snapshot['source_times'])이 직전과 같은 채널은 샘플로 세지 않음
+  (SPS30/BME688 캐시 값 반복이 샘플 수를 부풀리고 표준편차를 줄이지 않도록)
+"""
+
+import os
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from snapshot_delta import DISPLAY_PRECISION
+
+# (이름, 윈도우 길이 초, 버킷 길이 초)
+STATS_WINDOWS = (
+    ('1m', 60, 1),
+    ('15m', 900, 1),
+    ('1h', 3600, 10),
+    ('24h', 86400, 60)
+)
+
+# 표시 채널 중 고정값(vibration), 중복 채널(absolute_pressure), 필터 전 원본(*_raw)은 제외
+STATS_CHANNELS = tuple(channel for channel in DISPLAY_PRECISION
+                       if channel not in ('vibration', 'absolute_pressure') and not channel.endswith('_raw'))
+
+STAT_FIELDS = ('min', 'max', 'mean', 'std', 'count')
+
+
+class WindowStats:
+    """채널 1개 × 윈도우 1개의 롤링 통계"""
+    
+    def __init__(self, window_seconds: float, bucket_seconds: float):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        
+        # 버킷: [시작 시각, 샘플 수, 합, 제곱합] (합은 기준값 offset을 뺀 값)
+        self._buckets = deque()
+        self._min = deque()  # (버킷 시작 시각, 값) - 값이 앞에서 뒤로 증가
+        self._max = deque()  # (버킷 시작 시각, 값) - 값이 앞에서 뒤로 감소
+        self._offset = None
+        self._count = 0
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._expired_since_rebuild = 0
+    
+    def add(self, now: float, value: float):
+        """샘플 추가 후 윈도우 밖 버킷 제거"""
+        if self._offset is None:
+            self._offset = value
+        shifted = value - self._offset
+        start = math.floor(now / self.bucket_seconds) * self.bucket_seconds
+        
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == start:
+            bucket = buckets[-1]
+            bucket[1] += 1
+            bucket[2] += shifted
+            bucket[3] += shifted * shifted
+        else:
+            buckets.append([start, 1, shifted, shifted * shifted])
+        self._count += 1
+        self._sum += shifted
+        self._sum_squares += shifted * shifted
+        
+        # 같은 버킷의 항목은 만료 시각이 같으므로 더 나은 값 하나만 남김
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        if not (self._min and self._min[-1][0] == start):
+            self._min.append((start, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        if not (self._max and self._max[-1][0] == start):
+            self._max.append((start, value))
+        
+        self.expire(now)
+    
+    def expire(self, now: float):
+        """윈도우를 벗어난 버킷 제거"""
+        cutoff = now - self.window_seconds
+        buckets = self._buckets
+        while buckets and buckets[0][0] + self.bucket_seconds <= cutoff:
+            _, count, total, squares = buckets.popleft()
+            self._count -= count
+            self._sum -= total
+            self._sum_squares -= squares
+            self._expired_since_rebuild += 1
+        while self._min and self._min[0][0] + self.bucket_seconds <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] + self.bucket_seconds <= cutoff:
+            self._max.popleft()
+        
+        # 누적 오차 방지: 버킷이 한 바퀴 교체될 때마다 합계 재계산 (분할 상환 O(1))
+        if self._expired_since_rebuild >= max(len(buckets), 1):
+            self._rebuild()
+    
+    def _rebuild(self):
+        buckets = self._buckets
+        self._expired_since_rebuild = 0
+        if not buckets:
+            self._offset = None
+            self._count = 0
+            self._sum = self._sum_squares = 0.0
+            return
+        self._count = sum(bucket[1] for bucket in buckets)
+        self._sum = math.fsum(bucket[2] for bucket in buckets)
+        self._sum_squares = math.fsum(bucket[3] for bucket in buckets)
+    
+    def result(self, digits: int = 3) -> Optional[List]:
+        """[min, max, mean, std, count] (샘플이 없으면 None)"""
+        count = self._count
+        if count <= 0:
+            return None
+        mean = self._sum / count
+        variance = (self._sum_squares - self._sum * mean) / (count - 1) if count > 1 else 0.0
+        std = math.sqrt(variance) if variance > 0 else 0.0
+        return [round(self._min[0][1], digits), round(self._max[0][1], digits),
+                round(mean + self._offset, digits), round(std, digits + 1), count]
+    
+    @property
+    def size(self) -> int:
+        """보관 중인 항목 수 (버킷 + 단조 deque)"""
+        return len(self._buckets) + len(self._min) + len(self._max)
+
+
+class RollingStats:
+    """스냅샷 처리기: 채널×윈도우 롤링 통계를 snapshot['stats']에 기록"""
+    
+    def __init__(self, channels=STATS_CHANNELS, windows=STATS_WINDOWS):
+        """
+        Args:
+            channels: 통계 대상 채널 목록
+            windows: (이름, 윈도우 길이 초, 버킷 길이 초) 목록
+        """
+        self.channels = tuple(channels)
+        self.windows = tuple(windows)
+        self._stats = {channel: {name: WindowStats(length, bucket) for name, length, bucket in self.windows}
+                       for channel in self.channels}
+        self._source_times = {}  # 채널별 마지막으로 반영한 원본 측정 시각
+        self.sample_count = 0
+        self.repeated_count = 0
+    
+    def process(self, snapshot: Dict):
+        """
+        스냅샷 처리기: 새 원본 샘플이 있는 채널은 추가, 값이 없거나 반복된 채널은 만료만 처리
+        
+        snapshot['stats'] = {윈도우: {채널: [min, max, mean, std, count]}}
+        """
+        now = snapshot.get('acquired_at') or time.time()
+        source_times = snapshot.get('source_times') or {}
+        for channel in self.channels:
+            value = snapshot.get(channel)
+            source_time = source_times.get(channel)
+            if value is not None and source_time is not None:
+                if source_time == self._source_times.get(channel):
+                    self.repeated_count += 1
+                    value = None
+                else:
+                    self._source_times[channel] = source_time
+            for stats in self._stats[channel].values():
+                if value is None:
+                    stats.expire(now)
+                else:
+                    stats.add(now, float(value))
+        self.sample_count += 1
+        snapshot['stats'] = self.get_stats()
+    
+    def get_stats(self, window: Optional[str] = None, channel: Optional[str] = None) -> Dict:
+        """{윈도우: {채널: [min, max, mean, std, count]}} (샘플 없는 채널은 제외)"""
+        result = {}
+        for name, _, _ in self.windows:
+            if window and name != window:
+                continue
+            channels = {}
+            for channel_name in self.channels:
+                if channel and channel_name != channel:
+                    continue
+                values = self._stats[channel_name][name].result(DISPLAY_PRECISION.get(channel_name, 2) + 1)
+                if values is not None:
+                    channels[channel_name] = values
+            result[name] = channels
+        return result
+    
+    def get_status(self) -> Dict:
+        """롤링 통계 상태 정보 반환"""
+        return {
+            'windows': [{'name': name, 'seconds': length, 'bucket_seconds': bucket}
+                        for name, length, bucket in self.windows],
+            'channels': list(self.channels),
+            'sample_count': self.sample_count,
+            'repeated_count': self.repeated_count,
+            'entry_count': sum(stats.size for windows in self._stats.values() for stats in windows.values())
+        }
+
+
+def create_rolling_stats() -> Optional[RollingStats]:
+    """환경 변수 설정으로 롤링 통계 생성 (EGDASH_STATS=0이면 None)"""
+    if os.environ.get('EGDASH_STATS', '1') not in ('1', 'true', 'yes'):
+        return None
+    return RollingStats()
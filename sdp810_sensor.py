@@ -6,6 +6,7 @@ Sensirion SDP810 differential pressure sensor driver
 
 import time
 import smbus2
+from tracer import TRACER
 
 class SDP810Sensor:
     """SDP810 차압센서 클래스 (simpleEddy.py 방식)"""
@@ -14,6 +15,7 @@ class SDP810Sensor:
         self.bus = bus
         self.address = address
         self.connected = False
+        self.crc_error_count = 0  # 누적 CRC 검증 실패 횟수
         
         # 연결 테스트 및 초기화
         self.connected = self._initialize()
@@ -66,6 +68,9 @@ class SDP810Sensor:
             # CRC 검증
             calculated_crc = self._calculate_crc8([pressure_msb, pressure_lsb])
             crc_ok = calculated_crc == received_crc
+            if not crc_ok:
+                self.crc_error_count += 1
+                TRACER.instant('sdp810.crc_error', 'sensor')
             
             # 압력 계산 (simpleEddy.py 방식)
             import struct
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+센서 데이터 수집 백그라운드 스레드
+- 일정 간격으로 SensorManager.read_all_sensors()를 한 번만 호출
+- 수집 결과에 순번(seq)을 붙인 스냅샷으로 보관하고 브로드캐스터에 발행
+- 스냅샷은 응답 형태별 직렬화 결과를 캐시하여 요청마다 다시 인코딩하지 않음
+- 게시 전에 스냅샷 처리기(알림 규칙 평가 등)를 순서대로 실행
+"""
+
+import time
+import threading
+from typing import Optional, Dict, Callable
+from json_codec import dumps_bytes
+from metrics import ACQUISITION_CYCLE_SECONDS
+from tracer import TRACER
+
+
+class SensorSnapshot(dict):
+    """센서 스냅샷 (응답 형태별 직렬화 바이트 캐시 포함)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encoded = {}
+        self.previous = None  # 직전 스냅샷 (델타 인코딩용, 한 단계만 유지)
+    
+    def encode(self, shape: str, builder: Optional[Callable] = None) -> bytes:
+        """
+        스냅샷을 지정한 응답 형태로 직렬화 (형태별 최초 1회만 인코딩)
+        
+        Args:
+            shape: 응답 형태 이름 (캐시 키)
+            builder: 스냅샷으로 응답 객체를 만드는 함수 (None이면 스냅샷 전체)
+        """
+        encoded = self._encoded.get(shape)
+        if encoded is None:
+            with TRACER.span('snapshot.encode', 'serialize', shape=shape) as span:
+                payload = builder(self) if builder else self
+                encoded = dumps_bytes(payload)
+                span.set(bytes=len(encoded))
+            self._encoded[shape] = encoded
+        return encoded
+    
+    def encoded_size(self) -> int:
+        """캐시된 직렬화 결과의 총 바이트 수"""
+        return sum(len(encoded) for encoded in list(self._encoded.values()))
+
+
+class SensorAcquisitionThread:
+    """센서 스냅샷 수집/발행 백그라운드 스레드"""
+    
+    label = "센서 수집 스레드"
+    
+    def __init__(self, sensor_manager, broadcaster=None, interval=1.0, eager_shapes=None, processors=None):
+        """
+        수집 스레드 초기화
+        
+        Args:
+            sensor_manager: 센서 읽기를 담당하는 SensorManager
+            broadcaster: 스냅샷을 전달할 SnapshotBroadcaster (None이면 발행 생략)
+            interval: 수집 간격 (초)
+            eager_shapes: 수집 직후 미리 직렬화할 응답 형태 {이름: builder}
+            processors: 게시 전에 순서대로 실행할 스냅샷 처리기 목록 (process(snapshot) 메서드)
+        """
+        self.sensor_manager = sensor_manager
+        self.broadcaster = broadcaster
+        self.interval = interval
+        self.eager_shapes = eager_shapes or {}
+        self.processors = list(processors or [])
+        self.running = False
+        self.thread = None
+        
+        # Thread-safe 최신 스냅샷
+        self._snapshot_lock = threading.Lock()
+        self._latest_snapshot = None
+        self._seq = 0
+        self._status_snapshot = None  # 센서 연결 상태가 마지막으로 바뀐 스냅샷
+        self._stop_event = threading.Event()
+        
+        # 수집 통계
+        self.cycle_count = 0
+        self.error_count = 0
+        self.last_cycle_duration = 0.0
+    
+    def _acquire_snapshot(self) -> Optional[SensorSnapshot]:
+        """센서 데이터를 한 번 읽어 스냅샷 생성 (새 스냅샷이 없으면 None)"""
+        data = self.sensor_manager.read_all_sensors()
+        
+        snapshot = SensorSnapshot(data)
+        snapshot['acquired_at'] = time.time()
+        return self._store_snapshot(snapshot)
+    
+    def _store_snapshot(self, snapshot: SensorSnapshot) -> SensorSnapshot:
+        """스냅샷에 순번을 붙여 최신 스냅샷으로 저장"""
+        snapshot['seq'] = self._seq + 1
+        snapshot.previous = self._latest_snapshot
+        
+        # 처리기가 채널 추가/알림 평가를 마친 뒤 직렬화
+        for processor in self.processors:
+            try:
+                with TRACER.span('snapshot.process', 'acquisition', processor=type(processor).__name__):
+                    processor.process(snapshot)
+            except Exception as e:
+                print(f"❌ 스냅샷 처리기 오류 ({type(processor).__name__}): {e}")
+        
+        # 자주 쓰는 응답 형태는 게시 전에 수집 스레드에서 한 번만 직렬화
+        for shape, builder in self.eager_shapes.items():
+            snapshot.encode(shape, builder)
+        
+        with self._snapshot_lock:
+            self._seq = snapshot['seq']
+            
+            previous = self._status_snapshot
+            if previous is None or previous['sensor_status'] != snapshot['sensor_status']:
+                self._status_snapshot = snapshot
+            
+            self._latest_snapshot = snapshot
+        
+        # 직전 스냅샷의 참조 체인은 끊어 메모리 누적 방지 (델타는 이미 직렬화됨)
+        if snapshot.previous is not None:
+            snapshot.previous.previous = None
+        
+        return snapshot
+    
+    def _background_worker(self):
+        """백그라운드 스레드 워커 함수"""
+        print(f"🚀 {self.label} 시작 (간격: {self.interval}초)")
+        
+        while self.running:
+            cycle_start = time.time()
+            snapshot = None
+            
+            try:
+                with TRACER.span('acquisition_cycle', 'acquisition') as span:
+                    snapshot = self._acquire_snapshot()
+                    self.cycle_count += 1
+                    
+                    if self.broadcaster and snapshot is not None:
+                        span.set(seq=snapshot['seq'])
+                        with TRACER.span('snapshot.publish', 'acquisition'):
+                            self.broadcaster.publish(snapshot)
+            
+            except Exception as e:
+                self.error_count += 1
+                print(f"❌ {self.label} 오류: {e}")
+            
+            self.last_cycle_duration = time.time() - cycle_start
+            if snapshot is not None:
+                ACQUISITION_CYCLE_SECONDS.observe(self.last_cycle_duration)
+            
+            # 다음 주기까지 대기 (중단 신호 즉시 반영)
+            self._stop_event.wait(max(0.0, self.interval - self.last_cycle_duration))
+        
+        print(f"🛑 {self.label} 종료")
+    
+    def start(self):
+        """수집 스레드 시작"""
+        if self.running:
+            return True
+        
+        self.running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._background_worker, daemon=True)
+        self.thread.start()
+        return True
+    
+    def stop(self):
+        """수집 스레드 중지"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._stop_event.set()
+        
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+    
+    def get_latest_snapshot(self) -> Optional[SensorSnapshot]:
+        """최신 스냅샷 반환 (아직 수집 전이면 None)"""
+        with self._snapshot_lock:
+            return self._latest_snapshot
+    
+    def get_status_snapshot(self) -> Optional[SensorSnapshot]:
+        """센서 연결 상태가 마지막으로 바뀐 스냅샷 반환 (상태 ETag 기준)"""
+        with self._snapshot_lock:
+            return self._status_snapshot
+    
+    def get_status(self) -> Dict:
+        """수집 스레드 상태 정보 반환"""
+        with self._snapshot_lock:
+            seq = self._seq
+            acquired_at = self._latest_snapshot['acquired_at'] if self._latest_snapshot else None
+        
+        return {
+            'thread_running': self.running,
+            'interval': self.interval,
+            'seq': seq,
+            'snapshot_age_seconds': round(time.time() - acquired_at, 1) if acquired_at else None,
+            'cycle_count': self.cycle_count,
+            'error_count': self.error_count,
+            'last_cycle_duration': round(self.last_cycle_duration, 3)
+        }
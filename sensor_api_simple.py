@@ -6,25 +6,69 @@ EG-Dash 심플 센서 API 서버
 - 단순한 구조로 최적화
 """
 
-from flask import Flask, jsonify, render_template, request
-from flask_cors import CORS
+from flask import Flask, jsonify, render_template, request, Response, stream_with_context, g
 from datetime import datetime
 import os
-from sensor_manager import SensorManager
+import time
+import hmac
+from functools import wraps
 from database import SensorDatabase
 from i2c_scanner import WebI2CScanner
+from sensor_acquisition import SensorAcquisitionThread
+from shared_snapshot import SharedSnapshotFollower
+from snapshot_broadcaster import SnapshotBroadcaster
+from json_codec import dumps_bytes
+from snapshot_delta import round_payload, diff_payload
+from metrics import REGISTRY, HTTP_REQUEST_SECONDS, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from tracer import TRACER
+from profiler import PROFILER, MAX_PROFILE_SECONDS
+from memory_monitor import MemoryMonitor, read_process_memory, count_open_fds
+from alert_engine import AlertEventRelay, create_alert_engine
+from anomaly_detector import create_anomaly_detector
+from derived_channels import create_derived_channel_engine
+from iaq_estimator import create_iaq_estimator
+from rolling_stats import create_rolling_stats, STAT_FIELDS
+from noise_filters import create_filter_stage
 
 app = Flask(__name__)
-CORS(app)
+
+# CORS 허용 (같은 출처 대시보드만 쓰는 배포는 EGDASH_CORS=0으로 끄고 flask_cors 로딩 생략)
+if os.environ.get('EGDASH_CORS', '1') in ('1', 'true', 'yes'):
+    from flask_cors import CORS
+    CORS(app)
 
 # 전역 객체들
 sensor_manager = None
 sensor_db = None
 i2c_scanner = None
+acquisition_thread = None
+snapshot_broadcaster = SnapshotBroadcaster(max_queue=16)
+alert_broadcaster = SnapshotBroadcaster(max_queue=64)  # 알림 이벤트 SSE
+alert_engine = None
+anomaly_detector = None
+derived_engine = None
+iaq_estimator = None
+rolling_stats = None
+filter_stage = None
+memory_monitor = MemoryMonitor()
+web_worker = False  # 멀티 프로세스 배포의 웹 워커 (센서/I2C 버스는 수집 데몬이 점유)
+
+# 센서 수집 간격 (초) - 대시보드의 가장 빠른 갱신 주기(BH1750/SDP810 1초)와 동일
+ACQUISITION_INTERVAL = 1.0
+
+# SSE 연결 유지(keep-alive) 주석 전송 간격 (초)
+STREAM_KEEPALIVE_INTERVAL = 15.0
+
+# 전체 스냅샷 SSE에서 빼는 처리기 결과 (매초 모든 구독자에게 보내기엔 크므로 /api/stats, /api/anomaly, /api/alerts로만 제공)
+STREAM_EXCLUDED_FIELDS = ('stats', 'anomaly', 'alert_events')
+
+# 서버 인스턴스 식별자 (재시작 후에도 프로세스 내부 순번 기반 ETag가 충돌하지 않도록 포함)
+SERVER_INSTANCE = f"{int(time.time()):x}-{os.getpid():x}"
 
 def initialize_sensors():
     """센서 매니저 초기화"""
-    global sensor_manager, sensor_db, i2c_scanner
+    global sensor_manager, sensor_db, i2c_scanner, acquisition_thread
+    global alert_engine, anomaly_detector, derived_engine, iaq_estimator, rolling_stats, filter_stage
     
     # 데이터베이스 초기화
     print("센서 데이터베이스 초기화 중...")
@@ -34,11 +78,60 @@ def initialize_sensors():
     print("I2C 스캐너 초기화 중...")
     i2c_scanner = WebI2CScanner()
     
-    # 센서 매니저 초기화
-    print("실제 센서 연결 중...")
-    sensor_manager = SensorManager()
+    # 센서 매니저 초기화 (EGDASH_EMULATOR=1이면 하드웨어 없이 에뮬레이터 장치 사용,
+    # EGDASH_REPLAY_TRACE가 있으면 녹화된 버스 트래픽 재생)
+    if os.environ.get('EGDASH_REPLAY_TRACE'):
+        from bus_trace import create_replay_sensor_manager
+        sensor_manager, _ = create_replay_sensor_manager(os.environ['EGDASH_REPLAY_TRACE'],
+                                                         speed=float(os.environ.get('EGDASH_REPLAY_SPEED', '1.0')))
+    elif os.environ.get('EGDASH_EMULATOR', '') in ('1', 'true', 'yes'):
+        from sensor_emulator import create_emulated_sensor_manager
+        print("🧪 센서 에뮬레이터 연결 중...")
+        sensor_manager = create_emulated_sensor_manager()
+    else:
+        from sensor_manager import SensorManager
+        print("실제 센서 연결 중...")
+        sensor_manager = SensorManager()
+    
+    # 버스 트래픽 녹화 (EGDASH_RECORD_TRACE=파일 경로)
+    if os.environ.get('EGDASH_RECORD_TRACE'):
+        from bus_trace import attach_recorder
+        attach_recorder(sensor_manager, os.environ['EGDASH_RECORD_TRACE'])
     
-    if sensor_manager.initialize_sensors():
+    sensors_ok = sensor_manager.initialize_sensors()
+    
+    # 스냅샷 처리기: 잡음 필터 → 파생 채널 → IAQ → 이상 탐지 → 롤링 통계 → 알림
+    # (EGDASH_FILTERS/DERIVED/IAQ/ANOMALY/STATS/ALERTS=0이면 각각 비활성)
+    processors = []
+    filter_stage = create_filter_stage()
+    if filter_stage:
+        processors.append(filter_stage)
+    derived_engine = create_derived_channel_engine()
+    if derived_engine:
+        processors.append(derived_engine)
+    iaq_estimator = create_iaq_estimator()
+    if iaq_estimator:
+        processors.append(iaq_estimator)
+    anomaly_detector = create_anomaly_detector()
+    if anomaly_detector:
+        processors.append(anomaly_detector)
+    rolling_stats = create_rolling_stats()
+    if rolling_stats:
+        processors.append(rolling_stats)
+    alert_engine = create_alert_engine(alert_broadcaster)
+    if alert_engine:
+        processors.append(alert_engine)
+        alert_engine.start()
+    
+    # 센서 수집 스레드 시작 (SSE 스트림으로 스냅샷 발행, 주요 응답은 미리 직렬화)
+    acquisition_thread = SensorAcquisitionThread(sensor_manager, snapshot_broadcaster,
+                                                 interval=ACQUISITION_INTERVAL,
+                                                 eager_shapes=snapshot_eager_shapes(),
+                                                 processors=processors)
+    acquisition_thread.start()
+    memory_monitor.start()
+    
+    if sensors_ok:
         status = sensor_manager.get_sensor_status()
         print(f"센서 초기화 완료: {status['sensor_count']}/2개 센서 연결")
         return True
@@ -47,6 +140,80 @@ def initialize_sensors():
         # sensor_manager를 None으로 설정하지 않고 유지
         return True  # 서비스는 계속 시작
 
+def initialize_web_worker(shared_path=None, transport='file', shm_name=None):
+    """
+    웹 워커 초기화 (멀티 프로세스 배포용, wsgi.py에서 호출)
+    
+    센서 하드웨어는 acquisition_daemon.py가 점유하고,
+    워커는 공유 스냅샷(파일 또는 공유 메모리)만 읽어 API/SSE 응답을 제공
+    
+    Args:
+        shared_path: 공유 스냅샷 파일 경로 (transport='file')
+        transport: 'file' 또는 'shm' (acquisition_daemon.py --transport와 동일하게 설정)
+        shm_name: 공유 메모리 이름 (transport='shm', 기본: egdash_snapshot)
+    """
+    global sensor_db, acquisition_thread, web_worker, derived_engine, filter_stage
+    
+    web_worker = True
+    print("센서 데이터베이스 초기화 중...")
+    sensor_db = SensorDatabase()
+    # I2C 스캐너는 만들지 않음 (워커가 데몬이 쓰는 버스에 접근하면 진행 중인 센서 읽기와 충돌)
+    
+    # 파생 값/필터는 수집 데몬이 계산 (워커는 정의 조회와 백필에만 사용)
+    derived_engine = create_derived_channel_engine()
+    filter_stage = create_filter_stage()
+    
+    if transport == 'shm':
+        # multiprocessing.shared_memory는 공유 메모리 모드에서만 로딩
+        from shm_snapshot import SharedMemorySnapshotFollower, SHM_NAME
+        shm_name = shm_name or SHM_NAME
+        acquisition_thread = SharedMemorySnapshotFollower(shm_name, snapshot_broadcaster,
+                                                          eager_shapes=snapshot_eager_shapes())
+        print(f"📁 공유 메모리 스냅샷 추적: /dev/shm/{shm_name}")
+    else:
+        acquisition_thread = SharedSnapshotFollower(shared_path, snapshot_broadcaster,
+                                                    eager_shapes=snapshot_eager_shapes())
+        print(f"📁 공유 스냅샷 추적: {acquisition_thread.path}")
+    
+    # 알림은 수집 데몬이 평가하고, 스냅샷에 실린 이벤트를 /api/alerts/stream 구독자에게 중계
+    acquisition_thread.processors.append(AlertEventRelay(alert_broadcaster))
+    
+    acquisition_thread.start()
+    memory_monitor.start()
+    return True
+
+def register_memory_buffers():
+    """메모리 모니터에 서브시스템별 버퍼 크기 등록 (해당 객체가 없으면 기록 생략)"""
+    memory_monitor.register_buffer('stream_subscribers',
+                                   lambda: snapshot_broadcaster.get_status()['subscriber_count'])
+    memory_monitor.register_buffer('stream_queued_snapshots',
+                                   lambda: snapshot_broadcaster.get_status()['queued_count'])
+    memory_monitor.register_buffer('tracer_events', lambda: TRACER.get_status()['event_count'])
+    memory_monitor.register_buffer('alert_queued_events',
+                                   lambda: alert_engine.get_status()['queued_count'] if alert_engine else None)
+    memory_monitor.register_buffer('rolling_stats_entries',
+                                   lambda: rolling_stats.get_status()['entry_count'] if rolling_stats else None)
+    memory_monitor.register_buffer('db_connections',
+                                   lambda: sensor_db.connection_count if sensor_db else None)
+    memory_monitor.register_buffer('i2c_scanner_buses',
+                                   lambda: len(i2c_scanner.buses) if i2c_scanner else None)
+    
+    def snapshot_encoded_bytes():
+        snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+        return snapshot.encoded_size() if snapshot else None
+    
+    memory_monitor.register_buffer('snapshot_encoded_bytes', snapshot_encoded_bytes)
+
+register_memory_buffers()
+
+def snapshot_eager_shapes():
+    """수집 직후 미리 직렬화할 응답 형태"""
+    return {
+        'current': build_current_payload,
+        'stream': build_stream_payload,
+        'delta': build_delta_payload
+    }
+
 @app.route('/')
 def index():
     """메인 대시보드 페이지"""
@@ -62,34 +229,96 @@ def settings():
     """설정 페이지"""
     return render_template('pages/settings.html')
 
+def make_etag(kind, version, shared=False):
+    """
+    리소스 종류와 버전으로 강한 ETag 값 생성
+    
+    Args:
+        shared: 모든 웹 워커 프로세스가 같은 값을 내는 버전이면 True (인스턴스 식별자 생략)
+    """
+    if shared:
+        return f"{kind}-{version}"
+    return f"{kind}-{SERVER_INSTANCE}-{version}"
+
+def snapshot_etag(kind, snapshot):
+    """스냅샷 기반 ETag (웹 워커는 수집 데몬의 순번과 수집 시각을 써서 어느 워커가 응답해도 같은 값)"""
+    if snapshot.get('source_seq') is not None:
+        # 데몬 재시작으로 순번이 다시 시작되어도 수집 시각이 달라 충돌하지 않음
+        return make_etag(kind, f"{int(snapshot['acquired_at'] * 1e6):x}-{snapshot['source_seq']}", shared=True)
+    return make_etag(kind, snapshot['seq'])
+
+def not_modified_response(etag):
+    """If-None-Match가 현재 ETag와 일치하면 304 응답 반환 (직렬화 생략)"""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return None
+
+def tagged_json(payload, etag):
+    """ETag가 붙은 JSON 응답 생성 (클라이언트는 매번 재검증)"""
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def json_bytes_response(body, etag=None):
+    """이미 직렬화된 JSON 바이트로 응답 생성"""
+    response = Response(body, mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def build_current_payload(sensor_data):
+    """/api/current 응답 객체 생성"""
+    return {
+        'timestamp': sensor_data['timestamp'],
+        'temperature': sensor_data['temperature'],
+        'humidity': sensor_data['humidity'],
+        'light': sensor_data['light'],
+        'pressure': sensor_data['pressure'],  # BME688 절대압력 (hPa)
+        'differential_pressure': sensor_data['differential_pressure'],  # SDP810 차압 (Pa)
+        'differential_pressure_raw': sensor_data.get('differential_pressure_raw'),  # 필터 전 원본
+        'light_raw': sensor_data.get('light_raw'),
+        'vibration': sensor_data['vibration'],
+        'gas_resistance': sensor_data['gas_resistance'],
+        'air_quality': sensor_data['air_quality'],  # IAQ 추정기 점수 (0-100, 번인 중 None)
+        'iaq': sensor_data.get('iaq'),  # 0-500, 낮을수록 좋음
+        'iaq_status': sensor_data.get('iaq_status'),
+        'absolute_pressure': sensor_data['absolute_pressure'],
+        # SPS30 미세먼지 데이터 추가
+        'pm1': sensor_data.get('pm1'),
+        'pm25': sensor_data.get('pm25'),
+        'pm4': sensor_data.get('pm4'),
+        'pm10': sensor_data.get('pm10'),
+        # 파생 채널 (이슬점 °C, 절대습도 g/m³, 체감온도 °C)
+        'dew_point': sensor_data.get('dew_point'),
+        'absolute_humidity': sensor_data.get('absolute_humidity'),
+        'heat_index': sensor_data.get('heat_index'),
+        'sensor_status': sensor_data['sensor_status']
+    }
+
 @app.route('/api/current', methods=['GET'])
 def get_current_data():
     """현재 센서 데이터 조회 (센서 상태 포함)"""
-    global sensor_manager
+    global sensor_manager, acquisition_thread
     
     try:
+        # 수집 스레드의 최신 스냅샷 사용 (미리 직렬화된 바이트 그대로 전송)
+        snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+        if snapshot:
+            etag = snapshot_etag('current', snapshot)
+            cached = not_modified_response(etag)
+            if cached:
+                return cached
+            return json_bytes_response(snapshot.encode('current', build_current_payload), etag)
+        
         if sensor_manager:
-            # 실제 센서 데이터 읽기
+            # 첫 수집 전에는 직접 읽기
             sensor_data = sensor_manager.read_all_sensors()
-            
-            return jsonify({
-                'timestamp': sensor_data['timestamp'],
-                'temperature': sensor_data['temperature'],
-                'humidity': sensor_data['humidity'],
-                'light': sensor_data['light'],
-                'pressure': sensor_data['pressure'],  # BME688 절대압력 (hPa)
-                'differential_pressure': sensor_data['differential_pressure'],  # SDP810 차압 (Pa)
-                'vibration': sensor_data['vibration'],
-                'gas_resistance': sensor_data['gas_resistance'],
-                'air_quality': sensor_data['air_quality'],
-                'absolute_pressure': sensor_data['absolute_pressure'],
-                # SPS30 미세먼지 데이터 추가
-                'pm1': sensor_data.get('pm1'),
-                'pm25': sensor_data.get('pm25'),
-                'pm4': sensor_data.get('pm4'),
-                'pm10': sensor_data.get('pm10'),
-                'sensor_status': sensor_data['sensor_status']
-            })
+            return jsonify(build_current_payload(sensor_data))
         else:
             # 센서 매니저가 없을 때 기본 응답
             return jsonify({
@@ -155,7 +384,7 @@ def get_current_data_multi():
         if sensor_manager:
             # 멀티 센서 데이터 읽기
             sensor_data = sensor_manager.read_all_sensors_multi()
-            return jsonify(sensor_data)
+            return json_bytes_response(dumps_bytes(sensor_data))
         else:
             # 센서 매니저가 없을 때 기본 응답
             return jsonify({
@@ -194,10 +423,282 @@ def get_current_data_multi():
             'error': str(e)
         })
 
+@app.route('/api/current-multi/<sensor_id>', methods=['GET'])
+def get_current_data_multi_sensor(sensor_id):
+    """멀티 센서 ID로 센서 1개 데이터 조회 (예: sht40_1)"""
+    global sensor_manager
+    
+    if not sensor_manager:
+        return jsonify({'error': '센서 매니저가 초기화되지 않음'}), 500
+    
+    try:
+        entry = sensor_manager.read_sensor_by_id(sensor_id)
+        if entry is None:
+            return jsonify({'error': f'센서를 찾을 수 없음: {sensor_id}'}), 404
+        return json_bytes_response(dumps_bytes(entry))
+    
+    except Exception as e:
+        return jsonify({
+            'error': f'센서 데이터 읽기 실패: {e}',
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }), 500
+
+def build_stream_payload(snapshot):
+    """전체 스냅샷 스트림 프레임 (통계/이상 탐지/알림 이벤트 제외)"""
+    return {key: value for key, value in snapshot.items() if key not in STREAM_EXCLUDED_FIELDS}
+
+def format_sse_snapshot(snapshot):
+    """스냅샷을 SSE 이벤트 바이트로 변환 (스냅샷 직렬화는 1회만 수행)"""
+    return b"id: %d\nevent: snapshot\ndata: %s\n\n" % (
+        snapshot['seq'], snapshot.encode('stream', build_stream_payload))
+
+def build_keyframe_payload(snapshot):
+    """델타 스트림 키프레임 (표시 자릿수로 반올림한 전체 값)"""
+    payload = round_payload(build_current_payload(snapshot))
+    payload['seq'] = snapshot['seq']
+    return payload
+
+def build_delta_payload(snapshot):
+    """델타 스트림 프레임 (직전 스냅샷 대비 바뀐 채널/상태만)"""
+    previous = snapshot.previous
+    current = round_payload(build_current_payload(snapshot))
+    return {
+        'seq': snapshot['seq'],
+        'prev_seq': previous['seq'] if previous else None,
+        'changes': diff_payload(round_payload(build_current_payload(previous)) if previous else None, current)
+    }
+
+def format_sse_frame(snapshot, last_seq, delta_mode):
+    """스트림 모드에 맞는 SSE 이벤트 생성 (델타 모드는 연속된 순번일 때만 델타 전송)"""
+    if not delta_mode:
+        return format_sse_snapshot(snapshot)
+    
+    if last_seq and snapshot['seq'] == last_seq + 1:
+        return b"id: %d\nevent: delta\ndata: %s\n\n" % (
+            snapshot['seq'], snapshot.encode('delta', build_delta_payload))
+    
+    # 접속 직후 또는 큐에서 스냅샷이 폐기된 경우 키프레임으로 재동기화
+    return b"id: %d\nevent: keyframe\ndata: %s\n\n" % (
+        snapshot['seq'], snapshot.encode('keyframe', build_keyframe_payload))
+
+@app.route('/api/stream', methods=['GET'])
+def stream_sensor_data():
+    """
+    센서 스냅샷 SSE 스트림 (수집할 때마다 한 번씩 푸시)
+    
+    mode=delta: 접속 시 키프레임 1회, 이후 바뀐 채널만 전송 (순번으로 누락 감지)
+    """
+    global acquisition_thread
+    
+    delta_mode = request.args.get('mode') == 'delta'
+    subscription = snapshot_broadcaster.subscribe()
+    
+    def generate():
+        try:
+            last_seq = 0
+            
+            # 접속 직후 최신 스냅샷 즉시 전송
+            latest = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+            if latest:
+                yield format_sse_frame(latest, last_seq, delta_mode)
+                last_seq = latest['seq']
+            
+            while True:
+                snapshots = subscription.get(timeout=STREAM_KEEPALIVE_INTERVAL)
+                if subscription.closed:
+                    break
+                if not snapshots:
+                    yield b': keep-alive\n\n'
+                    continue
+                for snapshot in snapshots:
+                    # 접속 시 이미 보낸 스냅샷은 건너뜀
+                    if snapshot['seq'] <= last_seq:
+                        continue
+                    yield format_sse_frame(snapshot, last_seq, delta_mode)
+                    last_seq = snapshot['seq']
+        finally:
+            subscription.close()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/alerts', methods=['GET'])
+def get_alerts():
+    """알림 규칙 상태, 활성 알림, 최근 이벤트 (?limit=N)"""
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'limit은 정수여야 합니다'}), 400
+    
+    if not alert_engine:
+        # 웹 워커 모드: 수집 데몬이 스냅샷에 기록한 활성 알림과 최근 이벤트 제공 (규칙 상태는 데몬에만 있음)
+        snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+        if not snapshot or 'alert_events' not in snapshot:
+            return jsonify({'success': True, 'enabled': False, 'active': []})
+        return jsonify({
+            'success': True,
+            'enabled': True,
+            'source': 'daemon',
+            'active': snapshot.get('alerts', []),
+            'events': snapshot['alert_events'][-max(limit, 1):]
+        })
+    
+    return jsonify({
+        'success': True,
+        'enabled': True,
+        'status': alert_engine.get_status(),
+        'rules': alert_engine.get_rules(),
+        'active': [rule for rule in alert_engine.get_rules() if rule['state'] in ('firing', 'clearing')],
+        'events': alert_engine.get_recent_events(max(limit, 1))
+    })
+
+@app.route('/api/anomaly', methods=['GET'])
+def get_anomaly():
+    """채널별 이상 점수와 플래그 (fault: 센서 고장 의심, event: 실제 변화)"""
+    snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+    response = {
+        'success': True,
+        'seq': snapshot['seq'] if snapshot else None,
+        'channels': snapshot.get('anomaly', {}) if snapshot else {}
+    }
+    if anomaly_detector:
+        response['flag_counts'] = anomaly_detector.get_status()['flag_counts']
+    return jsonify(response)
+
+@app.route('/api/derived', methods=['GET'])
+def get_derived_channels():
+    """파생 채널 정의와 현재 값 (?history=N: 공유 메모리 링 버퍼의 최근 N개 샘플로 백필)"""
+    if not derived_engine:
+        return jsonify({'success': True, 'enabled': False, 'channels': []})
+    
+    try:
+        history = int(request.args.get('history', 0))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'history는 정수여야 합니다'}), 400
+    
+    snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+    channels = derived_engine.get_channels()
+    for channel in channels:
+        channel['value'] = snapshot.get(channel['name']) if snapshot else None
+    response = {'success': True, 'enabled': True, 'channels': channels, 'status': derived_engine.get_status()}
+    
+    if history > 0:
+        reader = getattr(acquisition_thread, 'reader', None)
+        if reader is None:
+            return jsonify({'success': False, 'message': '백필은 공유 메모리(shm) 전송 모드에서만 지원됩니다'}), 400
+        try:
+            response['history'] = derived_engine.backfill_from_reader(reader, history)
+        except (RuntimeError, ValueError) as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+    
+    return jsonify(response)
+
+@app.route('/api/iaq', methods=['GET'])
+def get_iaq():
+    """BME688 IAQ 추정 상태 (번인 진행, 가스 기준선, 현재 점수)"""
+    if iaq_estimator:
+        return jsonify({'success': True, 'enabled': True, **iaq_estimator.get_status()})
+    
+    # 웹 워커 모드: 수집 데몬이 스냅샷에 기록한 값만 제공
+    snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+    return jsonify({'success': True, 'enabled': False,
+                    'status': snapshot.get('iaq_status') if snapshot else None,
+                    'air_quality': snapshot.get('air_quality') if snapshot else None,
+                    'iaq': snapshot.get('iaq') if snapshot else None})
+
+@app.route('/api/stats', methods=['GET'])
+def get_rolling_stats():
+    """채널별 롤링 통계 (?window=1m|15m|1h|24h, ?channel=이름으로 필터)"""
+    window = request.args.get('window')
+    channel = request.args.get('channel')
+    
+    if rolling_stats:
+        stats = rolling_stats.get_stats(window, channel)
+    else:
+        # 웹 워커 모드: 수집 데몬이 스냅샷에 기록한 통계 사용
+        snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+        embedded = (snapshot.get('stats') if snapshot else None) or {}
+        stats = {name: {channel_name: values for channel_name, values in channels.items()
+                        if not channel or channel_name == channel}
+                 for name, channels in embedded.items() if not window or name == window}
+    
+    if window and window not in stats:
+        return jsonify({'success': False, 'message': f'알 수 없는 윈도우: {window}'}), 404
+    return jsonify({'success': True, 'fields': list(STAT_FIELDS), 'stats': stats})
+
+@app.route('/api/filters', methods=['GET'])
+def get_filters():
+    """채널별 잡음 필터 설정 (?history=N: 공유 메모리 링 버퍼의 원본 이력으로 필터 결과 백필)"""
+    if not filter_stage:
+        return jsonify({'success': True, 'enabled': False, 'filters': {}})
+    
+    try:
+        history = int(request.args.get('history', 0))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'history는 정수여야 합니다'}), 400
+    
+    response = {'success': True, 'enabled': True, **filter_stage.get_status()}
+    if history > 0:
+        reader = getattr(acquisition_thread, 'reader', None)
+        if reader is None:
+            return jsonify({'success': False, 'message': '백필은 공유 메모리(shm) 전송 모드에서만 지원됩니다'}), 400
+        try:
+            response['history'] = filter_stage.backfill_from_reader(reader, history)
+        except (RuntimeError, ValueError) as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+    
+    return jsonify(response)
+
+@app.route('/api/alerts/stream', methods=['GET'])
+def stream_alerts():
+    """알림 발생/해제 이벤트 SSE 스트림 (event: alert)"""
+    subscription = alert_broadcaster.subscribe()
+    
+    def generate():
+        try:
+            while True:
+                events = subscription.get(timeout=STREAM_KEEPALIVE_INTERVAL)
+                if subscription.closed:
+                    break
+                if not events:
+                    yield b': keep-alive\n\n'
+                    continue
+                for event in events:
+                    yield b"id: %d\nevent: alert\ndata: %s\n\n" % (event['id'], dumps_bytes(event))
+        finally:
+            subscription.close()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/status', methods=['GET'])
 def get_sensor_status():
     """센서 연결 상태"""
-    global sensor_manager
+    global sensor_manager, acquisition_thread
+    
+    # 연결 상태가 마지막으로 바뀐 스냅샷 기준으로 응답 (같은 ETag = 같은 본문)
+    snapshot = acquisition_thread.get_status_snapshot() if acquisition_thread else None
+    if snapshot:
+        etag = snapshot_etag('status', snapshot)
+        cached = not_modified_response(etag)
+        if cached:
+            return cached
+        
+        sensor_status = snapshot['sensor_status']
+        return tagged_json({
+            'connected': True,
+            'bme688': sensor_status['bme688'],
+            'bh1750': sensor_status['bh1750'],
+            'sht40': sensor_status['sht40'],
+            'sdp810': sensor_status.get('sdp810', False),
+            'sps30': sensor_status.get('sps30', False),
+            'total_sensors': sum(1 for connected in sensor_status.values() if connected),
+            'timestamp': snapshot['timestamp']
+        }, etag)
     
     if sensor_manager:
         status = sensor_manager.get_sensor_status()
@@ -236,8 +737,14 @@ def get_sensors():
         return jsonify({'error': '데이터베이스가 초기화되지 않음'}), 500
     
     try:
+        # 센서 레지스트리 내용 지문을 ETag로 사용 (다른 프로세스의 DB 변경을 먼저 반영, 워커 간 공통)
+        etag = make_etag('sensors', sensor_db.registry_fingerprint(), shared=True)
+        cached = not_modified_response(etag)
+        if cached:
+            return cached
+        
         sensors = sensor_db.get_all_sensors()
-        return jsonify(sensors)
+        return tagged_json(sensors, etag)
     except Exception as e:
         return jsonify({'error': f'센서 목록 조회 실패: {e}'}), 500
 
@@ -250,8 +757,7 @@ def get_sensor(sensor_id):
         return jsonify({'error': '데이터베이스가 초기화되지 않음'}), 500
     
     try:
-        sensors = sensor_db.get_all_sensors()
-        sensor = next((s for s in sensors if s['id'] == sensor_id), None)
+        sensor = sensor_db.get_sensor_by_id(sensor_id)
         
         if sensor:
             return jsonify(sensor)
@@ -339,11 +845,20 @@ def delete_sensor(sensor_id):
     except Exception as e:
         return jsonify({'success': False, 'message': f'센서 삭제 실패: {e}'}), 500
 
+def scan_unavailable_in_worker():
+    """웹 워커 모드의 센서 검색 요청 응답 (503)"""
+    return jsonify({
+        'success': False,
+        'message': '멀티 프로세스 배포에서는 센서 검색을 지원하지 않습니다 (I2C 버스는 수집 데몬이 사용 중)'
+    }), 503
+
 @app.route('/api/i2c/scan', methods=['POST'])
 def scan_i2c():
     """I2C 디바이스 스캔"""
     global i2c_scanner, sensor_db
     
+    if web_worker:
+        return scan_unavailable_in_worker()
     if not i2c_scanner:
         return jsonify({'success': False, 'message': 'I2C 스캐너가 초기화되지 않음'}), 500
     
@@ -353,8 +868,7 @@ def scan_i2c():
         if result:
             # 스캔 결과를 데이터베이스에 저장
             if sensor_db:
-                for bus_num, addresses in result['buses'].items():
-                    sensor_db.add_scan_result(int(bus_num), addresses)
+                sensor_db.add_scan_results(result['buses'])
             
             return jsonify({
                 'success': True,
@@ -378,6 +892,8 @@ def test_i2c_device():
     """I2C 디바이스 테스트"""
     global i2c_scanner
     
+    if web_worker:
+        return scan_unavailable_in_worker()
     if not i2c_scanner:
         return jsonify({'success': False, 'message': 'I2C 스캐너가 초기화되지 않음'}), 500
     
@@ -408,6 +924,9 @@ def scan_all_sensors():
     """통합 센서 검색 (I2C + UART)"""
     global i2c_scanner, sensor_manager
     
+    if web_worker:
+        return scan_unavailable_in_worker()
+    
     try:
         results = {
             'i2c_devices': [],
@@ -498,6 +1017,8 @@ def cleanup_duplicate_sensors():
             deleted_count = cursor.rowcount
             conn.commit()
             
+            sensor_db.invalidate_registry()
+            
             return jsonify({
                 'success': True,
                 'message': f'{deleted_count}개의 중복 센서가 정리되었습니다'
@@ -534,6 +1055,23 @@ def rescan_sensors():
             'message': f'센서 재검색 실패: {e}'
         }), 500
 
+def require_debug_token(view):
+    """디버그 엔드포인트 인증 (EGDASH_DEBUG_TOKEN 미설정 시 비활성)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = os.environ.get('EGDASH_DEBUG_TOKEN', '')
+        if not expected:
+            return jsonify({'success': False, 'message': '디버그 토큰(EGDASH_DEBUG_TOKEN)이 설정되지 않아 비활성화됨'}), 403
+        
+        provided = request.headers.get('X-Debug-Token', '')
+        authorization = request.headers.get('Authorization', '')
+        if not provided and authorization.startswith('Bearer '):
+            provided = authorization[len('Bearer '):]
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return jsonify({'success': False, 'message': '디버그 토큰이 올바르지 않습니다'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
 @app.route('/api/debug/sps30', methods=['GET'])
 def debug_sps30():
     """SPS30 백그라운드 스레드 디버깅 정보"""
@@ -565,78 +1103,232 @@ def debug_sps30():
     
     return jsonify(debug_info)
 
+@app.route('/api/debug/trace', methods=['GET'])
+@require_debug_token
+def export_trace():
+    """트레이서 링 버퍼를 Chrome Trace Event JSON으로 내보내기 (Perfetto / chrome://tracing)"""
+    response = json_bytes_response(dumps_bytes(TRACER.export_chrome_trace()))
+    response.headers['Content-Disposition'] = 'attachment; filename=egdash-trace.json'
+    return response
+
+@app.route('/api/debug/trace', methods=['POST'])
+@require_debug_token
+def configure_trace():
+    """트레이서 설정 변경 ({"enabled": true, "capacity": 50000, "clear": true}, capacity는 tracer.MAX_TRACE_CAPACITY까지)"""
+    options = request.get_json(silent=True) or {}
+    
+    enabled = options.get('enabled')
+    capacity = options.get('capacity')
+    if enabled is not None and not isinstance(enabled, bool):
+        return jsonify({'success': False, 'message': 'enabled는 true/false여야 합니다'}), 400
+    if capacity is not None and (not isinstance(capacity, int) or isinstance(capacity, bool) or capacity <= 0):
+        return jsonify({'success': False, 'message': 'capacity는 양의 정수여야 합니다'}), 400
+    
+    TRACER.configure(enabled=enabled, capacity=capacity, clear=bool(options.get('clear', False)))
+    print(f"🔍 트레이서 설정 변경: {TRACER.get_status()}")
+    return jsonify({'success': True, 'trace': TRACER.get_status()})
+
+@app.route('/api/debug/profile', methods=['GET'])
+@require_debug_token
+def profile_threads():
+    """
+    전체 스레드 샘플링 프로파일 (?seconds=N, 기본 5초)
+    
+    format=collapsed (기본): flame graph용 collapsed stack 텍스트
+    format=json: 스레드별 샘플 수, 상위 self 프레임, collapsed 스택
+    """
+    try:
+        seconds = float(request.args.get('seconds', 5))
+        interval_ms = float(request.args.get('interval_ms', PROFILER.interval * 1000))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'seconds/interval_ms는 숫자여야 합니다'}), 400
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or not 1 <= interval_ms <= 1000:
+        return jsonify({'success': False,
+                        'message': f'seconds는 0~{MAX_PROFILE_SECONDS}, interval_ms는 1~1000 범위여야 합니다'}), 400
+    
+    output_format = request.args.get('format', 'collapsed')
+    if output_format not in ('collapsed', 'json'):
+        return jsonify({'success': False, 'message': 'format은 collapsed 또는 json이어야 합니다'}), 400
+    
+    print(f"🔬 샘플링 프로파일 시작 ({seconds}초, {interval_ms}ms 간격)")
+    result = PROFILER.profile(seconds, interval_ms / 1000.0)
+    if result is None:
+        return jsonify({'success': False, 'message': '다른 프로파일이 실행 중입니다'}), 409
+    print(f"🔬 샘플링 프로파일 완료 ({result['sample_count']}회 샘플)")
+    
+    if output_format == 'json':
+        return jsonify({
+            'success': True,
+            'duration': round(result['duration'], 3),
+            'interval': result['interval'],
+            'sample_count': result['sample_count'],
+            'thread_samples': result['thread_samples'],
+            'top_frames': PROFILER.top_frames(result),
+            'stacks': dict(result['stacks'].most_common())
+        })
+    
+    response = Response(PROFILER.format_collapsed(result), mimetype='text/plain')
+    response.headers['Content-Disposition'] = 'attachment; filename=egdash-profile.collapsed'
+    return response
+
+@app.route('/api/debug/memory', methods=['GET'])
+@require_debug_token
+def debug_memory():
+    """메모리 계측 정보 (현재 측정값, 기록(?limit=N), RSS 증가율, tracemalloc 상태)"""
+    try:
+        limit = int(request.args.get('limit', 60))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'limit은 정수여야 합니다'}), 400
+    
+    return jsonify({
+        'success': True,
+        'current': memory_monitor.sample(record_history=False),
+        'status': memory_monitor.get_status(),
+        'history': memory_monitor.get_history(max(limit, 1))
+    })
+
+@app.route('/api/debug/memory/tracemalloc', methods=['POST'])
+@require_debug_token
+def debug_tracemalloc():
+    """
+    tracemalloc 제어 ({"action": "start" | "diff" | "stop"})
+    
+    start: 추적 시작 및 기준 스냅샷 저장 (frames: 트레이스백 깊이, 기본 10)
+    diff: 직전 스냅샷 대비 증가 상위 항목 (limit: 기본 20, key_type: lineno/filename/traceback)
+    stop: 추적 중지
+    """
+    options = request.get_json(silent=True) or {}
+    action = options.get('action')
+    
+    if action == 'start':
+        frames = options.get('frames', 10)
+        if not isinstance(frames, int) or not 1 <= frames <= 100:
+            return jsonify({'success': False, 'message': 'frames는 1~100 범위의 정수여야 합니다'}), 400
+        return jsonify({'success': True, 'tracemalloc': memory_monitor.start_tracemalloc(frames)})
+    
+    if action == 'stop':
+        return jsonify({'success': True, 'tracemalloc': memory_monitor.stop_tracemalloc()})
+    
+    if action == 'diff':
+        limit = options.get('limit', 20)
+        key_type = options.get('key_type', 'lineno')
+        if not isinstance(limit, int) or limit <= 0 or key_type not in ('lineno', 'filename', 'traceback'):
+            return jsonify({'success': False, 'message': 'limit은 양의 정수, key_type은 lineno/filename/traceback이어야 합니다'}), 400
+        diff = memory_monitor.diff_tracemalloc(limit, key_type)
+        if diff is None:
+            return jsonify({'success': False, 'message': 'tracemalloc이 시작되지 않았습니다 (action: start 먼저 호출)'}), 409
+        return jsonify({'success': True, 'diff': diff, 'tracemalloc': memory_monitor.get_tracemalloc_status()})
+    
+    return jsonify({'success': False, 'message': 'action은 start, diff, stop 중 하나여야 합니다'}), 400
+
 # ============================
 # 개별 센서 데이터 API 엔드포인트 (404 오류 해결)
 # ============================
 
+# 센서 타입별 측정 채널
+SENSOR_CHANNELS = {
+    'bme688': ('temperature', 'humidity', 'pressure', 'gas_resistance', 'air_quality'),
+    'sht40': ('temperature', 'humidity'),
+    'bh1750': ('light',),
+    'sdp810': ('differential_pressure',),
+    'sps30': ('pm1', 'pm25', 'pm4', 'pm10'),
+    'virtual': ('vibration',)
+}
+SENSOR_TYPES = tuple(SENSOR_CHANNELS)
+
+def build_sensor_payload(sensor_type, all_data):
+    """/api/current-sensor/<sensor_type> 응답 객체 생성"""
+    response_data = {
+        'timestamp': all_data['timestamp'],
+        'connected': False,
+        'value': None,
+        'unit': '',
+        'sensor_type': sensor_type
+    }
+    
+    if sensor_type == 'bme688':
+        response_data.update({
+            'connected': all_data['sensor_status'].get('bme688', False),
+            'temperature': all_data.get('temperature'),
+            'humidity': all_data.get('humidity'),
+            'pressure': all_data.get('pressure'),
+            'gas_resistance': all_data.get('gas_resistance'),
+            'air_quality': all_data.get('air_quality')
+        })
+    elif sensor_type == 'sht40':
+        response_data.update({
+            'connected': all_data['sensor_status'].get('sht40', False),
+            'temperature': all_data.get('temperature'),
+            'humidity': all_data.get('humidity')
+        })
+    elif sensor_type == 'bh1750':
+        response_data.update({
+            'connected': all_data['sensor_status'].get('bh1750', False),
+            'light': all_data.get('light'),
+            'unit': 'lux'
+        })
+    elif sensor_type == 'sdp810':
+        response_data.update({
+            'connected': all_data['sensor_status'].get('sdp810', False),
+            'differential_pressure': all_data.get('differential_pressure'),
+            'unit': 'Pa'
+        })
+    elif sensor_type == 'sps30':
+        response_data.update({
+            'connected': all_data['sensor_status'].get('sps30', False),
+            'pm1': all_data.get('pm1'),
+            'pm25': all_data.get('pm25'),
+            'pm4': all_data.get('pm4'),
+            'pm10': all_data.get('pm10'),
+            'unit': 'μg/m³'
+        })
+    elif sensor_type == 'virtual':
+        # 가상 센서 또는 계산된 값들
+        response_data.update({
+            'connected': True,
+            'vibration': all_data.get('vibration', 0.0),
+            'unit': 'various'
+        })
+    
+    return response_data
+
 @app.route('/api/current-sensor/<sensor_type>', methods=['GET'])
 def get_current_sensor_data(sensor_type):
     """개별 센서 데이터 조회"""
-    global sensor_manager
+    global sensor_manager, acquisition_thread
     
-    if not sensor_manager:
+    if not (sensor_manager or acquisition_thread):
         return jsonify({'error': '센서 매니저가 초기화되지 않음', 'connected': False}), 500
     
+    if sensor_type not in SENSOR_TYPES:
+        return jsonify({'error': f'알 수 없는 센서 타입: {sensor_type}'}), 400
+    
+    # fresh=1 이면 스냅샷 대신 해당 센서만 즉시 읽기 (센서를 직접 점유한 프로세스만 가능)
+    fresh = sensor_manager is not None and request.args.get('fresh', '').lower() in ('1', 'true', 'yes')
+    
     try:
-        # 전체 센서 데이터 읽기
-        all_data = sensor_manager.read_all_sensors()
+        # 수집 스레드의 최신 스냅샷에서 센서 타입별 응답 (타입별 1회만 직렬화)
+        snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread and not fresh else None
+        if snapshot:
+            etag = snapshot_etag(f'sensor-{sensor_type}', snapshot)
+            cached = not_modified_response(etag)
+            if cached:
+                return cached
+            body = snapshot.encode(f'sensor:{sensor_type}',
+                                   lambda data: build_sensor_payload(sensor_type, data))
+            return json_bytes_response(body, etag)
         
-        # 센서 타입별 데이터 반환
-        response_data = {
-            'timestamp': all_data['timestamp'],
-            'connected': False,
-            'value': None,
-            'unit': '',
-            'sensor_type': sensor_type
-        }
+        if not sensor_manager:
+            return jsonify({'error': '수집 데몬 스냅샷 대기 중', 'connected': False, 'sensor_type': sensor_type}), 503
         
-        if sensor_type == 'bme688':
-            response_data.update({
-                'connected': all_data['sensor_status'].get('bme688', False),
-                'temperature': all_data.get('temperature'),
-                'humidity': all_data.get('humidity'),
-                'pressure': all_data.get('pressure'),
-                'gas_resistance': all_data.get('gas_resistance'),
-                'air_quality': all_data.get('air_quality')
-            })
-        elif sensor_type == 'sht40':
-            response_data.update({
-                'connected': all_data['sensor_status'].get('sht40', False),
-                'temperature': all_data.get('temperature'),
-                'humidity': all_data.get('humidity')
-            })
-        elif sensor_type == 'bh1750':
-            response_data.update({
-                'connected': all_data['sensor_status'].get('bh1750', False),
-                'light': all_data.get('light'),
-                'unit': 'lux'
-            })
-        elif sensor_type == 'sdp810':
-            response_data.update({
-                'connected': all_data['sensor_status'].get('sdp810', False),
-                'differential_pressure': all_data.get('differential_pressure'),
-                'unit': 'Pa'
-            })
-        elif sensor_type == 'sps30':
-            response_data.update({
-                'connected': all_data['sensor_status'].get('sps30', False),
-                'pm1': all_data.get('pm1'),
-                'pm25': all_data.get('pm25'),
-                'pm4': all_data.get('pm4'),
-                'pm10': all_data.get('pm10'),
-                'unit': 'μg/m³'
-            })
-        elif sensor_type == 'virtual':
-            # 가상 센서 또는 계산된 값들
-            response_data.update({
-                'connected': True,
-                'vibration': all_data.get('vibration', 0.0),
-                'unit': 'various'
-            })
-        else:
-            return jsonify({'error': f'알 수 없는 센서 타입: {sensor_type}'}), 400
+        # 첫 수집 전이거나 fresh 요청이면 요청한 센서만 읽기 (BME688만 SHT40을 함께 읽음)
+        sensor_data = sensor_manager.read_sensor_type(sensor_type)
         
-        return jsonify(response_data)
+        # 스냅샷 처리기가 계산하는 채널(IAQ 추정기의 air_quality)은 최신 스냅샷 값 사용 (같은 센서가 경로마다 다른 값을 내지 않도록)
+        latest = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+        if latest and sensor_type == 'bme688' and 'iaq_status' in latest:
+            sensor_data['air_quality'] = latest.get('air_quality')
+        return jsonify(build_sensor_payload(sensor_type, sensor_data))
         
     except Exception as e:
         return jsonify({
@@ -646,6 +1338,214 @@ def get_current_sensor_data(sensor_type):
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }), 500
 
+def parse_dashboard_fields(fields_param):
+    """
+    fields= 파라미터를 센서 타입별 채널 목록으로 변환
+    
+    항목 형식: 'sht40' (센서 전체), 'sps30.pm25' (센서 채널), 'temperature' (모든 센서의 해당 채널)
+    
+    Returns:
+        Dict[str, tuple]: 센서 타입별 선택 채널 (fields 미지정 시 전체)
+    
+    Raises:
+        ValueError: 알 수 없는 센서 타입 또는 채널
+    """
+    if not fields_param:
+        return dict(SENSOR_CHANNELS)
+    
+    selected = {}
+    for field in fields_param.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        
+        if field in SENSOR_CHANNELS:
+            sensor_type, channels = field, SENSOR_CHANNELS[field]
+            selected[sensor_type] = channels
+            continue
+        
+        if '.' in field:
+            sensor_type, channel = field.split('.', 1)
+            if channel not in SENSOR_CHANNELS.get(sensor_type, ()):
+                raise ValueError(f'알 수 없는 필드: {field}')
+            matches = [sensor_type]
+        else:
+            channel = field
+            matches = [t for t, channels in SENSOR_CHANNELS.items() if channel in channels]
+            if not matches:
+                raise ValueError(f'알 수 없는 필드: {field}')
+        
+        for sensor_type in matches:
+            current = selected.get(sensor_type, ())
+            if channel not in current:
+                selected[sensor_type] = current + (channel,)
+    
+    return selected
+
+def build_dashboard_payload(sensor_data, selected, sample_age):
+    """/api/dashboard 응답 객체 생성 (연결된 센서의 선택 채널만 포함)"""
+    sensor_status = sensor_data['sensor_status']
+    sensors = {}
+    
+    for sensor_type, channels in selected.items():
+        connected = sensor_type == 'virtual' or sensor_status.get(sensor_type, False)
+        if not connected:
+            continue
+        sensors[sensor_type] = {channel: sensor_data.get(channel) for channel in channels}
+    
+    return {
+        'timestamp': sensor_data['timestamp'],
+        'seq': sensor_data.get('seq'),
+        'sample_age_seconds': sample_age,
+        'sensor_status': sensor_status,
+        'sensors': sensors
+    }
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard_data():
+    """대시보드용 통합 데이터 조회 (연결된 센서 값 + 상태 + 샘플 경과 시간을 한 번에)"""
+    global sensor_manager, acquisition_thread
+    
+    if not (sensor_manager or acquisition_thread):
+        return jsonify({'error': '센서 매니저가 초기화되지 않음'}), 500
+    
+    try:
+        selected = parse_dashboard_fields(request.args.get('fields', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # 수집 스레드의 최신 스냅샷 사용 (센서를 다시 읽지 않음)
+        snapshot = acquisition_thread.get_latest_snapshot() if acquisition_thread else None
+        if snapshot:
+            sample_age = round(time.time() - snapshot['acquired_at'], 3)
+            return json_bytes_response(dumps_bytes(build_dashboard_payload(snapshot, selected, sample_age)))
+        
+        if not sensor_manager:
+            return jsonify({'error': '수집 데몬 스냅샷 대기 중'}), 503
+        
+        # 첫 수집 전에는 직접 읽기
+        sensor_data = sensor_manager.read_all_sensors()
+        return json_bytes_response(dumps_bytes(build_dashboard_payload(sensor_data, selected, 0.0)))
+    
+    except Exception as e:
+        return jsonify({
+            'error': f'대시보드 데이터 읽기 실패: {e}',
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }), 500
+
+# ============================
+# 메트릭 (Prometheus 텍스트 형식)
+# ============================
+
+@app.before_request
+def start_request_timer():
+    """요청 처리 시작 시각 기록"""
+    g.request_start = time.perf_counter_ns()
+
+@app.after_request
+def record_request_latency(response):
+    """라우트별 HTTP 요청 처리 시간 기록 (SSE는 응답 시작까지)"""
+    start = g.pop('request_start', None)
+    if start is not None:
+        end = time.perf_counter_ns()
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe((end - start) / 1e9, route=route,
+                                     method=request.method, status=response.status_code)
+        TRACER.record_complete(f'{request.method} {route}', 'http', start, end,
+                               {'status': response.status_code})
+    return response
+
+def collect_runtime_metrics():
+    """스크레이프 시점 메트릭 수집 (스냅샷 상태, 드라이버 카운터, SPS30, 프로세스)"""
+    families = []
+    
+    if acquisition_thread:
+        status = acquisition_thread.get_status()
+        families.append(('egdash_snapshot_age_seconds', 'gauge', '최신 스냅샷 경과 시간',
+                         [({}, status['snapshot_age_seconds'])]))
+        families.append(('egdash_snapshot_seq', 'gauge', '최신 스냅샷 순번',
+                         [({}, status['seq'])]))
+        families.append(('egdash_acquisition_errors_total', 'counter', '수집 스레드 오류 횟수',
+                         [({}, status['error_count'])]))
+        
+        snapshot = acquisition_thread.get_latest_snapshot()
+        if snapshot:
+            families.append(('egdash_sensor_connected', 'gauge', '센서 연결 상태 (1=연결)',
+                             [({'sensor': sensor}, connected)
+                              for sensor, connected in snapshot['sensor_status'].items()]))
+            
+            # 이상 점수는 스냅샷에서 읽음 (웹 워커 모드에서도 수집 데몬 결과 노출)
+            anomaly = snapshot.get('anomaly')
+            if anomaly:
+                families.append(('egdash_anomaly_score', 'gauge', '채널별 이상 점수 (method=ewma|robust)',
+                                 [({'channel': channel, 'method': method}, scores[key])
+                                  for channel, scores in anomaly.items()
+                                  for method, key in (('ewma', 'z'), ('robust', 'robust_z'))
+                                  if scores[key] is not None]))
+                families.append(('egdash_anomaly_flag', 'gauge', '채널별 현재 이상 플래그 (1=활성)',
+                                 [({'channel': channel, 'flag': flag}, 1)
+                                  for channel, scores in anomaly.items() for flag in scores['flags']]))
+    
+    if sensor_manager:
+        driver_stats = sensor_manager.get_driver_stats()
+        for key, name, metric_type, documentation in (
+                ('error_count', 'egdash_sensor_driver_errors', 'gauge', '드라이버 오류 카운트 (성공 시 감소/리셋)'),
+                ('retry_count', 'egdash_sensor_driver_retries_total', 'counter', '드라이버 재시도 횟수'),
+                ('crc_error_count', 'egdash_sensor_driver_crc_errors_total', 'counter', '드라이버 CRC 검증 실패 횟수')):
+            samples = [({'sensor': stat['sensor'], 'id': stat['id'], 'bus': stat['bus']}, stat[key])
+                       for stat in driver_stats if stat[key] is not None]
+            if samples:
+                families.append((name, metric_type, documentation, samples))
+        
+        if sensor_manager.sps30_background:
+            sps30 = sensor_manager.sps30_background.get_status()
+            families.append(('egdash_sps30_reads_total', 'counter', 'SPS30 백그라운드 측정 시도 횟수',
+                             [({}, sps30['total_reads'])]))
+            families.append(('egdash_sps30_consecutive_errors', 'gauge', 'SPS30 연속 실패 횟수',
+                             [({}, sps30['error_count'])]))
+            families.append(('egdash_sps30_success_rate_percent', 'gauge', 'SPS30 측정 성공률 (%)',
+                             [({}, sps30['success_rate'])]))
+    
+    if iaq_estimator:
+        iaq = iaq_estimator.get_status()
+        families.append(('egdash_iaq_burn_in_complete', 'gauge', 'BME688 번인 완료 여부 (1=완료)',
+                         [({}, iaq['burn_in_complete'])]))
+        if iaq['gas_baseline'] is not None:
+            families.append(('egdash_iaq_gas_baseline_ohms', 'gauge', '습도 보정 가스 저항 기준선 (Ω)',
+                             [({}, iaq['gas_baseline'])]))
+    
+    if alert_engine:
+        families.append(('egdash_alert_active', 'gauge', '알림 규칙 활성 상태 (1=발생 중)',
+                         [({'rule': rule['name'], 'severity': rule['severity']},
+                           rule['state'] in ('firing', 'clearing'))
+                          for rule in alert_engine.get_rules()]))
+        families.append(('egdash_alert_dropped_total', 'counter', '큐가 가득 차 폐기된 알림 이벤트 수',
+                         [({}, alert_engine.dropped_count)]))
+    
+    broadcaster = snapshot_broadcaster.get_status()
+    families.append(('egdash_stream_subscribers', 'gauge', 'SSE 스트림 구독자 수',
+                     [({}, broadcaster['subscriber_count'])]))
+    families.append(('egdash_stream_published_total', 'counter', 'SSE 스트림 발행 스냅샷 수',
+                     [({}, broadcaster['published_count'])]))
+    memory = read_process_memory()
+    families.append(('process_resident_memory_bytes', 'gauge', '프로세스 RSS (바이트)',
+                     [({}, memory['rss_bytes'])]))
+    families.append(('egdash_process_unique_memory_bytes', 'gauge', '프로세스 USS (바이트, 공유 페이지 제외)',
+                     [({}, memory['uss_bytes'])]))
+    families.append(('process_open_fds', 'gauge', '열린 파일 디스크립터 수',
+                     [({}, count_open_fds())]))
+    families.append(('egdash_buffer_size', 'gauge', '서브시스템별 버퍼 크기 (항목 수 또는 바이트)',
+                     [({'buffer': name}, size) for name, size in memory_monitor.read_buffers().items()]))
+    return families
+
+REGISTRY.add_collector(collect_runtime_metrics)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus 스크레이프 엔드포인트"""
+    return Response(REGISTRY.render(), mimetype=None, content_type=METRICS_CONTENT_TYPE)
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'API 엔드포인트를 찾을 수 없음'}), 404
@@ -671,7 +1571,19 @@ if __name__ == '__main__':
     try:
         app.run(debug=False, host='0.0.0.0', port=5003, threaded=True)
     except KeyboardInterrupt:
+        pass
+    finally:
+        # werkzeug 개발 서버는 Ctrl+C를 직접 처리하고 정상 반환하므로 정리는 finally에서 수행
         print("\n서버 종료 중...")
+        if acquisition_thread:
+            acquisition_thread.stop()
+        if alert_engine:
+            alert_engine.stop()
+        if iaq_estimator:
+            iaq_estimator.save_baseline()
+        memory_monitor.stop()
         if sensor_manager:
             sensor_manager.close_sensors()
+        if sensor_db:
+            sensor_db.close()
         print("서버가 정상적으로 종료되었습니다.")
\ No newline at end of file
@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+"""
+센서 하드웨어 에뮬레이터 (라즈베리파이 없이 드라이버 / SensorManager / API 실행)
+- FakeSMBus: smbus2.SMBus 호환 가짜 I2C 버스 (i2c_rdwr, byte/block 읽기·쓰기)
+- 레지스터 수준 장치 에뮬레이터: SHT40, BME688, BH1750, SDP810
+- FakeSps30Device: SPS30 SHDLC 장치 API 대체 (시리얼 포트 없이 SPS30BackgroundThread 구동)
+- 장치별 응답 지연, 측정값 노이즈, NACK(Remote I/O error), CRC 오류, BME688 변환 타임아웃 비율 설정
+
+사용 예:
+    manager = create_emulated_sensor_manager(seed=1, nack_rate=0.01)
+    manager.initialize_sensors()
+    print(manager.read_all_sensors())
+
+서버 실행: EGDASH_EMULATOR=1 python3 sensor_api_simple.py
+"""
+
+import os
+import math
+import time
+import errno
+import ctypes
+import random
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from smbus2.smbus2 import I2C_M_RD
+import constants as const
+
+
+def nack_error() -> OSError:
+    """장치 무응답(NACK) 시 i2c-dev가 돌려주는 것과 같은 오류"""
+    return OSError(errno.EREMOTEIO, os.strerror(errno.EREMOTEIO))
+
+
+def crc8(data) -> int:
+    """Sensirion CRC-8 (다항식 0x31, 초기값 0xFF)"""
+    crc = 0xFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x31) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+class Signal:
+    """측정값 파형 (기준값 + 느린 사인 변동 + 가우시안 노이즈)"""
+    
+    def __init__(self, base: float, noise: float = 0.0, amplitude: float = 0.0, period: float = 600.0):
+        self.base = base
+        self.noise = noise
+        self.amplitude = amplitude
+        self.period = period
+    
+    def sample(self, rng: random.Random) -> float:
+        value = self.base
+        if self.amplitude:
+            value += self.amplitude * math.sin(2 * math.pi * time.time() / self.period)
+        if self.noise:
+            value += rng.gauss(0.0, self.noise)
+        return value
+
+
+class I2CDeviceEmulator:
+    """I2C 장치 에뮬레이터 공통 기능 (트랜잭션 지연, NACK, CRC 오류 주입)"""
+    
+    name = 'i2c_device'
+    
+    def __init__(self, latency: float = 0.0, nack_rate: float = 0.0, crc_error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            latency: 트랜잭션마다 추가되는 지연 (초)
+            nack_rate: 트랜잭션 NACK 확률 (0~1)
+            crc_error_rate: 응답 CRC 손상 확률 (0~1, CRC가 있는 장치만)
+            seed: 노이즈/오류 주입 난수 시드 (재현용)
+        """
+        self.latency = latency
+        self.nack_rate = nack_rate
+        self.crc_error_rate = crc_error_rate
+        self.rng = random.Random(seed)
+        
+        self.transaction_count = 0
+        self.nack_count = 0
+        self.crc_fault_count = 0
+    
+    def _begin(self):
+        """트랜잭션 시작 (지연 및 NACK 주입)"""
+        self.transaction_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.nack_rate and self.rng.random() < self.nack_rate:
+            self.nack_count += 1
+            raise nack_error()
+    
+    def transfer_write(self, data: bytes):
+        self._begin()
+        self.write(data)
+    
+    def transfer_read(self, length: int) -> bytes:
+        self._begin()
+        data = bytes(self.read(length))
+        return data[:length].ljust(length, b'\xff')  # 장치가 보낼 것이 없으면 버스는 0xFF
+    
+    def write(self, data: bytes):
+        """장치로 쓰기 (하위 클래스 구현)"""
+    
+    def read(self, length: int) -> bytes:
+        """장치에서 읽기 (하위 클래스 구현)"""
+        return b''
+    
+    def _word_with_crc(self, word: int) -> bytes:
+        """16비트 워드 + CRC (crc_error_rate 확률로 CRC 손상)"""
+        data = bytes([(word >> 8) & 0xFF, word & 0xFF])
+        crc = crc8(data)
+        if self.crc_error_rate and self.rng.random() < self.crc_error_rate:
+            self.crc_fault_count += 1
+            crc ^= 0xFF
+        return data + bytes([crc])
+    
+    def get_status(self) -> Dict:
+        return {
+            'device': self.name,
+            'transaction_count': self.transaction_count,
+            'nack_count': self.nack_count,
+            'crc_fault_count': self.crc_fault_count
+        }
+
+
+class SHT40Emulator(I2CDeviceEmulator):
+    """SHT40 온습도센서 (측정 명령 → 변환 시간 경과 후 6바이트 + CRC)"""
+    
+    name = 'sht40'
+    
+    # 명령별 측정 시간 (초, 데이터시트 최대값)
+    MEASURE_COMMANDS = {0xFD: 0.0083, 0xF6: 0.0045, 0xE0: 0.0017}
+    CMD_SOFT_RESET = 0x94
+    CMD_READ_SERIAL = 0x89
+    
+    def __init__(self, temperature: Optional[Signal] = None, humidity: Optional[Signal] = None,
+                 serial_number: int = 0x0EC0FFEE, **options):
+        super().__init__(**options)
+        self.temperature = temperature or Signal(23.5, noise=0.05, amplitude=0.5)
+        self.humidity = humidity or Signal(45.0, noise=0.2, amplitude=2.0)
+        self.serial_number = serial_number
+        self._pending = None   # 'measure' 또는 'serial'
+        self._ready_at = 0.0
+    
+    def write(self, data: bytes):
+        command = data[0]
+        if command == self.CMD_SOFT_RESET:
+            self._pending = None
+        elif command in self.MEASURE_COMMANDS:
+            self._pending = 'measure'
+            self._ready_at = time.monotonic() + self.MEASURE_COMMANDS[command]
+        elif command == self.CMD_READ_SERIAL:
+            self._pending = 'serial'
+            self._ready_at = time.monotonic() + 0.001
+    
+    def read(self, length: int) -> bytes:
+        # 명령 없이 읽거나 변환 중에 읽으면 SHT40은 NACK
+        if self._pending is None or time.monotonic() < self._ready_at:
+            self.nack_count += 1
+            raise nack_error()
+        
+        pending, self._pending = self._pending, None
+        if pending == 'serial':
+            return self._word_with_crc(self.serial_number >> 16) + self._word_with_crc(self.serial_number & 0xFFFF)
+        
+        temperature = self.temperature.sample(self.rng)
+        humidity = self.humidity.sample(self.rng)
+        t_raw = int(round((temperature + 45.0) * 65535.0 / 175.0))
+        rh_raw = int(round((humidity + 6.0) * 65535.0 / 125.0))
+        return (self._word_with_crc(max(0, min(65535, t_raw)))
+                + self._word_with_crc(max(0, min(65535, rh_raw))))
+
+
+class BME688Emulator(I2CDeviceEmulator):
+    """BME688 환경센서 (칩 ID, 캘리브레이션 블록, 강제 모드 변환, 필드 데이터/상태 비트)"""
+    
+    name = 'bme688'
+    
+    # 실제 BME688 예시 캘리브레이션 값 (bme688_sensor.py 기본값과 동일)
+    DEFAULT_CALIBRATION = {
+        'par_t1': 26828, 'par_t2': 26400, 'par_t3': 3,
+        'par_p1': 36477, 'par_p2': -10685, 'par_p3': 88, 'par_p4': 7032, 'par_p5': -154,
+        'par_p6': 30, 'par_p7': 32, 'par_p8': -992, 'par_p9': -3424, 'par_p10': 30,
+        'par_h1': 515, 'par_h2': 694, 'par_h3': 0, 'par_h4': 45, 'par_h5': 20, 'par_h6': 120, 'par_h7': -100,
+        'par_gh1': -1, 'par_gh2': -15, 'par_gh3': 18,
+        'res_heat_range': 1, 'res_heat_val': 0, 'range_sw_err': 0
+    }
+    
+    def __init__(self, temperature: Optional[Signal] = None, humidity: Optional[Signal] = None,
+                 pressure: Optional[Signal] = None, gas_resistance: Optional[Signal] = None,
+                 conversion_time: float = 0.05, timeout_rate: float = 0.0,
+                 calibration: Optional[Dict] = None, variant: int = const.VARIANT_HIGH, **options):
+        """
+        Args:
+            gas_resistance: 목표 가스 저항 (Ω, ADC 값과 범위는 드라이버 공식을 역산해 결정)
+            variant: 칩 변형 (VARIANT_HIGH = BME688, VARIANT_LOW = BME680 가스 레지스터/공식)
+            conversion_time: 강제 모드 변환 시간 (초)
+            timeout_rate: 변환이 끝나지 않는 확률 (드라이버 '측정 타임아웃' 재현)
+        """
+        super().__init__(**options)
+        self.temperature = temperature or Signal(24.0, noise=0.05, amplitude=0.5)
+        self.humidity = humidity or Signal(42.0, noise=0.2, amplitude=2.0)
+        self.pressure = pressure or Signal(1013.25, noise=0.05, amplitude=0.5)  # hPa
+        self.gas_resistance = gas_resistance or Signal(120000.0, noise=800.0, amplitude=5000.0, period=1800.0)
+        self.variant = variant
+        self.conversion_time = conversion_time
+        self.timeout_rate = timeout_rate
+        self.calibration = dict(calibration or self.DEFAULT_CALIBRATION)
+        self.timeout_count = 0
+        
+        self.registers = bytearray(256)
+        self._pointer = 0
+        self._ready_at = None
+        self._reset_registers()
+    
+    def _reset_registers(self):
+        """전원 인가/소프트 리셋 직후 레지스터 상태"""
+        regs = self.registers
+        regs[:] = bytes(256)
+        regs[const.CHIP_ID_ADDR] = const.CHIP_ID
+        
+        calibration = self._encode_calibration()
+        regs[const.COEFF_ADDR1:const.COEFF_ADDR1 + const.COEFF_ADDR1_LEN] = calibration[:const.COEFF_ADDR1_LEN]
+        regs[const.COEFF_ADDR2:const.COEFF_ADDR2 + const.COEFF_ADDR2_LEN] = calibration[const.COEFF_ADDR1_LEN:]
+        regs[const.ADDR_RES_HEAT_VAL_ADDR] = self.calibration['res_heat_val'] & 0xFF
+        regs[const.ADDR_RES_HEAT_RANGE_ADDR] = (self.calibration['res_heat_range'] << 4) & const.RHRANGE_MSK
+        regs[const.ADDR_RANGE_SW_ERR_ADDR] = (self.calibration['range_sw_err'] << 4) & const.RSERROR_MSK
+        regs[const.CHIP_VARIANT_ADDR] = self.variant
+        self._ready_at = None
+    
+    def _encode_calibration(self) -> bytearray:
+        """캘리브레이션 계수를 0x89/0xE1 블록 바이트 배열로 변환 (드라이버 파싱의 역순)"""
+        cal = bytearray(const.COEFF_SIZE)
+        c = self.calibration
+        
+        def put_word(msb_index, lsb_index, value):
+            value &= 0xFFFF
+            cal[msb_index] = value >> 8
+            cal[lsb_index] = value & 0xFF
+        
+        put_word(const.T1_MSB_REG, const.T1_LSB_REG, c['par_t1'])
+        put_word(const.T2_MSB_REG, const.T2_LSB_REG, c['par_t2'])
+        cal[const.T3_REG] = c['par_t3'] & 0xFF
+        put_word(const.P1_MSB_REG, const.P1_LSB_REG, c['par_p1'])
+        put_word(const.P2_MSB_REG, const.P2_LSB_REG, c['par_p2'])
+        cal[const.P3_REG] = c['par_p3'] & 0xFF
+        put_word(const.P4_MSB_REG, const.P4_LSB_REG, c['par_p4'])
+        put_word(const.P5_MSB_REG, const.P5_LSB_REG, c['par_p5'])
+        cal[const.P6_REG] = c['par_p6'] & 0xFF
+        cal[const.P7_REG] = c['par_p7'] & 0xFF
+        put_word(const.P8_MSB_REG, const.P8_LSB_REG, c['par_p8'])
+        put_word(const.P9_MSB_REG, const.P9_LSB_REG, c['par_p9'])
+        cal[const.P10_REG] = c['par_p10'] & 0xFF
+        # H1/H2는 0xE2 레지스터의 상하위 니블을 공유
+        cal[const.H1_MSB_REG] = (c['par_h1'] >> 4) & 0xFF
+        cal[const.H2_MSB_REG] = (c['par_h2'] >> 4) & 0xFF
+        cal[const.H1_LSB_REG] = ((c['par_h2'] & 0x0F) << 4) | (c['par_h1'] & 0x0F)
+        for key, index in (('par_h3', const.H3_REG), ('par_h4', const.H4_REG), ('par_h5', const.H5_REG),
+                           ('par_h6', const.H6_REG), ('par_h7', const.H7_REG),
+                           ('par_gh1', const.GH1_REG), ('par_gh3', const.GH3_REG)):
+            cal[index] = c[key] & 0xFF
+        put_word(const.GH2_MSB_REG, const.GH2_LSB_REG, c['par_gh2'])
+        return cal
+    
+    def write(self, data: bytes):
+        register = data[0]
+        self._pointer = register
+        for offset, value in enumerate(data[1:]):
+            self._write_register((register + offset) & 0xFF, value)
+    
+    def _write_register(self, register: int, value: int):
+        if register == const.SOFT_RESET_ADDR:
+            if value == const.SOFT_RESET_CMD:
+                self._reset_registers()
+            return
+        
+        self.registers[register] = value
+        if register == const.CONF_T_P_MODE_ADDR and (value & const.MODE_MSK) == const.FORCED_MODE:
+            # 강제 모드 변환 시작: new_data 비트 해제, 변환 완료 후 필드 데이터 갱신
+            self.registers[const.FIELD0_ADDR] &= ~const.NEW_DATA_MSK & 0xFF
+            if self.timeout_rate and self.rng.random() < self.timeout_rate:
+                self.timeout_count += 1
+                self._ready_at = None
+            else:
+                self._ready_at = time.monotonic() + self.conversion_time
+    
+    def read(self, length: int) -> bytes:
+        if self._ready_at is not None and time.monotonic() >= self._ready_at:
+            self._ready_at = None
+            self._complete_measurement()
+        
+        start = self._pointer
+        data = bytes(self.registers[(start + i) & 0xFF] for i in range(length))
+        self._pointer = (start + length) & 0xFF
+        return data
+    
+    def _complete_measurement(self):
+        """변환 완료: 목표 물리량을 역보정한 ADC 값으로 필드 데이터 레지스터 채움"""
+        temp_raw = self._invert(self._temperature_from_raw, self.temperature.sample(self.rng), 0, (1 << 20) - 1)
+        t_fine = self._t_fine(temp_raw)
+        press_raw = self._invert(lambda raw: self._pressure_from_raw(raw, t_fine),
+                                 self.pressure.sample(self.rng) * 100.0, 0, (1 << 20) - 1)
+        hum_raw = self._invert(lambda raw: self._humidity_from_raw(raw, t_fine),
+                               self.humidity.sample(self.rng), 0, 0xFFFF)
+        gas_raw, gas_range = self._gas_raw(self.gas_resistance.sample(self.rng))
+        gas_index = 15 if self.variant == const.VARIANT_HIGH else 13
+        
+        field = bytearray(const.FIELD_LENGTH)
+        field[0] = const.NEW_DATA_MSK
+        field[2] = (press_raw >> 12) & 0xFF
+        field[3] = (press_raw >> 4) & 0xFF
+        field[4] = (press_raw & 0x0F) << 4
+        field[5] = (temp_raw >> 12) & 0xFF
+        field[6] = (temp_raw >> 4) & 0xFF
+        field[7] = (temp_raw & 0x0F) << 4
+        field[8] = (hum_raw >> 8) & 0xFF
+        field[9] = hum_raw & 0xFF
+        field[gas_index] = (gas_raw >> 2) & 0xFF
+        field[gas_index + 1] = ((gas_raw & 0x03) << 6) | const.GASM_VALID_MSK | const.HEAT_STAB_MSK | gas_range
+        self.registers[const.FIELD0_ADDR:const.FIELD0_ADDR + const.FIELD_LENGTH] = field
+        
+        # 강제 모드 변환이 끝나면 슬립 모드로 복귀
+        self.registers[const.CONF_T_P_MODE_ADDR] &= ~const.MODE_MSK & 0xFF
+    
+    def _gas_raw(self, resistance: float):
+        """목표 저항에 가장 가까운 (ADC 값, 범위) - 범위마다 역산 후 상대 오차가 가장 작은 조합"""
+        best = None
+        for gas_range in range(16):
+            gas_raw = self._invert(lambda raw: self._gas_resistance_from_raw(raw, gas_range),
+                                   resistance, 0, 1023)
+            error = abs(self._gas_resistance_from_raw(gas_raw, gas_range) / resistance - 1.0)
+            if best is None or error < best[0]:
+                best = (error, gas_raw, gas_range)
+        return best[1], best[2]
+    
+    def _gas_resistance_from_raw(self, gas_raw, gas_range):
+        if self.variant == const.VARIANT_HIGH:
+            return 1000000.0 * (262144 >> gas_range) / (4096 + 3 * (gas_raw - 512))
+        var1 = ((1340 + 5 * self.calibration['range_sw_err']) * const.lookupTable1[gas_range]) >> 16
+        var2 = (gas_raw << 15) - 16777216 + var1
+        return (((const.lookupTable2[gas_range] * var1) >> 9) + (var2 >> 1)) / var2
+    
+    @staticmethod
+    def _invert(function, target, low, high) -> int:
+        """단조 함수의 정수 역함수 (이분 탐색)"""
+        increasing = function(high) >= function(low)
+        while low < high:
+            middle = (low + high) // 2
+            if (function(middle) < target) == increasing:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def _t_fine(self, temp_raw):
+        c = self.calibration
+        var1 = (temp_raw / 16384.0) - (c['par_t1'] / 1024.0)
+        return var1 * c['par_t2'] + (var1 * var1) * (c['par_t3'] * 16.0)
+    
+    def _temperature_from_raw(self, temp_raw):
+        return self._t_fine(temp_raw) / 5120.0
+    
+    def _pressure_from_raw(self, press_raw, t_fine):
+        """Bosch 부동소수점 압력 보정식 (Pa)"""
+        c = self.calibration
+        var1 = (t_fine / 2.0) - 64000.0
+        var2 = var1 * var1 * (c['par_p6'] / 131072.0)
+        var2 = var2 + (var1 * c['par_p5'] * 2.0)
+        var2 = (var2 / 4.0) + (c['par_p4'] * 65536.0)
+        var1 = ((c['par_p3'] * var1 * var1 / 16384.0) + (c['par_p2'] * var1)) / 524288.0
+        var1 = (1.0 + (var1 / 32768.0)) * c['par_p1']
+        pressure = 1048576.0 - press_raw
+        pressure = ((pressure - (var2 / 4096.0)) * 6250.0) / var1
+        var1 = (c['par_p9'] * pressure * pressure) / 2147483648.0
+        var2 = pressure * (c['par_p8'] / 32768.0)
+        var3 = (pressure / 256.0) ** 3 * (c['par_p10'] / 131072.0)
+        return pressure + (var1 + var2 + var3 + (c['par_p7'] * 128.0)) / 16.0
+    
+    def _humidity_from_raw(self, hum_raw, t_fine):
+        """Bosch 부동소수점 습도 보정식 (%)"""
+        c = self.calibration
+        temp_scaled = t_fine / 5120.0
+        var1 = hum_raw - (c['par_h1'] * 16.0 + (c['par_h3'] / 2.0) * temp_scaled)
+        var2 = var1 * (c['par_h2'] / 262144.0 * (1.0 + (c['par_h4'] / 16384.0) * temp_scaled
+                                                 + (c['par_h5'] / 1048576.0) * temp_scaled * temp_scaled))
+        var3 = c['par_h6'] / 16384.0
+        var4 = c['par_h7'] / 2097152.0
+        return var2 + (var3 + var4 * temp_scaled) * var2 * var2
+    
+    def get_status(self) -> Dict:
+        status = super().get_status()
+        status['timeout_count'] = self.timeout_count
+        return status
+
+
+class BH1750Emulator(I2CDeviceEmulator):
+    """BH1750 조도센서 (전원/리셋/측정 모드 명령, 2바이트 결과)"""
+    
+    name = 'bh1750'
+    
+    CMD_POWER_DOWN = 0x00
+    CMD_POWER_ON = 0x01
+    CMD_RESET = 0x07
+    # 측정 모드 → (측정 시간(초), 카운트/lux 배율)
+    MODES = {0x10: (0.12, 1.2), 0x11: (0.12, 2.4), 0x13: (0.016, 1.2),
+             0x20: (0.12, 1.2), 0x21: (0.12, 2.4), 0x23: (0.016, 1.2)}
+    
+    def __init__(self, lux: Optional[Signal] = None, **options):
+        super().__init__(**options)
+        self.lux = lux or Signal(350.0, noise=2.0, amplitude=50.0)
+        self.powered = False
+        self.mode = None
+        self._ready_at = None
+        self._raw = 0
+    
+    def write(self, data: bytes):
+        command = data[0]
+        if command == self.CMD_POWER_ON:
+            self.powered = True
+        elif command == self.CMD_POWER_DOWN:
+            self.powered = False
+        elif command == self.CMD_RESET:
+            self._raw = 0
+        elif command in self.MODES:
+            self.powered = True
+            # 같은 연속 측정 모드를 다시 쓰면 측정 주기 유지 (드라이버가 읽을 때마다 모드 바이트 전송)
+            if command != self.mode or self._ready_at is None:
+                self._ready_at = time.monotonic() + self.MODES[command][0]
+            self.mode = command
+    
+    def read(self, length: int) -> bytes:
+        if not self.powered:
+            self.nack_count += 1
+            raise nack_error()
+        
+        if self.mode is not None and self._ready_at is not None and time.monotonic() >= self._ready_at:
+            scale = self.MODES[self.mode][1]
+            self._raw = max(0, min(0xFFFF, int(round(self.lux.sample(self.rng) * scale))))
+            # 연속 모드는 다음 측정 시작, 일회성 모드는 측정 후 전원 차단
+            if self.mode & 0x20:
+                self._ready_at = None
+                self.powered = False
+            else:
+                self._ready_at = time.monotonic() + self.MODES[self.mode][0]
+        return bytes([self._raw >> 8, self._raw & 0xFF])
+
+
+class SDP810Emulator(I2CDeviceEmulator):
+    """SDP810 차압센서 (연속 측정 상태, 차압/온도/스케일 워드 + CRC)"""
+    
+    name = 'sdp810'
+    
+    SCALE_FACTOR = 60  # SDP810-500Pa 차압 스케일 (counts/Pa)
+    
+    def __init__(self, pressure: Optional[Signal] = None, temperature: Optional[Signal] = None, **options):
+        super().__init__(**options)
+        self.pressure = pressure or Signal(12.0, noise=0.3, amplitude=3.0)
+        self.temperature = temperature or Signal(24.0, noise=0.05)
+    
+    def read(self, length: int) -> bytes:
+        pressure_raw = int(round(self.pressure.sample(self.rng) * self.SCALE_FACTOR))
+        pressure_raw = max(-32768, min(32767, pressure_raw)) & 0xFFFF
+        temperature_raw = int(round(self.temperature.sample(self.rng) * 200.0)) & 0xFFFF
+        return (self._word_with_crc(pressure_raw) + self._word_with_crc(temperature_raw)
+                + self._word_with_crc(self.SCALE_FACTOR))
+
+
+class FakeSMBus:
+    """smbus2.SMBus 호환 가짜 I2C 버스 (주소별 장치 에뮬레이터로 트랜잭션 전달)"""
+    
+    def __init__(self, bus: Optional[int] = None, devices: Optional[Dict[int, I2CDeviceEmulator]] = None,
+                 latency: float = 0.0):
+        """
+        Args:
+            bus: 버스 번호
+            devices: {주소: 장치 에뮬레이터}
+            latency: 버스 트랜잭션마다 추가되는 지연 (초)
+        """
+        self.bus_number = bus
+        self.devices = dict(devices or {})
+        self.latency = latency
+        self.closed = False
+        self._lock = threading.Lock()
+        self.transaction_count = 0
+        self.error_count = 0
+    
+    def attach(self, address: int, device: I2CDeviceEmulator):
+        """장치 연결"""
+        self.devices[address] = device
+    
+    def _transfer(self, address: int, write=None, read_length: int = 0) -> bytes:
+        with self._lock:
+            self.transaction_count += 1
+            if self.latency:
+                time.sleep(self.latency)
+            try:
+                device = self.devices.get(address)
+                if device is None or self.closed:
+                    raise nack_error()
+                if write is not None:
+                    device.transfer_write(bytes(write))
+                if read_length:
+                    return device.transfer_read(read_length)
+                return b''
+            except OSError:
+                self.error_count += 1
+                raise
+    
+    def i2c_rdwr(self, *i2c_msgs):
+        for msg in i2c_msgs:
+            if msg.flags & I2C_M_RD:
+                data = self._transfer(msg.addr, read_length=msg.len)
+                ctypes.memmove(msg.buf, data, msg.len)
+            else:
+                self._transfer(msg.addr, write=bytes(msg))
+    
+    def write_quick(self, i2c_addr, force=None):
+        self._transfer(i2c_addr, write=b'')
+    
+    def read_byte(self, i2c_addr, force=None):
+        return self._transfer(i2c_addr, read_length=1)[0]
+    
+    def write_byte(self, i2c_addr, value, force=None):
+        self._transfer(i2c_addr, write=[value])
+    
+    def read_byte_data(self, i2c_addr, register, force=None):
+        return self._transfer(i2c_addr, write=[register], read_length=1)[0]
+    
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        self._transfer(i2c_addr, write=[register, value])
+    
+    def read_word_data(self, i2c_addr, register, force=None):
+        data = self._transfer(i2c_addr, write=[register], read_length=2)
+        return data[0] | (data[1] << 8)
+    
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        return list(self._transfer(i2c_addr, write=[register], read_length=length))
+    
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        self._transfer(i2c_addr, write=[register] + list(data))
+    
+    def close(self):
+        self.closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def get_status(self) -> Dict:
+        """버스 및 장치별 트랜잭션/오류 통계"""
+        return {
+            'bus': self.bus_number,
+            'transaction_count': self.transaction_count,
+            'error_count': self.error_count,
+            'devices': {f"0x{address:02X}": device.get_status() for address, device in self.devices.items()}
+        }
+
+
+class FakeSps30Device:
+    """
+    SPS30 SHDLC 장치 대체 (Sps30ShdlcDevice에서 SPS30BackgroundThread가 쓰는 메서드만 구현)
+    
+    read_measured_value()는 샘플 코드와 같은 (PM1.0, PM2.5, PM10) 순서로 반환
+    """
+    
+    def __init__(self, serial_number: str = 'EMU0SPS30000001', pm1: Optional[Signal] = None,
+                 pm25: Optional[Signal] = None, pm10: Optional[Signal] = None,
+                 latency: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            latency: SHDLC 명령마다 추가되는 지연 (초)
+            error_rate: 명령 응답 타임아웃 확률 (0~1)
+        """
+        self.serial_number = serial_number
+        self.pm1 = pm1 or Signal(6.0, noise=0.5, amplitude=1.0)
+        self.pm25 = pm25 or Signal(9.0, noise=0.8, amplitude=1.5)
+        self.pm10 = pm10 or Signal(13.0, noise=1.2, amplitude=2.0)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.measuring = False
+        self.command_count = 0
+        self.error_count = 0
+    
+    def _command(self):
+        self.command_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.error_count += 1
+            raise TimeoutError('SHDLC 응답 타임아웃 (에뮬레이터)')
+    
+    def device_information_serial_number(self):
+        self._command()
+        return self.serial_number
+    
+    def device_reset(self):
+        self._command()
+        self.measuring = False
+    
+    def start_measurement(self):
+        self._command()
+        self.measuring = True
+    
+    def stop_measurement(self):
+        self._command()
+        self.measuring = False
+    
+    def read_measured_value(self):
+        self._command()
+        if not self.measuring:
+            raise RuntimeError('SHDLC 장치 오류: 측정 모드가 아님 (에뮬레이터)')
+        return (max(0.0, self.pm1.sample(self.rng)),
+                max(0.0, self.pm25.sample(self.rng)),
+                max(0.0, self.pm10.sample(self.rng)))
+    
+    def opener(self):
+        """SPS30BackgroundThread(device_opener=...)용 장치 열기 함수"""
+        @contextmanager
+        def open_device(port_path):
+            yield self
+        return open_device
+
+
+def create_emulated_buses(bus_number: int = 1, seed: Optional[int] = None, latency: float = 0.0,
+                          nack_rate: float = 0.0, crc_error_rate: float = 0.0,
+                          bme688_timeout_rate: float = 0.0) -> Dict[int, FakeSMBus]:
+    """기본 배선(버스 1: SHT40 0x44, BME688 0x77, BH1750 0x23, SDP810 0x25)의 가짜 버스 생성"""
+    rng = random.Random(seed)
+    
+    def options():
+        return {'latency': latency, 'nack_rate': nack_rate, 'crc_error_rate': crc_error_rate,
+                'seed': rng.randrange(1 << 30)}
+    
+    bus = FakeSMBus(bus_number)
+    bus.attach(0x44, SHT40Emulator(**options()))
+    bus.attach(0x77, BME688Emulator(timeout_rate=bme688_timeout_rate, **options()))
+    bus.attach(0x23, BH1750Emulator(**options()))
+    bus.attach(0x25, SDP810Emulator(**options()))
+    return {bus_number: bus}
+
+
+def create_emulated_sensor_manager(seed: Optional[int] = None, sps30_interval: int = 1,
+                                   buses: Optional[Dict[int, FakeSMBus]] = None,
+                                   sps30_device: Optional[FakeSps30Device] = None, **fault_options):
+    """
+    에뮬레이터 장치에 연결된 SensorManager 생성 (initialize_sensors()는 호출하는 쪽에서)
+    
+    Args:
+        seed: 노이즈/오류 주입 난수 시드
+        sps30_interval: SPS30 백그라운드 측정 간격 (초, 안정화 대기는 생략)
+        buses: 직접 구성한 {버스 번호: FakeSMBus} (None이면 기본 배선)
+        sps30_device: 직접 구성한 FakeSps30Device
+        fault_options: create_emulated_buses()의 latency, nack_rate, crc_error_rate, bme688_timeout_rate
+    """
+    from sensor_manager import SensorManager
+    from sps30_background_thread import SPS30BackgroundThread
+    
+    if buses is None:
+        buses = create_emulated_buses(seed=seed, **fault_options)
+    if sps30_device is None:
+        sps30_device = FakeSps30Device(seed=seed, latency=fault_options.get('latency', 0.0),
+                                       error_rate=fault_options.get('nack_rate', 0.0))
+    
+    def bus_factory(bus_number):
+        if bus_number not in buses:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), f'/dev/i2c-{bus_number}')
+        bus = buses[bus_number]
+        bus.closed = False
+        return bus
+    
+    def sps30_factory():
+        thread = SPS30BackgroundThread(port_path='emulated', update_interval=sps30_interval,
+                                       device_opener=sps30_device.opener())
+        thread.reset_settle_time = 0
+        thread.measurement_settle_time = 0
+        return thread
+    
+    manager = SensorManager(bus_factory=bus_factory, sps30_factory=sps30_factory)
+    manager.emulated_buses = buses
+    manager.emulated_sps30 = sps30_device
+    return manager
@@ -5,24 +5,58 @@ EG-Dash 센서 관리자 (라즈베리파이 전용)
 각 센서 클래스를 별도 파일에서 import
 """
 
+import os
 import time
-import smbus2
-import random
-import math
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-import constants as const
-from bme688_sensor import BME688Sensor
-from sht40_sensor import SHT40Sensor
-from bh1750_sensor import BH1750Sensor
-from sdp810_sensor import SDP810Sensor
-from sps30_background_thread import SPS30BackgroundThread
+from metrics import SENSOR_READ_SECONDS, SENSOR_READ_FAILURES, I2C_BUS_BUSY_SECONDS
+from tracer import TRACER
+
+# 지원 센서 종류 (드라이버 모듈과 smbus2/SHDLC 라이브러리는 해당 센서 검색 시 처음 import)
+SENSOR_TYPES = ('sht40', 'bme688', 'bh1750', 'sdp810', 'sps30')
+
+
+def enabled_sensor_types():
+    """환경 변수 EGDASH_SENSORS(쉼표 구분, 예: 'sht40,sps30')로 사용할 센서 종류 선택 (미설정 시 전체)"""
+    value = os.environ.get('EGDASH_SENSORS', '').strip()
+    if not value:
+        return set(SENSOR_TYPES)
+    
+    selected = {name.strip().lower() for name in value.split(',') if name.strip()}
+    unknown = selected - set(SENSOR_TYPES)
+    if unknown:
+        print(f"⚠️ 알 수 없는 센서 종류 무시: {', '.join(sorted(unknown))}")
+    return selected & set(SENSOR_TYPES)
+
+
+def _default_bus_factory(bus_num):
+    import smbus2
+    return smbus2.SMBus(bus_num)
+
+
+def _default_sps30_factory():
+    from sps30_background_thread import SPS30BackgroundThread
+    return SPS30BackgroundThread(update_interval=15)
 
 
 
 class SensorManager:
     """라즈베리파이 전용 센서 관리자 (멀티 센서 지원)"""
     
-    def __init__(self):
+    def __init__(self, bus_factory=None, sps30_factory=None, enabled_types=None):
+        """
+        센서 관리자 초기화
+        
+        Args:
+            bus_factory: 버스 번호로 I2C 버스 객체를 만드는 함수 (기본: smbus2.SMBus, 에뮬레이터 주입용)
+            sps30_factory: SPS30 백그라운드 스레드를 만드는 함수 (기본: 실제 UART 장치)
+            enabled_types: 검색할 센서 종류 (기본: EGDASH_SENSORS 환경 변수, 미설정 시 전체)
+        """
+        self.bus_factory = bus_factory or _default_bus_factory
+        self.sps30_factory = sps30_factory or _default_sps30_factory
+        self.enabled_types = set(enabled_types) if enabled_types is not None else enabled_sensor_types()
+        
         # 멀티 센서 지원을 위한 리스트 구조 (I2C 센서들만)
         self.sht40_sensors = []    # SHT40 센서들
         self.bme688_sensors = []   # BME688 센서들  
@@ -40,6 +74,9 @@ class SensorManager:
         
         self.buses = {}
         self.sensor_error_count = {}  # 센서별 오류 카운트
+        
+        # I2C 버스 접근 직렬화 (수집 스레드와 API 요청 스레드 동시 접근 방지)
+        self._bus_lock = threading.RLock()
         self.last_sensor_config = {}  # 센서 구성 저장
         
         # BME688 센서 접근 주기 개선을 위한 변수
@@ -57,7 +94,7 @@ class SensorManager:
         # I2C 버스 연결
         for bus_num in [0, 1]:
             try:
-                bus = smbus2.SMBus(bus_num)
+                bus = self.bus_factory(bus_num)
                 self.buses[bus_num] = bus
                 print(f"✅ I2C 버스 {bus_num} 연결 완료")
             except Exception as e:
@@ -67,6 +104,10 @@ class SensorManager:
             print("❌ 사용 가능한 I2C 버스가 없습니다")
             return False
         
+        disabled_types = [sensor_type for sensor_type in SENSOR_TYPES if sensor_type not in self.enabled_types]
+        if disabled_types:
+            print(f"⏭️ 비활성 센서 (EGDASH_SENSORS): {', '.join(disabled_types)}")
+        
         # SHT40 센서들 검색 (우선순위 1)
         print("🔍 SHT40 센서 검색 중...")
         self.sht40_sensors = self._find_all_sht40()
@@ -96,20 +137,21 @@ class SensorManager:
             success_count += len(self.sdp810_sensors)
         
         # SPS30 백그라운드 스레드 초기화 (독립 처리)
-        print("🔍 SPS30 백그라운드 스레드 초기화 중...")
-        try:
-            self.sps30_background = SPS30BackgroundThread(update_interval=15)
-            if self.sps30_background.start():
-                success_count += 1
-                print("✅ SPS30 백그라운드 스레드 시작 성공")
-            else:
-                print("❌ SPS30 백그라운드 스레드 시작 실패")
+        if 'sps30' in self.enabled_types:
+            print("🔍 SPS30 백그라운드 스레드 초기화 중...")
+            try:
+                self.sps30_background = self.sps30_factory()
+                if self.sps30_background.start():
+                    success_count += 1
+                    print("✅ SPS30 백그라운드 스레드 시작 성공")
+                else:
+                    print("❌ SPS30 백그라운드 스레드 시작 실패")
+                    self.sps30_background = None
+            except Exception as e:
+                print(f"❌ SPS30 백그라운드 스레드 초기화 오류: {e}")
                 self.sps30_background = None
-        except Exception as e:
-            print(f"❌ SPS30 백그라운드 스레드 초기화 오류: {e}")
-            self.sps30_background = None
         
-        total_sensors = 5  # SHT40, BME688, BH1750, SDP810, SPS30
+        total_sensors = len(self.enabled_types)
         print(f"📊 센서 초기화 완료: {success_count}/{total_sensors}개 센서 연결")
         
         # 현재 센서 구성 저장
@@ -127,8 +169,29 @@ class SensorManager:
             'sps30': self.sps30_background is not None and self.sps30_background.is_healthy()
         }
     
+    def _make_sensor_info(self, sensor, bus_num, address, alias, sensor_id):
+        """센서 정보 생성 (멀티 센서 응답용 고정 필드는 미리 계산)"""
+        return {
+            'sensor': sensor,
+            'bus': bus_num,
+            'address': address,
+            'alias': alias,
+            'id': sensor_id,
+            # read_all_sensors_multi 응답에 그대로 쓰는 고정 필드
+            'descriptor': {
+                'id': sensor_id,
+                'alias': alias,
+                'bus': bus_num,
+                'address': f"0x{address:02X}"
+            }
+        }
+    
     def _find_all_sht40(self):
         """모든 SHT40 센서들 찾기"""
+        if 'sht40' not in self.enabled_types:
+            return []
+        from sht40_sensor import SHT40Sensor
+        
         found_sensors = []
         sensor_count = 0
         
@@ -139,13 +202,7 @@ class SensorManager:
                     if sht40.connected:
                         sensor_count += 1
                         alias = f"SHT40-{sensor_count}"
-                        sensor_info = {
-                            'sensor': sht40,
-                            'bus': bus_num,
-                            'address': addr,
-                            'alias': alias,
-                            'id': f"sht40_{sensor_count}"
-                        }
+                        sensor_info = self._make_sensor_info(sht40, bus_num, addr, alias, f"sht40_{sensor_count}")
                         found_sensors.append(sensor_info)
                         print(f"✅ SHT40 센서 발견 (버스 {bus_num}, 주소 0x{addr:02X}) - {alias}")
                 except Exception as e:
@@ -158,6 +215,10 @@ class SensorManager:
     
     def _find_all_bme688(self):
         """모든 BME688 센서들 찾기"""
+        if 'bme688' not in self.enabled_types:
+            return []
+        from bme688_sensor import BME688Sensor
+        
         found_sensors = []
         sensor_count = 0
         
@@ -171,13 +232,7 @@ class SensorManager:
                     if bme688.connected:
                         sensor_count += 1
                         alias = f"BME688-{sensor_count}"
-                        sensor_info = {
-                            'sensor': bme688,
-                            'bus': bus_num,
-                            'address': addr,
-                            'alias': alias,
-                            'id': f"bme688_{sensor_count}"
-                        }
+                        sensor_info = self._make_sensor_info(bme688, bus_num, addr, alias, f"bme688_{sensor_count}")
                         found_sensors.append(sensor_info)
                         print(f"✅ BME688 센서 발견 (버스 {bus_num}, 주소 0x{addr:02X}) - {alias}")
                 except Exception as e:
@@ -191,6 +246,10 @@ class SensorManager:
     
     def _find_all_bh1750(self):
         """모든 BH1750 센서들 찾기"""
+        if 'bh1750' not in self.enabled_types:
+            return []
+        from bh1750_sensor import BH1750Sensor
+        
         found_sensors = []
         sensor_count = 0
         
@@ -201,13 +260,7 @@ class SensorManager:
                     if bh1750.connected:
                         sensor_count += 1
                         alias = f"BH1750-{sensor_count}"
-                        sensor_info = {
-                            'sensor': bh1750,
-                            'bus': bus_num,
-                            'address': addr,
-                            'alias': alias,
-                            'id': f"bh1750_{sensor_count}"
-                        }
+                        sensor_info = self._make_sensor_info(bh1750, bus_num, addr, alias, f"bh1750_{sensor_count}")
                         found_sensors.append(sensor_info)
                         print(f"✅ BH1750 센서 발견 (버스 {bus_num}, 주소 0x{addr:02X}) - {alias}")
                 except Exception as e:
@@ -220,6 +273,10 @@ class SensorManager:
     
     def _find_all_sdp810(self):
         """모든 SDP810 센서들 찾기 (simpleEddy.py 방식)"""
+        if 'sdp810' not in self.enabled_types:
+            return []
+        from sdp810_sensor import SDP810Sensor
+        
         found_sensors = []
         sensor_count = 0
         
@@ -236,13 +293,7 @@ class SensorManager:
                             sensor_count += 1
                             alias = f"SDP810-{sensor_count}"
                             status = "✓" if crc_ok else "⚠"
-                            sensor_info = {
-                                'sensor': sdp810,
-                                'bus': bus_num,
-                                'address': addr,
-                                'alias': alias,
-                                'id': f"sdp810_{sensor_count}"
-                            }
+                            sensor_info = self._make_sensor_info(sdp810, bus_num, addr, alias, f"sdp810_{sensor_count}")
                             found_sensors.append(sensor_info)
                             print(f"✅ SDP810 센서 발견 (버스 {bus_num}, 주소 0x{addr:02X}) - {alias} {pressure:.1f} Pa {status}")
                 except Exception as e:
@@ -259,6 +310,7 @@ class SensorManager:
         """SDP810 직접 통신 테스트 (simpleEddy.py 방식)"""
         try:
             import struct
+            import smbus2
             
             # 3바이트 직접 읽기 시도
             read_msg = smbus2.i2c_msg.read(address, 3)
@@ -324,8 +376,113 @@ class SensorManager:
             
     
     
+    @contextmanager
+    def _bus_locked(self, operation):
+        """I2C 버스 락 획득 (트레이서 활성 시 락 대기 시간과 작업 구간 기록)"""
+        with TRACER.span('i2c.bus_lock_wait', 'lock', operation=operation):
+            self._bus_lock.acquire()
+        try:
+            with TRACER.span(operation, 'sensor_manager'):
+                yield
+        finally:
+            self._bus_lock.release()
+    
+    def _timed_read(self, sensor_type, sensor):
+        """센서 read_data() 호출 (읽기 지연 시간, I2C 버스 점유 시간, 실패 횟수 기록)"""
+        bus_number = self._bus_number(sensor)
+        start = time.perf_counter()
+        with TRACER.span(f'{sensor_type}.read_data', 'sensor', bus=bus_number):
+            data = sensor.read_data()
+        elapsed = time.perf_counter() - start
+        
+        SENSOR_READ_SECONDS.observe(elapsed, sensor=sensor_type)
+        I2C_BUS_BUSY_SECONDS.inc(elapsed, bus=bus_number)
+        if data is None:
+            SENSOR_READ_FAILURES.inc(sensor=sensor_type)
+        return data
+    
+    def _bus_number(self, sensor):
+        """센서가 연결된 I2C 버스 번호 (알 수 없으면 'unknown')"""
+        for bus_num, bus in self.buses.items():
+            if bus is getattr(sensor, 'bus', None):
+                return bus_num
+        return 'unknown'
+    
+    def get_driver_stats(self):
+        """
+        센서 드라이버별 오류/재시도/CRC 실패 카운터 (메트릭 수집용)
+        
+        Returns:
+            List[Dict]: sensor, id, bus, error_count, retry_count, crc_error_count (없는 항목은 None)
+        """
+        stats = []
+        for sensor_type, sensor_list, _ in self._multi_sensor_groups():
+            for sensor_info in sensor_list:
+                sensor = sensor_info['sensor']
+                stats.append({
+                    'sensor': sensor_type,
+                    'id': sensor_info['id'],
+                    'bus': sensor_info['bus'],
+                    'connected': bool(sensor and sensor.connected),
+                    'error_count': getattr(sensor, 'error_count', None),
+                    'retry_count': getattr(sensor, 'retry_count', None),
+                    'crc_error_count': getattr(sensor, 'crc_error_count', None)
+                })
+        return stats
+    
     def read_all_sensors(self):
         """모든 센서 데이터 읽기 (SPS30 우선순위 적용)"""
+        with self._bus_locked('read_all_sensors'):
+            return self._read_all_sensors()
+    
+    def _read_all_sensors(self):
+        """모든 센서 데이터 읽기 (버스 락 보유 상태에서 호출)"""
+        result = self._new_sensor_result()
+        
+        # SPS30 → SHT40 → BME688 → BH1750 → SDP810 순서 (SHT40 온습도 우선)
+        self._read_sps30_into(result)
+        self._read_sht40_into(result)
+        self._read_bme688_into(result)
+        self._read_bh1750_into(result)
+        self._read_sdp810_into(result)
+        
+        return result
+    
+    def read_sensor_type(self, sensor_type):
+        """
+        특정 센서 타입만 읽기 (해당 센서의 I2C 통신만 수행)
+        
+        BME688은 전체 읽기와 같은 값을 내도록 SHT40을 먼저 읽음
+        (온도/습도는 SHT40 값이 없을 때만 BME688 값 사용)
+        
+        Args:
+            sensor_type: 'sht40', 'bme688', 'bh1750', 'sdp810', 'sps30', 'virtual'
+        
+        Returns:
+            Dict: read_all_sensors()와 같은 형식 (요청한 센서 값만 채워짐)
+        
+        Raises:
+            ValueError: 알 수 없는 센서 타입
+        """
+        readers = {
+            'sht40': (self._read_sht40_into,),
+            'bme688': (self._read_sht40_into, self._read_bme688_into),
+            'bh1750': (self._read_bh1750_into,),
+            'sdp810': (self._read_sdp810_into,),
+            'sps30': (self._read_sps30_into,),
+            'virtual': ()  # 가상 센서는 읽을 장치 없음
+        }
+        if sensor_type not in readers:
+            raise ValueError(f"알 수 없는 센서 타입: {sensor_type}")
+        
+        with self._bus_locked('read_sensor_type'):
+            result = self._new_sensor_result()
+            for reader in readers[sensor_type]:
+                reader(result)
+            return result
+    
+    def _new_sensor_result(self):
+        """센서 데이터 결과 기본 구조 생성 (값은 모두 비어 있음)"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         result = {
@@ -344,6 +501,10 @@ class SensorManager:
             'pm25': None,              # PM2.5 (μg/m³)
             'pm4': None,               # PM4.0 (μg/m³)
             'pm10': None,              # PM10 (μg/m³)
+            # 채널별 원본 측정 시각 (SPS30/BME688처럼 캐시된 값이 반복되는지 판단)
+            'source_times': {},
+            # 채널별 원본 센서 (온도/습도는 SHT40 또는 BME688, 센서마다 범위 제한값이 다름)
+            'source_sensors': {},
             'sensor_status': {
                 'bme688': self.bme688 is not None and self.bme688.connected,
                 'bh1750': self.bh1750 is not None and self.bh1750.connected,
@@ -352,16 +513,29 @@ class SensorManager:
                 'sps30': self.sps30_background is not None and self.sps30_background.is_healthy()
             }
         }
-        
-        # 1. SPS30 백그라운드 스레드에서 데이터 가져오기 (즉시 응답)
+        return result
+    
+    @staticmethod
+    def _mark_source_time(result, sensor, channels, measured_at):
+        """채널별 원본 센서와 측정 시각 기록 (측정 시각을 모르면 시각은 기록하지 않음)"""
+        for channel in channels:
+            result['source_sensors'][channel] = sensor
+            if measured_at is not None:
+                result['source_times'][channel] = measured_at
+    
+    def _read_sps30_into(self, result):
+        """SPS30 데이터 반영"""
+        # SPS30 백그라운드 스레드에서 데이터 가져오기 (즉시 응답)
         if self.sps30_background and self.sps30_background.is_healthy():
             try:
-                sps30_data = self.sps30_background.get_current_data()
+                with TRACER.span('sps30.get_current_data', 'lock'):
+                    sps30_data = self.sps30_background.get_current_data()
                 if sps30_data and sps30_data.get('connected', False):
                     result['pm1'] = sps30_data['pm1']
                     result['pm25'] = sps30_data['pm25']
                     result['pm4'] = sps30_data['pm4']
                     result['pm10'] = sps30_data['pm10']
+                    self._mark_source_time(result, 'sps30', ('pm1', 'pm25', 'pm4', 'pm10'), sps30_data.get('last_update'))
                     result['sensor_status']['sps30'] = True
                 else:
                     result['sensor_status']['sps30'] = False
@@ -370,37 +544,50 @@ class SensorManager:
                 result['sensor_status']['sps30'] = False
         else:
             result['sensor_status']['sps30'] = False
-        
-        # 2. SHT40 데이터 읽기 (I2C 통신, 빠른 응답)
+    
+    def _read_sht40_into(self, result):
+        """SHT40 데이터 반영"""
+        # SHT40 데이터 읽기 (I2C 통신, 빠른 응답)
         if self.sht40 and self.sht40.connected:
-            sht40_data = self.sht40.read_data()
+            sht40_data = self._timed_read('sht40', self.sht40)
             if sht40_data:
                 result['temperature'] = sht40_data['temperature']
                 result['humidity'] = sht40_data['humidity']
+                self._mark_source_time(result, 'sht40', ('temperature', 'humidity'), time.time())
                 # 성공 시 오류 카운트 리셋
                 if 'sht40' in self.sensor_error_count:
                     self.sensor_error_count['sht40'] = 0
             else:
                 self._handle_sensor_error('sht40')
-        
-        # 3. BME688 데이터 읽기 (안정성 개선된 주기 적용)
+    
+    def _read_bme688_into(self, result):
+        """BME688 데이터 반영 (온도/습도는 SHT40 값이 없을 때만 사용)"""
+        # BME688 데이터 읽기 (안정성 개선된 주기 적용)
         if self.bme688 and self.bme688.connected:
             current_time = time.time()
             
             # BME688은 내부 캐싱 시스템 사용 (3초 최소 간격)
-            bme_data = self.bme688.read_data()  # 내부에서 자체 캐싱 처리
+            bme_data = self._timed_read('bme688', self.bme688)  # 내부에서 자체 캐싱 처리
             
             if bme_data:
+                # BME688은 최소 간격 안에서는 같은 측정값을 반환하므로 실제 측정 시각을 기록
+                measured_at = getattr(self.bme688, 'measured_at', None) or current_time
+                
                 # SHT40 데이터가 없을 때만 BME688 온도/습도 사용
                 if result['temperature'] is None:
                     result['temperature'] = bme_data['temperature']
+                    self._mark_source_time(result, 'bme688', ('temperature',), measured_at)
                 if result['humidity'] is None:
                     result['humidity'] = bme_data['humidity']
+                    self._mark_source_time(result, 'bme688', ('humidity',), measured_at)
                 # BME688 고유 데이터는 항상 사용
                 result['pressure'] = bme_data['pressure']
                 result['gas_resistance'] = bme_data['gas_resistance']
                 result['air_quality'] = bme_data['air_quality']
                 result['absolute_pressure'] = bme_data['pressure']  # 절대압력 = 압력
+                self._mark_source_time(result, 'bme688',
+                                       ('pressure', 'gas_resistance', 'air_quality', 'absolute_pressure'),
+                                       measured_at)
                 
                 # 성공 시 오류 카운트 리셋
                 if 'bme688' in self.sensor_error_count:
@@ -409,34 +596,67 @@ class SensorManager:
                 
             else:
                 self._handle_sensor_error('bme688')
-        
-        # 4. BH1750 데이터 읽기
+    
+    def _read_bh1750_into(self, result):
+        """BH1750 데이터 반영"""
+        # BH1750 데이터 읽기
         if self.bh1750 and self.bh1750.connected:
-            light_data = self.bh1750.read_data()
+            light_data = self._timed_read('bh1750', self.bh1750)
             if light_data is not None:
                 result['light'] = light_data
+                self._mark_source_time(result, 'bh1750', ('light',), time.time())
                 # 성공 시 오류 카운트 리셋
                 if 'bh1750' in self.sensor_error_count:
                     self.sensor_error_count['bh1750'] = 0
             else:
                 self._handle_sensor_error('bh1750')
-        
-        # 5. SDP810 데이터 읽기 (차압)
+    
+    def _read_sdp810_into(self, result):
+        """SDP810 데이터 반영"""
+        # SDP810 데이터 읽기 (차압)
         if self.sdp810 and self.sdp810.connected:
-            differential_pressure_data = self.sdp810.read_data()
+            differential_pressure_data = self._timed_read('sdp810', self.sdp810)
             if differential_pressure_data is not None:
                 # SDP810 차압을 별도 필드에 저장
                 result['differential_pressure'] = differential_pressure_data
+                self._mark_source_time(result, 'sdp810', ('differential_pressure',), time.time())
                 # 성공 시 오류 카운트 리셋
                 if 'sdp810' in self.sensor_error_count:
                     self.sensor_error_count['sdp810'] = 0
             else:
                 self._handle_sensor_error('sdp810')
-        
-        return result
     
     def read_all_sensors_multi(self):
         """모든 센서 데이터 읽기 (멀티 센서 지원)"""
+        with self._bus_locked('read_all_sensors_multi'):
+            return self._read_all_sensors_multi()
+    
+    def _multi_sensor_groups(self):
+        """센서 타입별 (센서 목록, 단일 값 센서의 데이터 키)"""
+        return [
+            ('sht40', self.sht40_sensors, None),
+            ('bme688', self.bme688_sensors, None),
+            ('bh1750', self.bh1750_sensors, 'light'),
+            ('sdp810', self.sdp810_sensors, 'differential_pressure')
+        ]
+    
+    def _read_multi_entry(self, sensor_type, sensor_info, value_key):
+        """멀티 센서 목록의 센서 1개 읽기 (연결되지 않았으면 None)"""
+        sensor = sensor_info['sensor']
+        if not (sensor and sensor.connected):
+            return None
+        
+        data = self._timed_read(sensor_type, sensor)
+        if data is not None and value_key:
+            data = {value_key: data}
+        
+        entry = dict(sensor_info['descriptor'])
+        entry['connected'] = bool(data)
+        entry['data'] = data if data else None
+        return entry
+    
+    def _read_all_sensors_multi(self):
+        """멀티 센서 데이터 읽기 (버스 락 보유 상태에서 호출)"""
         result = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'sensors': {
@@ -453,106 +673,46 @@ class SensorManager:
             }
         }
         
-        # SHT40 센서들 데이터 읽기
-        for sensor_info in self.sht40_sensors:
-            sensor = sensor_info['sensor']
-            if sensor and sensor.connected:
-                data = sensor.read_data()
-                if data:
-                    result['sensors']['sht40'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': True,
-                        'data': data
-                    })
-                else:
-                    result['sensors']['sht40'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': False,
-                        'data': None
-                    })
-        
-        # BME688 센서들 데이터 읽기
-        for sensor_info in self.bme688_sensors:
-            sensor = sensor_info['sensor']
-            if sensor and sensor.connected:
-                data = sensor.read_data()
-                if data:
-                    result['sensors']['bme688'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': True,
-                        'data': data
-                    })
-                else:
-                    result['sensors']['bme688'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': False,
-                        'data': None
-                    })
-        
-        # BH1750 센서들 데이터 읽기
-        for sensor_info in self.bh1750_sensors:
-            sensor = sensor_info['sensor']
-            if sensor and sensor.connected:
-                data = sensor.read_data()
-                if data is not None:
-                    result['sensors']['bh1750'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': True,
-                        'data': {'light': data}
-                    })
-                else:
-                    result['sensors']['bh1750'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': False,
-                        'data': None
-                    })
-        
-        # SDP810 센서들 데이터 읽기
-        for sensor_info in self.sdp810_sensors:
-            sensor = sensor_info['sensor']
-            if sensor and sensor.connected:
-                data = sensor.read_data()
-                if data is not None:
-                    result['sensors']['sdp810'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': True,
-                        'data': {'differential_pressure': data}
-                    })
-                else:
-                    result['sensors']['sdp810'].append({
-                        'id': sensor_info['id'],
-                        'alias': sensor_info['alias'],
-                        'bus': sensor_info['bus'],
-                        'address': f"0x{sensor_info['address']:02X}",
-                        'connected': False,
-                        'data': None
-                    })
+        for sensor_type, sensor_list, value_key in self._multi_sensor_groups():
+            entries = result['sensors'][sensor_type]
+            
+            for sensor_info in sensor_list:
+                entry = self._read_multi_entry(sensor_type, sensor_info, value_key)
+                if entry:
+                    entries.append(entry)
         
         return result
     
+    def read_sensor_by_id(self, sensor_id):
+        """
+        멀티 센서 ID로 센서 1개만 읽기 (예: 'sht40_1', 'bh1750_2')
+        
+        Returns:
+            Dict: read_all_sensors_multi() 항목 형식 + timestamp, sensor_type
+                  (해당 ID가 없으면 None)
+        """
+        with self._bus_locked('read_sensor_by_id'):
+            for sensor_type, sensor_list, value_key in self._multi_sensor_groups():
+                for sensor_info in sensor_list:
+                    if sensor_info['id'] != sensor_id:
+                        continue
+                    
+                    entry = self._read_multi_entry(sensor_type, sensor_info, value_key)
+                    if entry is None:
+                        entry = dict(sensor_info['descriptor'], connected=False, data=None)
+                    entry['sensor_type'] = sensor_type
+                    entry['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    return entry
+        
+        return None
+    
     def rescan_sensors_now(self):
         """즉시 센서 재검색 (API 호출용)"""
+        with self._bus_locked('rescan_sensors_now'):
+            return self._rescan_sensors_now()
+    
+    def _rescan_sensors_now(self):
+        """센서 재검색 (버스 락 보유 상태에서 호출)"""
         print("🔄 수동 센서 재검색 시작...")
         
         # 기존 센서 상태 저장
@@ -587,14 +747,15 @@ class SensorManager:
         if self.sps30_background:
             self.sps30_background.stop()
             self.sps30_background = None
-            
-        try:
-            self.sps30_background = SPS30BackgroundThread(update_interval=15)
-            if not self.sps30_background.start():
+        
+        if 'sps30' in self.enabled_types:
+            try:
+                self.sps30_background = self.sps30_factory()
+                if not self.sps30_background.start():
+                    self.sps30_background = None
+            except Exception as e:
+                print(f"❌ SPS30 백그라운드 스레드 재시작 오류: {e}")
                 self.sps30_background = None
-        except Exception as e:
-            print(f"❌ SPS30 백그라운드 스레드 재시작 오류: {e}")
-            self.sps30_background = None
         
         # 오류 카운트 리셋
         self.sensor_error_count.clear()
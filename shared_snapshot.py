@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+프로세스 간 센서 스냅샷 공유 모듈
+- 수집 데몬: 최신 스냅샷을 공유 파일(/dev/shm)에 원자적으로 기록
+- 웹 워커: 공유 파일이 바뀔 때만 다시 읽어 자체 스냅샷/SSE 스트림으로 발행
+- 하드웨어 접근은 수집 데몬 1개 프로세스에서만 수행
+"""
+
+import os
+import json
+import tempfile
+from typing import Dict, Optional
+from sensor_acquisition import SensorAcquisitionThread, SensorSnapshot
+
+
+def default_shared_snapshot_path() -> str:
+    """공유 스냅샷 파일 기본 경로 (메모리 기반 /dev/shm 우선)"""
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, 'egdash_snapshot.json')
+
+
+class SharedSnapshotWriter:
+    """수집 데몬용 스냅샷 파일 기록기 (SnapshotBroadcaster와 같은 publish 인터페이스)"""
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        기록기 초기화
+        
+        Args:
+            path: 공유 스냅샷 파일 경로 (None이면 기본 경로)
+        """
+        self.path = path or default_shared_snapshot_path()
+        self._tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        self.published_count = 0
+        self.error_count = 0
+    
+    def publish(self, snapshot: SensorSnapshot):
+        """스냅샷 기록 (임시 파일에 쓴 뒤 rename - 읽는 쪽은 항상 완전한 파일만 봄)"""
+        try:
+            with open(self._tmp_path, 'wb') as f:
+                f.write(snapshot.encode('shared'))  # 워커가 /api/stats 등에 쓰도록 처리기 결과까지 전체 기록
+            os.replace(self._tmp_path, self.path)
+            self.published_count += 1
+        except OSError as e:
+            self.error_count += 1
+            print(f"❌ 공유 스냅샷 기록 실패: {e}")
+    
+    def remove(self):
+        """공유 스냅샷 파일 삭제 (데몬 종료 시 호출)"""
+        for path in (self.path, self._tmp_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def get_status(self) -> Dict:
+        """기록기 상태 정보 반환"""
+        return {
+            'path': self.path,
+            'published_count': self.published_count,
+            'error_count': self.error_count
+        }
+
+
+class SharedSnapshotFollower(SensorAcquisitionThread):
+    """웹 워커용 공유 스냅샷 추적 스레드 (SensorAcquisitionThread와 같은 조회 인터페이스)"""
+    
+    label = "공유 스냅샷 추적 스레드"
+    
+    def __init__(self, path: Optional[str] = None, broadcaster=None, interval=0.2, eager_shapes=None):
+        """
+        추적 스레드 초기화
+        
+        Args:
+            path: 공유 스냅샷 파일 경로 (None이면 기본 경로)
+            broadcaster: 새 스냅샷을 전달할 SnapshotBroadcaster
+            interval: 파일 변경 확인 간격 (초)
+            eager_shapes: 새 스냅샷 수신 직후 미리 직렬화할 응답 형태 {이름: builder}
+        """
+        super().__init__(None, broadcaster, interval, eager_shapes)
+        self.path = path or default_shared_snapshot_path()
+        self._file_stamp = None
+        self.source_seq = None
+    
+    def _acquire_snapshot(self) -> Optional[SensorSnapshot]:
+        """공유 파일이 바뀌었으면 새 스냅샷 생성 (변경 없으면 None)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        
+        # rename으로 교체되므로 inode/mtime/size로 변경 여부 판단 (파일 재읽기 최소화)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._file_stamp:
+            return None
+        
+        with open(self.path, 'rb') as f:
+            data = json.loads(f.read())
+        self._file_stamp = stamp
+        
+        # 데몬 순번은 재시작 시 초기화되므로 워커 내부 순번을 새로 부여 (ETag/델타 기준)
+        self.source_seq = data.pop('seq', None)
+        data['source_seq'] = self.source_seq
+        
+        return self._store_snapshot(SensorSnapshot(data))
+    
+    def get_status(self) -> Dict:
+        """추적 스레드 상태 정보 반환"""
+        status = super().get_status()
+        status['shared_path'] = self.path
+        status['source_seq'] = self.source_seq
+        return status
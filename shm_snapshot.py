@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+공유 메모리 센서 스냅샷 모듈 (multiprocessing.shared_memory)
+- 수집 데몬이 최신 스냅샷과 채널별 링 버퍼를 고정 바이너리 레이아웃으로 기록
+- seqlock(순번 카운터)으로 읽는 도중 기록된 데이터(torn read) 감지 후 재시도
+- Python에서는 메모리 배리어를 쓸 수 없으므로 (ARM에서 저장 순서가 바뀔 수 있음)
+  레코드와 링 버퍼 행마다 CRC32를 함께 기록하고, 읽은 값의 CRC가 다르면 torn read로 보고 재시도
+- 웹 워커는 같은 세그먼트를 매핑하여 락/IPC 없이 직접 읽기
+- 스칼라가 아닌 처리기 결과(SHM_EXTRA_FIELDS)는 JSON으로 고정 크기 영역에 함께 기록
+- 채널 목록은 세그먼트에 기록 (기본 채널 + 수집 데몬의 필터/파생 채널 설정에 따른 추가 채널),
+  읽는 쪽은 설정과 관계없이 세그먼트의 채널 목록으로 레이아웃을 계산
+
+레이아웃 (리틀 엔디언, 모든 오프셋 8바이트 정렬):
+    [0]   헤더     magic(4s) layout_version(H) channel_count(H) ring_capacity(I) flags(I)
+    [16]  seqlock  u64 (홀수 = 기록 중)
+    [24]  채널 이름 length(I) 예약(I) 쉼표로 구분한 UTF-8(CHANNEL_NAMES_CAPACITY 바이트)
+    [..]  레코드   sample_seq(Q) sample_count(Q) acquired_at(d) status_bits(I) checksum(I) values(d × 채널 수)
+    [..]  추가 필드 length(I) checksum(I) JSON(EXTRAS_CAPACITY 바이트)
+    [..]  링 버퍼  타임스탬프(d × 용량), 채널별 값(d × 용량) × 채널 수, 행 CRC32(d × 용량)
+값이 없는 채널은 NaN으로 기록
+레코드 checksum은 checksum=0으로 압축한 레코드의 CRC32, 행 CRC32는 (타임스탬프, 채널 값...) 행의 CRC32,
+추가 필드 checksum은 JSON 바이트의 CRC32
+"""
+
+import json
+import math
+import time
+import zlib
+import struct
+import threading
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+from json_codec import dumps_bytes
+from sensor_acquisition import SensorAcquisitionThread, SensorSnapshot
+
+SHM_NAME = 'egdash_snapshot'
+SHM_MAGIC = b'EGSM'
+SHM_LAYOUT_VERSION = 6
+DEFAULT_RING_CAPACITY = 3600  # 1초 수집 기준 1시간
+
+# 기본 채널 (추가 채널은 이 뒤에 붙음, 채널 목록은 세그먼트에 기록되므로 순서 변경 시 버전 증가 불필요)
+SHM_CHANNELS = (
+    'temperature', 'humidity', 'pressure', 'differential_pressure', 'light',
+    'vibration', 'gas_resistance', 'air_quality', 'absolute_pressure',
+    'pm1', 'pm25', 'pm4', 'pm10',
+    'dew_point', 'absolute_humidity', 'heat_index',  # 기본 파생 채널 (derived_channels.py)
+    'iaq',  # BME688 IAQ 지수 (iaq_estimator.py)
+    'differential_pressure_raw', 'light_raw'  # 필터 적용 전 원본 (noise_filters.py)
+)
+SHM_STATUS_SENSORS = ('bme688', 'bh1750', 'sht40', 'sdp810', 'sps30')
+
+# 스냅샷 처리기가 남기는 구조 필드 (웹 워커의 /api/anomaly, /api/alerts, /api/stats가 데몬 결과를 그대로 제공)
+SHM_EXTRA_FIELDS = ('anomaly', 'alerts', 'alert_events', 'stats')
+EXTRAS_CAPACITY = 32768  # 넘치면 해당 샘플의 추가 필드는 비움 (overflow_count 증가)
+
+CHANNEL_NAMES_CAPACITY = 2048
+
+FLAG_CLOSED = 0x1  # 기록 프로세스 종료 (읽는 쪽은 다시 연결)
+
+_TORN = object()  # CRC 불일치 (기록 중인 값을 읽음)
+
+HEADER = struct.Struct('<4sHHII')
+SEQLOCK = struct.Struct('<Q')
+NAMES_HEADER = struct.Struct('<II')
+EXTRAS_HEADER = struct.Struct('<II')
+DOUBLE = struct.Struct('<d')
+
+SEQLOCK_OFFSET = HEADER.size
+NAMES_OFFSET = SEQLOCK_OFFSET + SEQLOCK.size
+RECORD_OFFSET = NAMES_OFFSET + NAMES_HEADER.size + CHANNEL_NAMES_CAPACITY
+
+
+def shm_channels(extra_channels=()) -> Tuple[str, ...]:
+    """기본 채널 + 추가 채널 (이미 있는 채널은 제외, 순서 유지)"""
+    channels = list(SHM_CHANNELS)
+    for channel in extra_channels:
+        if channel not in channels:
+            channels.append(channel)
+    return tuple(channels)
+
+
+class SegmentLayout:
+    """채널 목록으로 정해지는 레코드/링 버퍼 구조와 오프셋"""
+    
+    def __init__(self, channels, ring_capacity: int):
+        self.channels = tuple(channels)
+        self.ring_capacity = ring_capacity
+        self.columns = {channel: index + 1 for index, channel in enumerate(self.channels)}  # 0열은 타임스탬프
+        self.record = struct.Struct('<QQdII' + 'd' * len(self.channels))
+        self.row = struct.Struct('<d' + 'd' * len(self.channels))  # 링 버퍼 행 (CRC 계산용)
+        self.checksum_column = 1 + len(self.channels)  # 링 버퍼 행 CRC 열 번호
+        self.extras_offset = RECORD_OFFSET + self.record.size
+        self.ring_offset = self.extras_offset + EXTRAS_HEADER.size + EXTRAS_CAPACITY
+        self.size = self.ring_offset + DOUBLE.size * ring_capacity * (self.checksum_column + 1)
+    
+    def cell_offset(self, column: int, slot: int = 0) -> int:
+        """링 버퍼 column열 slot행의 바이트 오프셋"""
+        return self.ring_offset + DOUBLE.size * (column * self.ring_capacity + slot)
+    
+    def column(self, channel: str) -> int:
+        """
+        채널의 링 버퍼 열 번호
+        
+        Raises:
+            ValueError: 세그먼트에 없는 채널
+        """
+        if channel not in self.columns:
+            raise ValueError(f"공유 메모리 링 버퍼에 없는 채널: {channel}")
+        return self.columns[channel]
+
+
+def segment_size(ring_capacity: int, channels=SHM_CHANNELS) -> int:
+    """세그먼트 전체 크기 (바이트)"""
+    return SegmentLayout(channels, ring_capacity).size
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    기존 세그먼트에 연결 (resource_tracker 등록 해제)
+    
+    Python 3.12 이하는 연결만 한 프로세스도 종료 시 세그먼트를 삭제하므로
+    소유자(수집 데몬)만 삭제하도록 추적 대상에서 제외
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class SharedMemorySnapshotWriter:
+    """수집 데몬용 공유 메모리 기록기 (SnapshotBroadcaster와 같은 publish 인터페이스)"""
+    
+    def __init__(self, name: str = SHM_NAME, ring_capacity: int = DEFAULT_RING_CAPACITY,
+                 channels=SHM_CHANNELS):
+        """
+        세그먼트 생성 (같은 이름의 이전 세그먼트가 남아 있으면 삭제 후 생성)
+        
+        Args:
+            name: 공유 메모리 이름 (/dev/shm/<name>)
+            ring_capacity: 채널별 링 버퍼 샘플 수
+            channels: 기록할 채널 목록 (shm_channels()로 추가 채널 포함)
+        
+        Raises:
+            ValueError: 채널 이름에 쉼표가 있거나 이름 목록이 CHANNEL_NAMES_CAPACITY를 넘음
+        """
+        names = ','.join(channels).encode('utf-8')
+        if any(',' in channel for channel in channels) or len(names) > CHANNEL_NAMES_CAPACITY:
+            raise ValueError(f"공유 메모리 채널 목록을 기록할 수 없음: {len(channels)}채널, {len(names)}바이트")
+        
+        self.name = name
+        self.ring_capacity = ring_capacity
+        self.layout = SegmentLayout(channels, ring_capacity)
+        size = self.layout.size
+        
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        
+        self._buf = self._shm.buf
+        self._seq = 0
+        self._sample_count = 0
+        self.published_count = 0
+        self.overflow_count = 0
+        
+        # 채널 목록을 먼저 기록하고 헤더(magic)는 마지막에 기록 (magic이 보이면 목록도 완성된 상태)
+        NAMES_HEADER.pack_into(self._buf, NAMES_OFFSET, len(names), 0)
+        start = NAMES_OFFSET + NAMES_HEADER.size
+        self._buf[start:start + len(names)] = names
+        SEQLOCK.pack_into(self._buf, SEQLOCK_OFFSET, 0)
+        HEADER.pack_into(self._buf, 0, SHM_MAGIC, SHM_LAYOUT_VERSION, len(self.layout.channels), ring_capacity, 0)
+    
+    def publish(self, snapshot: Dict):
+        """스냅샷 기록 (seqlock: 시작 시 홀수, 완료 시 짝수, 레코드/추가 필드/링 행에 CRC32 포함)"""
+        layout = self.layout
+        values = [snapshot.get(channel) for channel in layout.channels]
+        values = [math.nan if value is None else float(value) for value in values]
+        status = snapshot.get('sensor_status', {})
+        status_bits = 0
+        for bit, sensor in enumerate(SHM_STATUS_SENSORS):
+            if status.get(sensor):
+                status_bits |= 1 << bit
+        acquired_at = snapshot.get('acquired_at') or time.time()
+        
+        record = [snapshot.get('seq', 0), self._sample_count + 1, acquired_at, status_bits, 0] + values
+        record[4] = zlib.crc32(layout.record.pack(*record))
+        row = [acquired_at] + values
+        row_checksum = zlib.crc32(layout.row.pack(*row))
+        
+        extras = {field: snapshot[field] for field in SHM_EXTRA_FIELDS if snapshot.get(field) is not None}
+        payload = dumps_bytes(extras) if extras else b''
+        if len(payload) > EXTRAS_CAPACITY:
+            self.overflow_count += 1
+            payload = b''
+        
+        buf = self._buf
+        slot = self._sample_count % self.ring_capacity
+        
+        self._seq += 1
+        SEQLOCK.pack_into(buf, SEQLOCK_OFFSET, self._seq)
+        
+        layout.record.pack_into(buf, RECORD_OFFSET, *record)
+        EXTRAS_HEADER.pack_into(buf, layout.extras_offset, len(payload), zlib.crc32(payload))
+        start = layout.extras_offset + EXTRAS_HEADER.size
+        buf[start:start + len(payload)] = payload
+        for column, value in enumerate(row):
+            DOUBLE.pack_into(buf, layout.cell_offset(column, slot), value)
+        DOUBLE.pack_into(buf, layout.cell_offset(layout.checksum_column, slot), row_checksum)
+        
+        self._sample_count += 1
+        self._seq += 1
+        SEQLOCK.pack_into(buf, SEQLOCK_OFFSET, self._seq)
+        self.published_count += 1
+    
+    def close(self):
+        """세그먼트 해제 및 삭제 (읽는 쪽에는 종료 플래그로 알림)"""
+        HEADER.pack_into(self._buf, 0, SHM_MAGIC, SHM_LAYOUT_VERSION, len(self.layout.channels),
+                         self.ring_capacity, FLAG_CLOSED)
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+    
+    def get_status(self) -> Dict:
+        """기록기 상태 정보 반환"""
+        return {
+            'name': self.name,
+            'size': self.layout.size,
+            'ring_capacity': self.ring_capacity,
+            'channels': list(self.layout.channels),
+            'published_count': self.published_count,
+            'overflow_count': self.overflow_count
+        }
+
+
+class SharedMemorySnapshotReader:
+    """공유 메모리 스냅샷 읽기 (모든 프로세스에서 사용 가능, 기록기와는 락 없음)"""
+    
+    def __init__(self, name: str = SHM_NAME, max_retries: int = 100):
+        """
+        기존 세그먼트에 연결
+        
+        Raises:
+            FileNotFoundError: 세그먼트가 아직 없음 (수집 데몬 미실행)
+            ValueError: 레이아웃 불일치
+        """
+        self.name = name
+        self.max_retries = max_retries
+        self._shm = _attach_untracked(name)
+        self._buf = self._shm.buf
+        
+        # 같은 프로세스의 스레드 사이 보호 (읽는 도중 close()로 버퍼가 해제되지 않도록)
+        self._lock = threading.Lock()
+        
+        magic, version, channel_count, ring_capacity, _ = HEADER.unpack_from(self._buf, 0)
+        channels = ()
+        if magic == SHM_MAGIC and version == SHM_LAYOUT_VERSION:
+            length = NAMES_HEADER.unpack_from(self._buf, NAMES_OFFSET)[0]
+            start = NAMES_OFFSET + NAMES_HEADER.size
+            if length <= CHANNEL_NAMES_CAPACITY:
+                channels = tuple(bytes(self._buf[start:start + length]).decode('utf-8', 'replace').split(','))
+        if len(channels) != channel_count or SegmentLayout(channels, ring_capacity).size > self._shm.size:
+            self.close()
+            raise ValueError(f"공유 메모리 레이아웃 불일치: {magic!r} v{version} ({channel_count}채널)")
+        self.ring_capacity = ring_capacity
+        self.layout = SegmentLayout(channels, ring_capacity)
+        self.channels = self.layout.channels
+        self.torn_read_count = 0
+        self.checksum_error_count = 0
+    
+    @property
+    def closed_by_writer(self) -> bool:
+        """기록 프로세스가 세그먼트를 닫았는지 여부 (연결을 해제한 뒤에도 True)"""
+        with self._lock:
+            if self._buf is None:
+                return True
+            return bool(HEADER.unpack_from(self._buf, 0)[4] & FLAG_CLOSED)
+    
+    def sequence(self) -> Optional[int]:
+        """현재 seqlock 값 (변경 감지용, 짝수 = 안정 상태, 연결 해제 후에는 None)"""
+        with self._lock:
+            if self._buf is None:
+                return None
+            return SEQLOCK.unpack_from(self._buf, SEQLOCK_OFFSET)[0]
+    
+    def _read_consistent(self, read_fn):
+        """
+        seqlock 검증 읽기 (기록 중이거나, 읽는 동안 바뀌었거나, CRC가 맞지 않으면 재시도)
+        
+        read_fn(buf)은 CRC 불일치 시 _TORN 반환
+        """
+        with self._lock:
+            buf = self._buf
+            if buf is None:
+                return None, None
+            for _ in range(self.max_retries):
+                before = SEQLOCK.unpack_from(buf, SEQLOCK_OFFSET)[0]
+                if before & 1:
+                    time.sleep(0)
+                    continue
+                result = read_fn(buf)
+                if result is not _TORN and SEQLOCK.unpack_from(buf, SEQLOCK_OFFSET)[0] == before:
+                    return before, result
+                if result is _TORN:
+                    self.checksum_error_count += 1
+                self.torn_read_count += 1
+            return None, None
+    
+    def read_current(self) -> Optional[Dict]:
+        """
+        최신 스냅샷 읽기
+        
+        Returns:
+            Dict: read_all_sensors() 형식 + source_seq, acquired_at, SHM_EXTRA_FIELDS (기록 전이면 None)
+        """
+        layout = self.layout
+        
+        def read(buf):
+            record = layout.record.unpack_from(buf, RECORD_OFFSET)
+            if record[1] == 0:
+                return record, b''  # 아직 기록 전 (전부 0)
+            expected = record[4]
+            unchecked = list(record)
+            unchecked[4] = 0
+            if zlib.crc32(layout.record.pack(*unchecked)) != expected:
+                return _TORN
+            length, checksum = EXTRAS_HEADER.unpack_from(buf, layout.extras_offset)
+            if length > EXTRAS_CAPACITY:
+                return _TORN
+            start = layout.extras_offset + EXTRAS_HEADER.size
+            payload = bytes(buf[start:start + length])
+            return (record, payload) if zlib.crc32(payload) == checksum else _TORN
+        
+        _, result = self._read_consistent(read)
+        if result is None:
+            return None
+        record, payload = result
+        if record[1] == 0:
+            return None
+        
+        source_seq, _, acquired_at, status_bits, _ = record[:5]
+        data = {
+            'timestamp': datetime.fromtimestamp(acquired_at).strftime('%Y-%m-%d %H:%M:%S'),
+            'acquired_at': acquired_at,
+            'source_seq': source_seq
+        }
+        for channel, value in zip(layout.channels, record[5:]):
+            data[channel] = None if math.isnan(value) else value
+        data['sensor_status'] = {
+            sensor: bool(status_bits & (1 << bit)) for bit, sensor in enumerate(SHM_STATUS_SENSORS)
+        }
+        if payload:
+            data.update(json.loads(payload))
+        return data
+    
+    def ring_view(self, channel: Optional[str] = None) -> memoryview:
+        """
+        링 버퍼 원본 뷰 (복사 없음, float64 배열)
+        
+        Args:
+            channel: 채널 이름 (None이면 타임스탬프 링)
+        
+        seqlock/CRC 검증 없이 노출되므로 일관된 값이 필요하면 read_history() 사용
+        (뷰를 해제하기 전에는 close()가 실패하므로 사용 후 release() 호출)
+        """
+        index = 0 if channel is None else self.layout.column(channel)
+        return self._column_view(self._buf, index)
+    
+    def _column_view(self, buf, column: int) -> memoryview:
+        start = self.layout.cell_offset(column)
+        return buf[start:start + DOUBLE.size * self.ring_capacity].cast('d')
+    
+    def _read_rows(self, buf, count: int):
+        """
+        링 버퍼 최근 count개 행 전체 읽기 (_read_consistent 안에서 호출)
+        
+        Returns:
+            List[tuple]: (타임스탬프, 채널 값...) 행 목록 (행 CRC 불일치 시 _TORN)
+        """
+        capacity = self.ring_capacity
+        layout = self.layout
+        sample_count = layout.record.unpack_from(buf, RECORD_OFFSET)[1]
+        n = min(count, sample_count, capacity)
+        first = (sample_count - n) % capacity
+        # 링이 한 바퀴 돌았으면 두 구간으로 나눠 열 단위로 한 번에 복사
+        spans = [(first, first + n)] if first + n <= capacity else [(first, capacity), (0, first + n - capacity)]
+        
+        columns = []
+        for column in range(layout.checksum_column + 1):
+            with self._column_view(buf, column) as view:
+                values = []
+                for start, end in spans:
+                    values.extend(view[start:end].tolist())
+            columns.append(values)
+        
+        checksums = columns.pop()
+        rows = list(zip(*columns))
+        for row, checksum in zip(rows, checksums):
+            if zlib.crc32(layout.row.pack(*row)) != checksum:
+                return _TORN
+        return rows
+    
+    def read_history(self, channel: str, count: int) -> List[Tuple[float, Optional[float]]]:
+        """
+        채널의 최근 샘플 읽기 (오래된 순)
+        
+        Returns:
+            List[Tuple[float, Optional[float]]]: (acquired_at, 값) 목록
+        """
+        history = self.read_columns((channel,), count)
+        return list(zip(history['timestamps'], history[channel]))
+    
+    def read_columns(self, channels, count: int) -> Dict[str, List]:
+        """
+        여러 채널의 최근 샘플을 한 번의 seqlock 구간에서 읽기 (오래된 순, 같은 행끼리 정렬됨)
+        
+        Args:
+            channels: 채널 이름 목록
+            count: 최대 샘플 수
+        
+        Returns:
+            Dict: {'timestamps': [...], 채널 이름: [값 또는 None, ...]}
+        
+        Raises:
+            ValueError: 공유 메모리 레이아웃에 없는 채널
+        """
+        indexes = {channel: self.layout.column(channel) for channel in channels}
+        
+        _, rows = self._read_consistent(lambda buf: self._read_rows(buf, count))
+        rows = rows or []
+        result = {'timestamps': [row[0] for row in rows]}
+        for channel, index in indexes.items():
+            result[channel] = [None if math.isnan(row[index]) else row[index] for row in rows]
+        return result
+    
+    def close(self):
+        """세그먼트 연결 해제 (삭제는 기록 프로세스가 담당, 진행 중인 읽기가 끝난 뒤 해제)"""
+        with self._lock:
+            if self._buf is None:
+                return
+            self._buf = None
+            self._shm.close()
+
+
+class SharedMemorySnapshotFollower(SensorAcquisitionThread):
+    """웹 워커용 공유 메모리 스냅샷 추적 스레드 (SensorAcquisitionThread와 같은 조회 인터페이스)"""
+    
+    label = "공유 메모리 스냅샷 추적 스레드"
+    
+    def __init__(self, name: str = SHM_NAME, broadcaster=None, interval=0.1, eager_shapes=None,
+                 stale_timeout=10.0):
+        """
+        추적 스레드 초기화
+        
+        Args:
+            name: 공유 메모리 이름
+            broadcaster: 새 스냅샷을 전달할 SnapshotBroadcaster
+            interval: seqlock 변경 확인 간격 (초)
+            eager_shapes: 새 스냅샷 수신 직후 미리 직렬화할 응답 형태 {이름: builder}
+            stale_timeout: 갱신이 없으면 세그먼트에 다시 연결하는 시간 (데몬 재시작 대비)
+        """
+        super().__init__(None, broadcaster, interval, eager_shapes)
+        self.name = name
+        self.stale_timeout = stale_timeout
+        self.reader = None
+        self._last_sequence = None
+        self._last_change = time.time()
+        self.source_seq = None
+        
+        # 연결/해제와 추적 주기 직렬화 (stop()의 해제가 진행 중인 읽기와 겹치지 않도록)
+        self._reader_lock = threading.RLock()
+    
+    def _detach(self):
+        """세그먼트 연결 해제 (다음 주기에 다시 연결)"""
+        with self._reader_lock:
+            if self.reader:
+                self.reader.close()
+            self.reader = None
+            self._last_sequence = None
+    
+    def _acquire_snapshot(self) -> Optional[SensorSnapshot]:
+        """seqlock 값이 바뀌었으면 새 스냅샷 생성 (변경 없으면 None)"""
+        with self._reader_lock:
+            return self._follow()
+    
+    def _follow(self) -> Optional[SensorSnapshot]:
+        if self.reader is None:
+            try:
+                self.reader = SharedMemorySnapshotReader(self.name)
+            except FileNotFoundError:
+                return None
+            self._last_change = time.time()
+        
+        sequence = self.reader.sequence()
+        if sequence == self._last_sequence or sequence & 1:
+            # 데몬이 종료/재시작되어 세그먼트가 교체된 경우 다시 연결
+            if self.reader.closed_by_writer or time.time() - self._last_change > self.stale_timeout:
+                self._detach()
+            return None
+        
+        data = self.reader.read_current()
+        if data is None:
+            return None
+        
+        self._last_sequence = sequence
+        self._last_change = time.time()
+        self.source_seq = data['source_seq']
+        return self._store_snapshot(SensorSnapshot(data))
+    
+    def stop(self):
+        """추적 스레드 중지 및 세그먼트 연결 해제"""
+        super().stop()
+        self._detach()
+    
+    def get_status(self) -> Dict:
+        """추적 스레드 상태 정보 반환"""
+        status = super().get_status()
+        status['shm_name'] = self.name
+        status['source_seq'] = self.source_seq
+        reader = self.reader
+        status['torn_read_count'] = reader.torn_read_count if reader else 0
+        status['checksum_error_count'] = reader.checksum_error_count if reader else 0
+        return status
@@ -6,6 +6,7 @@ SHT40 온습도센서 클래스
 
 import time
 import smbus2
+from tracer import TRACER
 
 
 class SHT40Sensor:
@@ -23,6 +24,8 @@ class SHT40Sensor:
         # 오류 관리
         self.error_count = 0
         self.success_count = 0
+        self.retry_count = 0       # 누적 재시도 횟수
+        self.crc_error_count = 0   # 누적 CRC 검증 실패 횟수
         self.last_error_log = 0
         self.last_success_data = None
         self.last_success_time = 0
@@ -77,13 +80,17 @@ class SHT40Sensor:
             try:
                 # I2C 버스 안정화를 위한 적응형 딜레이
                 if attempt > 0:
+                    self.retry_count += 1
+                    TRACER.instant('sht40.retry', 'sensor', attempt=attempt)
                     delay = 0.05 + (attempt * 0.02)  # 50ms, 70ms, 90ms
-                    time.sleep(delay)
+                    with TRACER.span('sht40.retry_delay', 'sleep'):
+                        time.sleep(delay)
                 
                 # 고정밀 측정 명령 전송
                 write_msg = smbus2.i2c_msg.write(self.address, [self.CMD_MEASURE_HIGH_PRECISION])
                 self.bus.i2c_rdwr(write_msg)
-                time.sleep(0.03)  # 측정 시간 여유 확대
+                with TRACER.span('sht40.measure_wait', 'sleep'):
+                    time.sleep(0.03)  # 측정 시간 여유 확대
                 
                 # 6바이트 데이터 읽기
                 read_msg = smbus2.i2c_msg.read(self.address, 6)
@@ -105,6 +112,8 @@ class SHT40Sensor:
                     
                     if not (t_crc_ok and rh_crc_ok):
                         # CRC 실패 시 다음 시도
+                        self.crc_error_count += 1
+                        TRACER.instant('sht40.crc_error', 'sensor', attempt=attempt)
                         if attempt < 2:
                             continue
                         else:
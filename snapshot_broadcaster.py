@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+센서 스냅샷 브로드캐스터
+- 수집 스레드가 발행한 스냅샷을 모든 구독자(SSE 클라이언트)에게 한 번씩 전달
+- 구독자별 제한된 큐 사용, 느린 클라이언트는 가장 오래된 스냅샷부터 폐기
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List
+
+
+class SnapshotSubscription:
+    """스냅샷 구독자 (클라이언트 1개당 1개)"""
+    
+    def __init__(self, broadcaster, max_queue=16):
+        self._broadcaster = broadcaster
+        self._queue = deque(maxlen=max_queue)  # 가득 차면 가장 오래된 항목 자동 폐기
+        self.dropped_count = 0
+        self.closed = False
+    
+    def _push(self, snapshot):
+        """스냅샷 추가 (브로드캐스터 락 보유 상태에서 호출)"""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped_count += 1
+        self._queue.append(snapshot)
+    
+    def get(self, timeout: float = 15.0) -> List[Dict]:
+        """
+        대기 중인 스냅샷 모두 반환
+        
+        Args:
+            timeout: 새 스냅샷 대기 시간 (초)
+        
+        Returns:
+            List[Dict]: 스냅샷 목록 (타임아웃 시 빈 리스트)
+        """
+        with self._broadcaster._condition:
+            if not self._queue and not self.closed:
+                self._broadcaster._condition.wait(timeout)
+            
+            snapshots = list(self._queue)
+            self._queue.clear()
+            return snapshots
+    
+    def close(self):
+        """구독 해제"""
+        self._broadcaster.unsubscribe(self)
+
+
+class SnapshotBroadcaster:
+    """스냅샷 팬아웃 브로드캐스터 (Thread-safe)"""
+    
+    def __init__(self, max_queue=16):
+        """
+        브로드캐스터 초기화
+        
+        Args:
+            max_queue: 구독자별 최대 대기 스냅샷 수
+        """
+        self.max_queue = max_queue
+        self._condition = threading.Condition()
+        self._subscribers = []
+        self.published_count = 0
+    
+    def subscribe(self) -> SnapshotSubscription:
+        """새 구독자 등록"""
+        subscription = SnapshotSubscription(self, self.max_queue)
+        with self._condition:
+            self._subscribers.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: SnapshotSubscription):
+        """구독자 해제"""
+        with self._condition:
+            subscription.closed = True
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            self._condition.notify_all()
+    
+    def publish(self, snapshot: Dict):
+        """스냅샷을 모든 구독자에게 전달"""
+        with self._condition:
+            self.published_count += 1
+            for subscription in self._subscribers:
+                subscription._push(snapshot)
+            self._condition.notify_all()
+    
+    def get_status(self) -> Dict:
+        """브로드캐스터 상태 정보 반환"""
+        with self._condition:
+            return {
+                'subscriber_count': len(self._subscribers),
+                'published_count': self.published_count,
+                'dropped_count': sum(s.dropped_count for s in self._subscribers),
+                'queued_count': sum(len(s._queue) for s in self._subscribers),
+                'max_queue': self.max_queue
+            }
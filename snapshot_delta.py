@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+스냅샷 델타 인코딩 모듈
+- 채널 값을 대시보드 표시 자릿수로 반올림 (표시에 영향 없는 미세 변화 제거)
+- 직전 스냅샷 대비 값/상태가 바뀐 채널만 추출
+"""
+
+import math
+from typing import Dict, Optional
+
+# 채널별 표시 자릿수 (static/js/script.js 표시 형식과 동일)
+DISPLAY_PRECISION = {
+    'temperature': 1,
+    'humidity': 1,
+    'pressure': 1,
+    'absolute_pressure': 1,
+    'differential_pressure': 1,
+    'differential_pressure_raw': 1,
+    'light': 0,
+    'light_raw': 0,
+    'air_quality': 0,
+    'iaq': 0,
+    'gas_resistance': 0,
+    'vibration': 2,
+    'pm1': 1,
+    'pm25': 1,
+    'pm4': 1,
+    'pm10': 1,
+    'dew_point': 1,
+    'absolute_humidity': 1,
+    'heat_index': 1
+}
+
+
+def round_payload(payload: Dict) -> Dict:
+    """채널 값을 표시 자릿수로 반올림한 사본 반환 (NaN/무한대는 값 없음(None)으로 표시)"""
+    rounded = dict(payload)
+    for channel, digits in DISPLAY_PRECISION.items():
+        value = rounded.get(channel)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if not math.isfinite(value):
+                rounded[channel] = None
+                continue
+            rounded[channel] = round(value, digits) if digits else int(round(value))
+    return rounded
+
+
+def diff_payload(previous: Optional[Dict], current: Dict) -> Dict:
+    """
+    직전 페이로드 대비 바뀐 항목만 반환
+    
+    Args:
+        previous: 직전 페이로드 (None이면 전체를 변경으로 간주)
+        current: 현재 페이로드
+    
+    Returns:
+        Dict: 변경된 키와 새 값 (sensor_status는 바뀐 센서만 포함)
+    """
+    if previous is None:
+        return dict(current)
+    
+    changes = {}
+    for key, value in current.items():
+        if key == 'sensor_status':
+            status_changes = {
+                sensor: connected
+                for sensor, connected in value.items()
+                if previous.get('sensor_status', {}).get(sensor) != connected
+            }
+            if status_changes:
+                changes['sensor_status'] = status_changes
+        elif previous.get(key) != value:
+            changes[key] = value
+    
+    return changes
@@ -9,37 +9,53 @@ SPS30 센서 백그라운드 스레드 처리 클래스
 import time
 import threading
 import queue
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, Dict
 import logging
+from importlib.util import find_spec
+from metrics import SENSOR_READ_SECONDS, SENSOR_READ_FAILURES
 
-# SPS30 관련 imports
-try:
+# SPS30 관련 라이브러리 설치 여부만 확인 (실제 import는 장치를 처음 열 때, pyserial 등 로딩 비용 지연)
+SPS30_AVAILABLE = find_spec('shdlc_sps30') is not None and find_spec('sensirion_shdlc_driver') is not None
+
+
+@contextmanager
+def _open_shdlc_device(port_path):
+    """SHDLC 시리얼 포트로 SPS30 장치 연결"""
     from shdlc_sps30 import Sps30ShdlcDevice
     from sensirion_shdlc_driver import ShdlcSerialPort, ShdlcConnection
-    from sensirion_shdlc_driver.errors import ShdlcError
-    SPS30_AVAILABLE = True
-except ImportError:
-    print("⚠️ SPS30 라이브러리가 설치되지 않았습니다.")
-    SPS30_AVAILABLE = False
+    
+    with ShdlcSerialPort(port=port_path, baudrate=115200) as port:
+        yield Sps30ShdlcDevice(ShdlcConnection(port))
 
 
 class SPS30BackgroundThread:
     """SPS30 센서 전용 백그라운드 스레드 처리 클래스"""
     
-    def __init__(self, port_path=None, update_interval=15):
+    def __init__(self, port_path=None, update_interval=15, device_opener=None):
         """
         백그라운드 스레드 초기화
         
         Args:
             port_path: SPS30 시리얼 포트 경로 (None이면 자동 검색)
             update_interval: 데이터 업데이트 간격 (초, 기본 15초)
+            device_opener: 포트 경로로 SPS30 장치를 여는 컨텍스트 매니저 함수
+                           (기본: SHDLC 시리얼 포트, 에뮬레이터 주입용)
         """
         self.port_path = port_path
         self.update_interval = update_interval
         self.running = False
         self.thread = None
         
+        # 장치 연결 방식 (주입된 opener가 있으면 SHDLC 라이브러리 없이도 동작)
+        self.device_opener = device_opener or _open_shdlc_device
+        self.available = SPS30_AVAILABLE or device_opener is not None
+        
+        # 리셋/측정 시작 후 안정화 대기 시간 (초)
+        self.reset_settle_time = 3
+        self.measurement_settle_time = 6
+        
         # Thread-safe 데이터 저장
         self._data_lock = threading.RLock()
         self._cached_data = {
@@ -64,7 +80,7 @@ class SPS30BackgroundThread:
         self.logger.setLevel(logging.INFO)
         
         # 초기화 시도
-        if SPS30_AVAILABLE:
+        if self.available:
             self._initialize_sensor()
     
     def _initialize_sensor(self):
@@ -78,8 +94,7 @@ class SPS30BackgroundThread:
                 return False
                 
             # 센서 연결 테스트
-            with ShdlcSerialPort(port=self.port_path, baudrate=115200) as port:
-                device = Sps30ShdlcDevice(ShdlcConnection(port))
+            with self.device_opener(self.port_path) as device:
                 self.serial_number = device.device_information_serial_number()
                 
                 if self.serial_number:
@@ -105,8 +120,7 @@ class SPS30BackgroundThread:
         
         for port_path in port_candidates:
             try:
-                with ShdlcSerialPort(port=port_path, baudrate=115200) as port:
-                    device = Sps30ShdlcDevice(ShdlcConnection(port))
+                with self.device_opener(port_path) as device:
                     serial_number = device.device_information_serial_number()
                     
                     if serial_number:
@@ -121,16 +135,14 @@ class SPS30BackgroundThread:
     def _read_sensor_data(self):
         """실제 센서 데이터 읽기 (충분한 시간 확보)"""
         try:
-            with ShdlcSerialPort(port=self.port_path, baudrate=115200) as port:
-                device = Sps30ShdlcDevice(ShdlcConnection(port))
-                
+            with self.device_opener(self.port_path) as device:
                 # 센서 리셋 및 안정화 (충분한 시간 확보)
                 device.device_reset()
-                time.sleep(3)  # 리셋 후 안정화
+                time.sleep(self.reset_settle_time)  # 리셋 후 안정화
                 
                 # 측정 시작
                 device.start_measurement()
-                time.sleep(6)  # 측정 안정화 시간
+                time.sleep(self.measurement_settle_time)  # 측정 안정화 시간
                 
                 # 데이터 읽기
                 data = device.read_measured_value()
@@ -178,8 +190,12 @@ class SPS30BackgroundThread:
         
         while self.running:
             try:
-                # 센서 데이터 읽기
+                # 센서 데이터 읽기 (UART 측정 1주기 소요 시간 기록)
+                read_start = time.perf_counter()
                 new_data = self._read_sensor_data()
+                SENSOR_READ_SECONDS.observe(time.perf_counter() - read_start, sensor='sps30')
+                if not new_data:
+                    SENSOR_READ_FAILURES.inc(sensor='sps30')
                 
                 # Thread-safe 데이터 업데이트
                 with self._data_lock:
@@ -222,7 +238,7 @@ class SPS30BackgroundThread:
     
     def start(self):
         """백그라운드 스레드 시작"""
-        if not SPS30_AVAILABLE:
+        if not self.available:
             print("❌ SPS30 라이브러리가 없어 백그라운드 스레드 시작 불가")
             return False
             
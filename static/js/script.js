@@ -76,6 +76,10 @@ const SENSOR_UPDATE_INTERVALS = {
 };
 
 let sensorTimers = {};
+let sensorEventSource = null;
+let lastStreamUpdate = {};
+let streamState = null;
+let streamLastSeq = 0;
 let lastSensorData = {};
 let logPaused = false;
 let maxLogEntries = 100;
@@ -204,75 +208,153 @@ async function initializeSensorScheduler() {
     console.log('🔄 센서별 차별화된 업데이트 스케줄러 시작');
     addSensorLog('센서별 차별화된 업데이트 스케줄러 시작', 'info');
     
-    // 기존 타이머 정리
+    // 기존 타이머 및 스트림 정리
     Object.values(sensorTimers).forEach(timer => clearInterval(timer));
     sensorTimers = {};
+    if (sensorEventSource) {
+        sensorEventSource.close();
+        sensorEventSource = null;
+    }
     
     // 먼저 센서 상태 확인
     const connectedSensors = await getConnectedSensors();
     console.log('🔍 연결된 센서들:', connectedSensors);
     
-    // 연결된 센서들만 타이머 설정
-    Object.entries(SENSOR_UPDATE_INTERVALS).forEach(([sensorType, interval]) => {
-        if (connectedSensors.includes(sensorType)) {
-            console.log(`📊 ${sensorType} 센서: ${interval}ms 간격으로 업데이트`);
-            addSensorLog(`${interval}ms 간격으로 업데이트 스케줄 설정`, 'info', sensorType.toUpperCase());
-            
-            sensorTimers[sensorType] = setInterval(() => {
-                updateSpecificSensorData(sensorType);
-            }, interval);
-            
-            // 초기 데이터 로드 (0.5초씩 지연하여 동시 호출 방지)
-            setTimeout(() => {
-                updateSpecificSensorData(sensorType);
-            }, connectedSensors.indexOf(sensorType) * 500);
-        } else {
-            console.log(`❌ ${sensorType} 센서: 연결되지 않음 - 스케줄링 생략`);
-            addSensorLog(`연결되지 않음 - 업데이트 생략`, 'warning', sensorType.toUpperCase());
+    // SSE 지원 브라우저는 단일 스트림 연결 사용
+    if (window.EventSource) {
+        startSensorStream(connectedSensors);
+    } else {
+        startSensorPolling(connectedSensors);
+    }
+}
+
+// SSE 델타 스트림으로 센서 데이터 수신 (센서별 폴링 타이머 대체)
+function startSensorStream(connectedSensors) {
+    addSensorLog('SSE 스트림 연결 - 서버 푸시 방식으로 업데이트', 'info');
+    lastStreamUpdate = {};
+    streamState = null;
+    streamLastSeq = 0;
+    
+    if (sensorEventSource) {
+        sensorEventSource.close();
+    }
+    sensorEventSource = new EventSource(`${API_URL}/stream?mode=delta`);
+    
+    // 키프레임: 전체 값으로 상태 초기화
+    sensorEventSource.addEventListener('keyframe', (event) => {
+        const keyframe = JSON.parse(event.data);
+        streamState = keyframe;
+        streamLastSeq = keyframe.seq;
+        applyStreamSnapshot(connectedSensors, streamState);
+    });
+    
+    // 델타: 바뀐 채널만 병합 (순번이 끊기면 재접속하여 키프레임 재수신)
+    sensorEventSource.addEventListener('delta', (event) => {
+        const delta = JSON.parse(event.data);
+        if (!streamState || delta.prev_seq !== streamLastSeq) {
+            addSensorLog(`스트림 순번 누락 (${streamLastSeq} → ${delta.seq}) - 재동기화`, 'warning');
+            startSensorStream(connectedSensors);
+            return;
+        }
+        
+        const { sensor_status: statusChanges, ...valueChanges } = delta.changes;
+        Object.assign(streamState, valueChanges);
+        if (statusChanges) {
+            streamState.sensor_status = { ...streamState.sensor_status, ...statusChanges };
         }
+        streamState.seq = delta.seq;
+        streamLastSeq = delta.seq;
+        applyStreamSnapshot(connectedSensors, streamState);
     });
+    
+    sensorEventSource.onerror = () => {
+        // 브라우저가 재연결을 포기한 경우에만 폴링으로 전환
+        if (sensorEventSource && sensorEventSource.readyState === EventSource.CLOSED) {
+            addSensorLog('SSE 스트림 종료 - 폴링 방식으로 전환', 'warning');
+            sensorEventSource = null;
+            startSensorPolling(connectedSensors);
+        }
+    };
 }
 
-// 특정 센서 데이터 업데이트
-async function updateSpecificSensorData(sensorType) {
-    try {
-        const response = await fetch(`${API_URL}/current-sensor/${sensorType}`);
-        
-        if (!response.ok) {
-            // 개별 센서 API가 없는 경우 전체 데이터에서 추출
-            return updateSensorDataFromFull(sensorType);
+// 스트림 상태를 센서별 UI/차트에 반영
+function applyStreamSnapshot(connectedSensors, snapshot) {
+    const now = Date.now();
+    
+    connectedSensors.forEach(sensorType => {
+        // 센서별 갱신 간격 유지 (차트 시간 축 보존)
+        const interval = SENSOR_UPDATE_INTERVALS[sensorType] || 0;
+        if (now - (lastStreamUpdate[sensorType] || 0) < interval - 100) {
+            return;
         }
+        lastStreamUpdate[sensorType] = now;
         
-        const data = await response.json();
-        updateIndividualSensorDisplay(sensorType, data);
-        
-        // 차트 실시간 업데이트 (온도 차트처럼)
-        updateSensorCharts(sensorType, data);
-        
-        addSensorLog(`데이터 업데이트 성공`, 'success', sensorType.toUpperCase());
-        
-    } catch (error) {
-        console.warn(`⚠️ ${sensorType} 센서 데이터 업데이트 실패:`, error);
-        addSensorLog(`데이터 업데이트 실패: ${error.message}`, 'error', sensorType.toUpperCase());
-        // 개별 실패해도 다른 센서에 영향 없음
+        const sensorData = extractSensorData(sensorType, snapshot);
+        updateIndividualSensorDisplay(sensorType, sensorData);
+        updateSensorCharts(sensorType, sensorData);
+    });
+}
+
+// 통합 대시보드 API 폴링 (SSE 미지원 시 폴백)
+function startSensorPolling(connectedSensors) {
+    const pollingSensors = Object.keys(SENSOR_UPDATE_INTERVALS)
+        .filter(sensorType => connectedSensors.includes(sensorType));
+    
+    Object.keys(SENSOR_UPDATE_INTERVALS).forEach(sensorType => {
+        if (pollingSensors.includes(sensorType)) {
+            addSensorLog(`${SENSOR_UPDATE_INTERVALS[sensorType]}ms 간격으로 업데이트 스케줄 설정`, 'info', sensorType.toUpperCase());
+        } else {
+            console.log(`❌ ${sensorType} 센서: 연결되지 않음 - 스케줄링 생략`);
+            addSensorLog(`연결되지 않음 - 업데이트 생략`, 'warning', sensorType.toUpperCase());
+        }
+    });
+    
+    if (pollingSensors.length === 0) {
+        return;
     }
+    
+    // 가장 짧은 센서 간격으로 한 번만 요청, 센서별 간격은 클라이언트에서 유지
+    const pollInterval = Math.min(...pollingSensors.map(sensorType => SENSOR_UPDATE_INTERVALS[sensorType]));
+    console.log(`📊 /api/dashboard ${pollInterval}ms 간격으로 폴링:`, pollingSensors);
+    lastStreamUpdate = {};
+    
+    sensorTimers.dashboard = setInterval(() => {
+        updateDashboardData(pollingSensors);
+    }, pollInterval);
+    updateDashboardData(pollingSensors);
 }
 
-// 전체 데이터에서 특정 센서 데이터 추출 (폴백)
-async function updateSensorDataFromFull(sensorType) {
+// 통합 대시보드 데이터 업데이트 (요청 1회로 모든 센서 갱신)
+async function updateDashboardData(pollingSensors) {
     try {
-        const response = await fetch(`${API_URL}/current`);
-        if (!response.ok) throw new Error('전체 데이터 조회 실패');
+        const fields = pollingSensors.join(',');
+        const response = await fetch(`${API_URL}/dashboard?fields=${encodeURIComponent(fields)}`);
+        if (!response.ok) throw new Error('대시보드 데이터 조회 실패');
         
-        const fullData = await response.json();
-        const sensorData = extractSensorData(sensorType, fullData);
-        updateIndividualSensorDisplay(sensorType, sensorData);
+        const dashboard = await response.json();
+        const now = Date.now();
         
-        // 차트 실시간 업데이트
-        updateSensorCharts(sensorType, sensorData);
+        pollingSensors.forEach(sensorType => {
+            // 센서별 갱신 간격 유지 (차트 시간 축 보존)
+            const interval = SENSOR_UPDATE_INTERVALS[sensorType] || 0;
+            if (now - (lastStreamUpdate[sensorType] || 0) < interval - 100) {
+                return;
+            }
+            lastStreamUpdate[sensorType] = now;
+            
+            const sensorData = {
+                timestamp: dashboard.timestamp,
+                sensor_status: dashboard.sensor_status,
+                connected: sensorType in dashboard.sensors,
+                ...(dashboard.sensors[sensorType] || {})
+            };
+            updateIndividualSensorDisplay(sensorType, sensorData);
+            updateSensorCharts(sensorType, sensorData);
+        });
         
     } catch (error) {
-        console.error(`❌ ${sensorType} 폴백 업데이트 실패:`, error);
+        console.warn('⚠️ 대시보드 데이터 업데이트 실패:', error);
+        addSensorLog(`데이터 업데이트 실패: ${error.message}`, 'error');
     }
 }
 
@@ -280,7 +362,8 @@ async function updateSensorDataFromFull(sensorType) {
 function extractSensorData(sensorType, fullData) {
     const extracted = {
         timestamp: fullData.timestamp,
-        sensor_status: fullData.sensor_status
+        sensor_status: fullData.sensor_status,
+        connected: sensorType === 'virtual' || fullData.sensor_status?.[sensorType] === true
     };
     
     switch(sensorType) {
@@ -395,7 +478,7 @@ function updateBME688Display(data) {
             pressElement.innerHTML = `${data.pressure.toFixed(1)}<span class="widget-unit">hPa</span>`;
         }
     }
-    if (data.air_quality !== undefined) {
+    if (data.air_quality !== undefined && data.air_quality !== null) {
         const aqElement = document.getElementById('bme688-airquality-value');
         if (aqElement) {
             aqElement.innerHTML = `${Math.round(data.air_quality)}<span class="widget-unit">/100</span>`;
@@ -653,7 +736,7 @@ function updateSensorWidgets(sensorType, data) {
             } else {
                 document.getElementById('bme688-pressure-value').innerHTML = '--<span class="widget-unit">hPa</span>';
             }
-            if (data.air_quality !== undefined && data.air_quality >= 0) {
+            if (data.air_quality !== undefined && data.air_quality !== null && data.air_quality >= 0) {
                 updateSensorWidget('bme688', 'airquality', data.air_quality, '/100');
             } else {
                 document.getElementById('bme688-airquality-value').innerHTML = '--<span class="widget-unit">/100</span>';
@@ -773,7 +856,7 @@ function updateSensorWidgetFromMulti(sensorType, data, sensorCount) {
             } else {
                 document.getElementById('bme688-pressure-value').innerHTML = '--<span class="widget-unit">hPa</span>';
             }
-            if (data.air_quality !== undefined && data.air_quality >= 0) {
+            if (data.air_quality !== undefined && data.air_quality !== null && data.air_quality >= 0) {
                 updateSensorWidget('bme688', 'airquality', data.air_quality, '/100');
             } else {
                 document.getElementById('bme688-airquality-value').innerHTML = '--<span class="widget-unit">/100</span>';
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+핫 패스 트레이서 (Chrome Trace Event 형식 내보내기)
+- 기본 비활성화: 비활성 시 span()은 공유 no-op 객체만 반환 (오버헤드 최소)
+- 활성화 시 고정 크기 링(deque)에 이벤트 기록, 가장 오래된 이벤트부터 덮어씀
+- export_chrome_trace() 결과를 파일로 저장하여 Perfetto / chrome://tracing 에서 열기
+
+활성화: 환경 변수 EGDASH_TRACE=1 또는 POST /api/debug/trace {"enabled": true}
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+DEFAULT_TRACE_CAPACITY = 50000  # 이벤트 수 (1초 수집 기준 수십 분)
+MAX_TRACE_CAPACITY = 200000     # 설정 가능한 최대 이벤트 수 (이벤트당 수백 바이트, 메모리 상한)
+
+
+class _NullSpan:
+    """비활성 상태용 no-op 스팬"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+    
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """구간 스팬 (종료 시 Complete 이벤트 기록)"""
+    
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+    
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.record_complete(self.name, self.cat, self.start, time.perf_counter_ns(), self.args)
+        return False
+    
+    def set(self, **args):
+        """스팬 인자 추가 (종료 전 결과값 기록용)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """고정 크기 링 버퍼 트레이서 (Thread-safe)"""
+    
+    def __init__(self, capacity: int = DEFAULT_TRACE_CAPACITY, enabled: bool = False):
+        self.enabled = enabled
+        self._events = deque(maxlen=min(capacity, MAX_TRACE_CAPACITY))  # append는 GIL 하에서 원자적
+        self._pid = os.getpid()
+        self._thread_names = {}
+        self._origin_ns = time.perf_counter_ns()
+        self.dropped_count = 0
+    
+    @property
+    def capacity(self) -> int:
+        return self._events.maxlen
+    
+    def configure(self, enabled: Optional[bool] = None, capacity: Optional[int] = None, clear: bool = False):
+        """트레이서 설정 변경 (용량 변경 시 기존 이벤트 삭제, 용량은 MAX_TRACE_CAPACITY로 제한)"""
+        if capacity:
+            capacity = min(capacity, MAX_TRACE_CAPACITY)
+        if capacity and capacity != self._events.maxlen:
+            self._events = deque(maxlen=capacity)
+            self.dropped_count = 0
+        elif clear:
+            self._events.clear()
+            self.dropped_count = 0
+        if enabled is not None:
+            self.enabled = enabled
+    
+    def span(self, name: str, cat: str = 'app', **args):
+        """구간 스팬 컨텍스트 매니저 (with TRACER.span('sht40.read_data', 'sensor'): ...)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+    
+    def instant(self, name: str, cat: str = 'app', **args):
+        """순간 이벤트 기록 (재시도, CRC 실패 등)"""
+        if not self.enabled:
+            return
+        self._append({'name': name, 'cat': cat, 'ph': 'i', 's': 't',
+                      'ts': self._us(time.perf_counter_ns()), 'args': args})
+    
+    def record_complete(self, name: str, cat: str, start_ns: int, end_ns: int, args: Optional[Dict] = None):
+        """시작/종료 시각(perf_counter_ns)으로 Complete 이벤트 기록"""
+        if not self.enabled:
+            return
+        self._append({'name': name, 'cat': cat, 'ph': 'X',
+                      'ts': self._us(start_ns), 'dur': (end_ns - start_ns) / 1000.0,
+                      'args': args or {}})
+    
+    def _us(self, perf_ns: int) -> float:
+        return (perf_ns - self._origin_ns) / 1000.0
+    
+    def _append(self, event: Dict):
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self._thread_names:
+            self._thread_names[tid] = thread.name
+        event['pid'] = self._pid
+        event['tid'] = tid
+        if len(self._events) == self._events.maxlen:
+            self.dropped_count += 1
+        self._events.append(event)
+    
+    def export_chrome_trace(self) -> Dict:
+        """Chrome Trace Event 형식 (JSON Object Format) 반환"""
+        events = list(self._events)
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                     'args': {'name': 'egdash'}}]
+        for tid, thread_name in list(self._thread_names.items()):
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                             'args': {'name': thread_name}})
+        return {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'capacity': self.capacity,
+                'dropped_count': self.dropped_count,
+                'exported_at': time.time()
+            }
+        }
+    
+    def get_status(self) -> Dict:
+        """트레이서 상태 정보 반환"""
+        return {
+            'enabled': self.enabled,
+            'capacity': self.capacity,
+            'event_count': len(self._events),
+            'dropped_count': self.dropped_count
+        }
+
+
+TRACER = Tracer(enabled=os.environ.get('EGDASH_TRACE', '') in ('1', 'true', 'yes'))
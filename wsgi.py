@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+EG-Dash WSGI 진입점 (멀티 프로세스 배포용)
+- 센서 하드웨어는 acquisition_daemon.py가 점유
+- 각 웹 워커는 공유 스냅샷 파일만 읽어 API/템플릿 제공
+
+실행 예:
+    python3 acquisition_daemon.py &
+    gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5003 wsgi:app
+    waitress-serve --port=5003 --threads=16 wsgi:app
+
+환경 변수 (acquisition_daemon.py와 같은 값 사용):
+    EGDASH_SNAPSHOT_TRANSPORT: 'file' (기본) 또는 'shm' (공유 메모리 세그먼트)
+    EGDASH_SHARED_SNAPSHOT: 공유 스냅샷 파일 경로 (기본: /dev/shm/egdash_snapshot.json)
+    EGDASH_SHM_NAME: 공유 메모리 이름 (기본: egdash_snapshot)
+"""
+
+import os
+from sensor_api_simple import app, initialize_web_worker
+
+# 워커 프로세스마다 공유 스냅샷 추적 스레드 시작 (gunicorn --preload 사용 금지: fork 후 스레드 유실)
+initialize_web_worker(os.environ.get('EGDASH_SHARED_SNAPSHOT'),
+                      transport=os.environ.get('EGDASH_SNAPSHOT_TRANSPORT', 'file'),
+                      shm_name=os.environ.get('EGDASH_SHM_NAME'))
+
+application = app